@@ -0,0 +1 @@
+"""Benchmarks for the Events API. Run modules with ``python -m benchmarks.<name>``."""
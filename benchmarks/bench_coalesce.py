@@ -0,0 +1,131 @@
+"""Burst update throughput with and without write coalescing.
+
+Usage::
+
+    python -m benchmarks.bench_coalesce --requests 4000 --concurrency 64
+
+Mimics the scheduling UI: ``--concurrency`` callers submit the update
+behind ``PUT /events/{id}`` for ``--events`` events as fast as they can,
+so the same events are edited again and again. Updates go straight to
+the data layer, so the figures exclude HTTP overhead, which caps a
+single process at a few hundred requests per second. The run is
+repeated with ``EVENTS_WRITE_COALESCE`` off and on, and reports writes
+per second and the number of transactions. ``--synchronous FULL`` adds
+an fsync per transaction, which is where batching gains the most.
+
+Also runnable through pytest::
+
+    python -m pytest benchmarks/bench_coalesce.py -s
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict
+
+from benchmarks.loadtest import _event_payload, load_app
+
+
+def measure(
+    db_path: Path, coalesce: bool, requests: int, concurrency: int, events: int
+) -> Dict[str, Any]:
+    """Run ``requests`` concurrent updates and return throughput figures."""
+    os.environ["EVENTS_WRITE_COALESCE"] = "1" if coalesce else ""
+    load_app(db_path)
+    import server
+
+    rng = random.Random(5)
+    ids = [f"evt-{number}" for number in range(events)]
+    payloads = [server.EventIn(**_event_payload(rng, number)) for number in range(64)]
+    outcomes: Dict[str, int] = {}
+    server.init_db()
+    with server.get_connection() as conn:
+        for event_id, payload in zip(ids, payloads):
+            server._insert_event(conn, event_id, payload, "2025-01-01", False)
+
+    async def drive() -> float:
+        remaining = requests
+
+        async def worker() -> None:
+            nonlocal remaining
+            while remaining > 0:
+                remaining -= 1
+                event_id = rng.choice(ids)
+                try:
+                    await server.REPOSITORY.write(
+                        server._update_event,
+                        event_id,
+                        rng.choice(payloads),
+                        datetime.utcnow().isoformat(),
+                        False,
+                        key=event_id,
+                        replaceable=True,
+                    )
+                    outcome = "ok"
+                except Exception as exc:  # counted, not raised
+                    outcome = type(exc).__name__
+                outcomes[outcome] = outcomes.get(outcome, 0) + 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return time.perf_counter() - started
+
+    before = read_version(server)
+    elapsed = asyncio.run(drive())
+    transactions = read_version(server) - before
+    server.REPOSITORY.close()
+    return {
+        "coalesce": coalesce,
+        "requests": requests,
+        "seconds": elapsed,
+        "writes_per_s": requests / elapsed,
+        "transactions": transactions,
+        "outcomes": outcomes,
+    }
+
+
+def read_version(server: Any) -> int:
+    # Every committed transaction that changed data bumps the counter once.
+    return int(server.read_data_version(server.get_connection()).split(".")[1])
+
+
+def test_coalescing_raises_burst_throughput(tmp_path):
+    """Coalesced bursts commit in far fewer transactions and run faster."""
+
+    plain = measure(tmp_path / "plain.db", False, 2000, 64, 20)
+    batched = measure(tmp_path / "batched.db", True, 2000, 64, 20)
+    os.environ.pop("EVENTS_WRITE_COALESCE", None)
+    print(plain, batched, sep="\n")
+    assert plain["outcomes"] == batched["outcomes"] == {"ok": 2000}
+    assert batched["transactions"] * 10 < plain["transactions"]
+    assert batched["writes_per_s"] > plain["writes_per_s"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=4000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--events", type=int, default=20)
+    parser.add_argument("--synchronous", default="NORMAL")
+    args = parser.parse_args()
+    os.environ["EVENTS_DB_SYNCHRONOUS"] = args.synchronous
+    with tempfile.TemporaryDirectory() as directory:
+        for coalesce in (False, True):
+            db_path = Path(directory) / f"events-{int(coalesce)}.db"
+            result = measure(
+                db_path, coalesce, args.requests, args.concurrency, args.events
+            )
+            label = "coalesced" if coalesce else "one per write"
+            print(
+                f"{label:>14}: {result['writes_per_s']:>8.0f} writes/s,"
+                f" {result['transactions']} transactions, outcomes {result['outcomes']}"
+            )
+
+
+if __name__ == "__main__":
+    main()
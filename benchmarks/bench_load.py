@@ -0,0 +1,32 @@
+"""Concurrent load benchmark for the Events API.
+
+Run explicitly (it is not part of the default test run)::
+
+    python -m pytest benchmarks/bench_load.py -s
+
+Set ``BENCH_RECORD=<file>`` to append each summary as a JSON line tagged
+with the git revision, so throughput can be compared between commits.
+"""
+
+import json
+import os
+
+import pytest
+
+from benchmarks.loadtest import record, run_load
+
+pytest.importorskip("fastapi")
+
+
+@pytest.mark.parametrize("concurrency", [1, 16, 64])
+def test_mixed_workload(bench_app, concurrency):
+    """Mixed list/create/update/delete traffic completes without lock errors."""
+
+    result = run_load(bench_app, requests=1000, concurrency=concurrency)
+    summary = result.summary()
+    record(summary, os.getenv("BENCH_RECORD"), f"mixed-c{concurrency}")
+    print(json.dumps(summary))
+
+    assert result.requests == 1000
+    assert result.lock_errors == 0
+    assert result.errors == 0
@@ -0,0 +1,86 @@
+"""Bytes on the wire and encode time of the ``GET /events`` formats.
+
+Usage::
+
+    python -m benchmarks.bench_payload --rows 5000
+
+Renders the same ``sqlite3.Row`` objects as the default JSON array, a
+``fields=`` projection of the list view columns, columnar JSON and (when
+``msgpack`` is installed) MessagePack, each also compressed as the
+middleware would send it with gzip and, when installed, brotli. Reports
+the size and the best of ``--repeat`` encode times per variant; encode
+time includes compression.
+
+``test_api.py`` runs :func:`measure` over 5k events.
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from benchmarks.bench_serialize import seed_rows
+from benchmarks.loadtest import load_app
+
+# What the events page needs for its list view.
+LIST_VIEW_FIELDS = ("id", "name", "date", "start_time", "end_time", "location", "status")
+
+
+def _best(function: Callable[[], bytes], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def measure(server: Any, rows: List[Any], repeat: int = 3) -> Dict[str, Dict[str, float]]:
+    """Return ``{"bytes": ..., "encode_s": ...}`` for every format variant."""
+    from compression import _Encoder, available_encodings
+
+    outputs = ["json", "columnar"] + (["msgpack"] if server.msgpack is not None else [])
+    renderers: Dict[str, Callable[[], bytes]] = {
+        output: (lambda output=output: server.render_page(rows, None, output))
+        for output in outputs
+    }
+    renderers["fields"] = lambda: server.render_page(rows, LIST_VIEW_FIELDS, "json")
+    variants: Dict[str, Callable[[], bytes]] = dict(renderers)
+    for name, render in renderers.items():
+        for coding in available_encodings():
+            variants[f"{name}+{coding}"] = (
+                lambda render=render, coding=coding: _Encoder(coding, 6, 4).finish(
+                    render()
+                )
+            )
+    return {
+        name: {"bytes": len(encode()), "encode_s": _best(encode, repeat)}
+        for name, encode in variants.items()
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = Path(directory) / "events.db"
+        load_app(db_path)
+        import server
+
+        result = measure(server, seed_rows(server, args.rows), args.repeat)
+        server.REPOSITORY.close()
+    baseline = result["json"]["bytes"]
+    print(f"{args.rows} events")
+    for name, figures in result.items():
+        print(
+            f"{name:>18}: {figures['bytes']:>10} bytes"
+            f" ({figures['bytes'] / baseline:>6.1%}),"
+            f" {figures['encode_s'] * 1000:>7.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
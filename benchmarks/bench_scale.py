@@ -0,0 +1,276 @@
+"""Latency and memory of the hot paths as the events table grows.
+
+Usage::
+
+    python -m benchmarks.bench_scale --sizes 10000,100000 --save baseline.json
+    python -m benchmarks.bench_scale --sizes 10000,100000 --compare baseline.json
+
+For each size a database is filled by :mod:`benchmarks.datagen` (kept
+in ``--data-dir`` when given, so a 1M-row database is generated once)
+and these operations are timed through the ASGI app with the response
+cache disabled:
+
+- ``list``, ``list_1000``: the first page of ``GET /events`` at the
+  default and the maximum page size, then ``list_deep`` following the
+  cursor 5 pages in.
+- ``filter_status``, ``filter_employee``, ``filter_dates``: filtered
+  pages by status, assigned employee and a one-week date range.
+- ``row_to_event``: converting 1000 rows to ``Event`` models, without
+  HTTP.
+- ``update_first``: the first ``PUT``, which also builds the schedule
+  index; then ``update`` and ``delete`` of random events.
+
+After one warm-up call, each operation reports p50 and p95 over
+``--repeat`` runs and the peak memory Python allocated during one extra
+traced run (``tracemalloc``, run separately because tracing slows
+everything down). For ``update_first`` that is the schedule index build.
+``--save`` writes the figures as JSON with the git revision.
+``--compare`` prints the p50 ratio against a saved baseline and exits
+with status 1 when an operation got slower than ``--tolerance``.
+
+Also runnable through pytest, at 1k and 10k rows::
+
+    python -m pytest benchmarks/bench_scale.py -s
+    BENCH_BASELINE=baseline.json python -m pytest benchmarks/bench_scale.py
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from benchmarks.datagen import DEFAULT_START, generate_events, write_database
+from benchmarks.loadtest import _ms, git_revision, load_app, percentile
+from simple_testclient import TestClient
+
+Results = Dict[str, Dict[str, Dict[str, float]]]
+
+# Operations faster than this are compared against the floor instead, so
+# scheduler noise on sub-millisecond calls is not reported as a regression.
+NOISE_FLOOR_MS = 1.0
+
+
+def _database(size: int, seed: int, data_dir: Path, work_dir: Path) -> Path:
+    """Return a scratch copy of the generated database for ``size`` events.
+
+    Updates and deletes change the data, so runs work on a copy and the
+    generated file in ``data_dir`` can be reused by the next run.
+    """
+    source = data_dir / f"events-{size}-s{seed}.db"
+    if not source.exists():
+        started = time.perf_counter()
+        write_database(source, size, seed)
+        print(f"generated {size} events in {time.perf_counter() - started:.1f} s")
+    target = work_dir / source.name
+    if target == source:
+        return source
+    for suffix in ("", "-wal"):
+        if Path(f"{source}{suffix}").exists():
+            shutil.copyfile(f"{source}{suffix}", f"{target}{suffix}")
+    return target
+
+
+def _operations(
+    server: Any, client: TestClient, ids: List[str], employees: List[str], seed: int
+) -> Dict[str, Callable[[], Any]]:
+    rng = random.Random(seed)
+    updates = [payload for _, payload, _ in generate_events(64, seed + 1)]
+
+    def get(params: Dict[str, Any]) -> Any:
+        response = client.get("/events", params=params)
+        assert response.status_code == 200, response.text
+        return response
+
+    def deep() -> None:
+        params: Dict[str, Any] = {"limit": 100}
+        for _ in range(5):
+            cursor = get(params).headers.get("x-next-cursor")
+            if cursor is None:
+                break
+            params["cursor"] = cursor
+
+    def week() -> Dict[str, str]:
+        first = DEFAULT_START.toordinal() + rng.randrange(700)
+        return {
+            "date_from": DEFAULT_START.fromordinal(first).isoformat(),
+            "date_to": DEFAULT_START.fromordinal(first + 6).isoformat(),
+        }
+
+    rows = server.get_connection().execute("SELECT * FROM events LIMIT 1000").fetchall()
+
+    def update() -> None:
+        response = client.put(
+            f"/events/{rng.choice(ids)}",
+            params={"allow_conflicts": "true"},
+            json=rng.choice(updates),
+        )
+        assert response.status_code == 200, response.text
+
+    def delete() -> None:
+        event_id = ids.pop(rng.randrange(len(ids)))
+        assert client.delete(f"/events/{event_id}").status_code == 200
+
+    return {
+        "list": lambda: get({}),
+        "list_1000": lambda: get({"limit": 1000}),
+        "list_deep": deep,
+        "filter_status": lambda: get({"status": "Scheduled"}),
+        "filter_employee": lambda: get({"employee": rng.choice(employees)}),
+        "filter_dates": lambda: get(week()),
+        "row_to_event": lambda: [server.row_to_event(row) for row in rows],
+        "update_first": update,
+        "update": update,
+        "delete": delete,
+    }
+
+
+def _traced_peak_kib(operation: Callable[[], Any]) -> float:
+    tracemalloc.start()
+    try:
+        operation()
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def measure(db_path: Path, repeat: int = 20, seed: int = 0) -> Dict[str, Dict[str, float]]:
+    """Time every operation against the database at ``db_path``."""
+    os.environ["EVENTS_CACHE_MAX_ENTRIES"] = "0"
+    app = load_app(db_path)
+    import server
+
+    conn = server.get_connection()
+    ids = [row[0] for row in conn.execute("SELECT id FROM events ORDER BY id")]
+    employees = [
+        row[0] for row in conn.execute("SELECT DISTINCT employee_id FROM event_assignments")
+    ]
+    results: Dict[str, Dict[str, float]] = {}
+    with TestClient(app) as client:
+        for name, operation in _operations(server, client, ids, employees, seed).items():
+            # The first update pays for building the schedule index once.
+            cold = name == "update_first"
+            if not cold:
+                operation()
+            samples = []
+            for _ in range(1 if cold else repeat):
+                started = time.perf_counter()
+                operation()
+                samples.append(time.perf_counter() - started)
+            if cold:
+                server.SCHEDULE.invalidate()
+            peak = _traced_peak_kib(operation)
+            results[name] = {
+                "p50_ms": _ms(percentile(samples, 0.50)),
+                "p95_ms": _ms(percentile(samples, 0.95)),
+                "peak_kib": round(peak, 1),
+            }
+    server.REPOSITORY.close()
+    os.environ.pop("EVENTS_CACHE_MAX_ENTRIES", None)
+    return results
+
+
+def run(
+    sizes: List[int], repeat: int = 20, seed: int = 0, data_dir: Optional[Path] = None
+) -> Results:
+    """Measure every size in ``sizes``; results are keyed by size."""
+    results: Results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        work_dir = Path(directory)
+        for size in sizes:
+            db_path = _database(size, seed, data_dir or work_dir, work_dir)
+            results[str(size)] = measure(db_path, repeat, seed)
+    return results
+
+
+def compare(
+    baseline: Results, current: Results, tolerance: float
+) -> List[Tuple[str, str, float]]:
+    """Return ``(size, operation, ratio)`` for p50s slower than ``1 + tolerance``."""
+    regressions = []
+    for size, operations in current.items():
+        for name, figures in operations.items():
+            before = baseline.get(size, {}).get(name)
+            if before is None:
+                continue
+            ratio = max(figures["p50_ms"], NOISE_FLOOR_MS) / max(
+                before["p50_ms"], NOISE_FLOOR_MS
+            )
+            if ratio > 1 + tolerance:
+                regressions.append((size, name, ratio))
+    return regressions
+
+
+def load_baseline(path: str) -> Results:
+    with open(path, encoding="utf-8") as handle:
+        return json.load(handle)["results"]
+
+
+def save(results: Results, path: str) -> None:
+    entry = {"revision": git_revision(), "time": time.time(), "results": results}
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(entry, handle, indent=2)
+
+
+def report(results: Results, baseline: Optional[Results] = None) -> None:
+    for size, operations in results.items():
+        print(f"{size} events")
+        for name, figures in operations.items():
+            line = (
+                f"  {name:>16}: p50 {figures['p50_ms']:>9.2f} ms"
+                f"  p95 {figures['p95_ms']:>9.2f} ms  peak {figures['peak_kib']:>9.1f} KiB"
+            )
+            before = (baseline or {}).get(size, {}).get(name)
+            if before is not None and before["p50_ms"]:
+                line += f"  ({figures['p50_ms'] / before['p50_ms']:.2f}x baseline)"
+            print(line)
+
+
+def test_hot_paths_scale(tmp_path):
+    """Paged reads stay flat from 1k to 10k rows; optional baseline check."""
+
+    assert list(generate_events(200, seed=7)) == list(generate_events(200, seed=7))
+    results = run([1000, 10_000], repeat=10, data_dir=tmp_path)
+    report(results)
+    small, large = results["1000"], results["10000"]
+    for name in ("list", "list_deep", "filter_status", "filter_employee", "filter_dates"):
+        assert large[name]["p50_ms"] < max(small[name]["p50_ms"], NOISE_FLOOR_MS) * 3, name
+    baseline = os.getenv("BENCH_BASELINE")
+    if baseline:
+        assert compare(load_baseline(baseline), results, tolerance=0.5) == []
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10000,100000")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--data-dir", type=Path, help="Keep generated databases here")
+    parser.add_argument("--save", help="Write the results to this JSON file")
+    parser.add_argument("--compare", help="Baseline JSON file written by --save")
+    parser.add_argument("--tolerance", type=float, default=0.5)
+    args = parser.parse_args()
+    if args.data_dir is not None:
+        args.data_dir.mkdir(parents=True, exist_ok=True)
+    sizes = [int(size) for size in args.sizes.split(",")]
+    results = run(sizes, args.repeat, args.seed, args.data_dir)
+    baseline = load_baseline(args.compare) if args.compare else None
+    report(results, baseline)
+    if args.save:
+        save(results, args.save)
+    if baseline is not None:
+        regressions = compare(baseline, results, args.tolerance)
+        for size, name, ratio in regressions:
+            print(f"regression: {name} at {size} events is {ratio:.2f}x the baseline")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Latency benchmark for ``GET /events/search`` as the table grows.
+
+Usage::
+
+    python -m benchmarks.bench_search --sizes 1000,10000,50000
+
+For each size the table is filled with generated events and a few
+typical queries are timed through the search function itself, so the
+figures exclude HTTP overhead. Reports the median of ``--repeat`` runs.
+Cost follows the number of matches rather than the table size: rare
+terms stay in the low milliseconds, while a term found in every event
+is linear because each match has to be ranked.
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+from benchmarks.bench_serialize import seed_rows
+from benchmarks.loadtest import load_app
+
+# A selective query, one matching every event, and one matching none.
+QUERIES = ("event 4242", "houston", "nomatch")
+
+
+def run(sizes: List[int], repeat: int) -> None:
+    print(f"{'events':>8} " + " ".join(f"{query[:18]:>18}" for query in QUERIES))
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            db_path = Path(directory) / "events.db"
+            load_app(db_path)
+            import server
+
+            seed_rows(server, size)
+            conn = server.get_connection()
+            filters = server.EventFilters()
+            cells = []
+            for query in QUERIES:
+                match = server._match_expression(query)
+                samples = []
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    server._search_events(conn, match, filters, 100, 0)
+                    samples.append(time.perf_counter() - started)
+                cells.append(f"{statistics.median(samples) * 1000:>15.2f} ms")
+            print(f"{size:>8} " + " ".join(cells))
+            server.REPOSITORY.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1000,10000,50000")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    run([int(size) for size in args.sizes.split(",")], args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Benchmark of the ``GET /events`` serialization paths.
+
+Usage::
+
+    python -m benchmarks.bench_serialize --rows 10000
+
+Compares building ``Event`` models and dumping them through the
+``List[Event]`` adapter with the opt-in ``RowEncoder`` fast path
+(``EVENTS_FAST_JSON``) on the same ``sqlite3.Row`` objects, and reports
+the best of ``--repeat`` runs. Both paths must produce identical bytes.
+
+Also runnable through pytest::
+
+    python -m pytest benchmarks/bench_serialize.py -s
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from benchmarks.loadtest import _event_payload, load_app
+
+
+def seed_rows(server: Any, rows: int, seed: int = 3) -> List[Any]:
+    """Insert ``rows`` generated events and return them as ``sqlite3.Row``."""
+    server.init_db()
+    rng = random.Random(seed)
+    conn = server.get_connection()
+    with conn:
+        for number in range(rows):
+            event = server.EventIn(**_event_payload(rng, number))
+            server._insert_event(
+                conn, f"evt-{number}", event, "2025-01-01T00:00:00", check_conflicts=False
+            )
+    return conn.execute("SELECT * FROM events").fetchall()
+
+
+def _best(function: Callable[[], bytes], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def measure(server: Any, rows: List[Any], repeat: int = 5) -> Dict[str, float]:
+    """Time both serialization paths over ``rows``; times are in seconds."""
+
+    def models() -> bytes:
+        return server.EVENT_LIST_ADAPTER.dump_json(
+            [server.row_to_event(row) for row in rows]
+        )
+
+    def fast() -> bytes:
+        return server.EVENT_ENCODER.encode(rows)
+
+    if models() != fast():
+        raise AssertionError("fast serialization differs from the model output")
+    model_s = _best(models, repeat)
+    fast_s = _best(fast, repeat)
+    return {
+        "rows": len(rows),
+        "models_s": model_s,
+        "fast_s": fast_s,
+        "speedup": model_s / fast_s,
+    }
+
+
+def test_fast_serialization_speedup(bench_app):
+    """The fast path is several times quicker than model construction at 10k rows."""
+
+    import server
+
+    result = measure(server, seed_rows(server, 10_000), repeat=3)
+    print(result)
+    assert result["speedup"] > 2
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = Path(directory) / "events.db"
+        load_app(db_path)
+        import server
+
+        result = measure(server, seed_rows(server, args.rows), args.repeat)
+        server.REPOSITORY.close()
+    encoder = "orjson" if server.orjson is not None else "json"
+    print(
+        f"{result['rows']} rows: models {result['models_s'] * 1000:.1f} ms,"
+        f" fast ({encoder}) {result['fast_s'] * 1000:.1f} ms,"
+        f" {result['speedup']:.1f}x faster"
+    )
+
+
+if __name__ == "__main__":
+    main()
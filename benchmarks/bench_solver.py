@@ -0,0 +1,67 @@
+"""Scaling benchmark for the staffing solver in ``staffing.py``.
+
+Usage::
+
+    python -m benchmarks.bench_solver --sizes 100,300,1000,3000
+
+Each size ``n`` solves ``n`` events (six partly overlapping four-hour
+events per day, three staff each) against ``n / 3`` employees capped at
+40 hours, and reports the best of ``--repeat`` runs.
+"""
+
+import argparse
+import random
+import time
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+
+from staffing import StaffingNeed, event_window, solve_staffing
+
+
+def make_needs(count: int, seed: int = 7) -> List[StaffingNeed]:
+    """Return ``count`` deterministic, partly overlapping staffing needs."""
+    rng = random.Random(seed)
+    first_day = date(2025, 1, 1)
+    needs = []
+    for number in range(count):
+        day = first_day + timedelta(days=number // 6)
+        start = rng.choice((11, 14, 16, 18, 19))
+        window = event_window(day.isoformat(), f"{start:02d}:00", f"{start + 4:02d}:00")
+        needs.append(StaffingNeed(f"evt-{number}", window, target=3))
+    return needs
+
+
+def run(sizes: List[int], repeat: int) -> None:
+    print(
+        f"{'events':>8} {'employees':>10} {'best ms':>10}"
+        f" {'us/event':>10} {'unfilled':>9}"
+    )
+    for size in sizes:
+        employees = max(size // 3, 10)
+        capacity: Dict[str, Optional[int]] = {
+            f"emp-{i}": 40 * 3600 for i in range(employees)
+        }
+        best = float("inf")
+        plan = None
+        for _ in range(repeat):
+            needs = make_needs(size)
+            started = time.perf_counter()
+            plan = solve_staffing(needs, capacity)
+            best = min(best, time.perf_counter() - started)
+        unfilled = sum(plan.unfilled.values()) if plan else 0
+        print(
+            f"{size:>8} {employees:>10} {best * 1000:>10.1f}"
+            f" {best / size * 1e6:>10.1f} {unfilled:>9}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="100,300,1000,3000")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run([int(size) for size in args.sizes.split(",")], args.repeat)
+
+
+if __name__ == "__main__":
+    main()
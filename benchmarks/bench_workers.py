@@ -0,0 +1,176 @@
+"""Read throughput of several worker processes sharing one database.
+
+Usage::
+
+    python -m benchmarks.bench_workers --workers 1,2,4 --duration 5
+
+Mirrors ``uvicorn server:app --workers N``: for each worker count, that
+many processes load the app against the same seeded database and drive
+a read mix (event pages, employee schedules, calendar windows) through
+the ASGI app until ``--duration`` elapses. The response cache is
+disabled so every request reads SQLite. ``--writers`` adds processes
+issuing updates at the same time, which exercises the cross-process
+write lock; they report 503s and errors rather than throughput.
+
+Processes run truly in parallel, so the scaling follows the number of
+CPU cores: expect roughly flat figures on a single-core machine.
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from benchmarks.bench_serialize import seed_rows
+from benchmarks.loadtest import _event_payload, load_app
+from simple_testclient import TestClient
+
+# Concurrent requests per process, enough to keep its reader threads busy.
+CONCURRENCY = 8
+
+
+def _read_calls(rng: random.Random) -> List[Any]:
+    month = rng.randrange(1, 13)
+    return [
+        ("/events", {"limit": 50}),
+        (f"/employees/emp-{rng.randrange(50)}/events", {}),
+        ("/calendar", {"from": f"2025-{month:02d}-01", "to": f"2025-{month:02d}-08"}),
+    ]
+
+
+def read_worker(db_path: str, barrier: Any, duration: float, results: Any) -> None:
+    """Issue reads for ``duration`` seconds and report the request count."""
+    os.environ["EVENTS_CACHE_MAX_ENTRIES"] = "0"
+    app = load_app(Path(db_path))
+    rng = random.Random(os.getpid())
+    counts = {"requests": 0, "errors": 0}
+
+    async def drive(client: TestClient, deadline: float) -> None:
+        while time.perf_counter() < deadline:
+            url, params = rng.choice(_read_calls(rng))
+            response = await client.arequest("GET", url, params=params)
+            counts["requests"] += 1
+            if response.status_code != 200:
+                counts["errors"] += 1
+
+    async def run(client: TestClient) -> None:
+        barrier.wait()
+        deadline = time.perf_counter() + duration
+        await asyncio.gather(*(drive(client, deadline) for _ in range(CONCURRENCY)))
+
+    with TestClient(app) as client:
+        client.run(run(client))
+    results.put(("read", counts))
+
+
+def write_worker(
+    db_path: str, barrier: Any, writes: int, results: Any, duration: float = 0.0
+) -> None:
+    """Create ``writes`` events (or update them until ``duration`` elapses).
+
+    The barrier is passed before the app starts, so processes also race
+    through schema initialisation on a fresh database.
+    """
+    rng = random.Random(os.getpid())
+    statuses: Dict[int, int] = {}
+    barrier.wait()
+    app = load_app(Path(db_path))
+
+    async def run(client: TestClient) -> None:
+        ids = []
+        deadline = time.perf_counter() + duration
+        number = 0
+        while number < writes or time.perf_counter() < deadline:
+            payload = _event_payload(rng, number)
+            if number < writes or not ids:
+                response = await client.arequest(
+                    "POST", "/events", params={"allow_conflicts": "true"}, json=payload
+                )
+                if response.status_code == 200:
+                    ids.append(response.json()["id"])
+            else:
+                response = await client.arequest(
+                    "PUT",
+                    f"/events/{rng.choice(ids)}",
+                    params={"allow_conflicts": "true"},
+                    json=payload,
+                )
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+            number += 1
+
+    with TestClient(app) as client:
+        client.run(run(client))
+    results.put(("write", statuses))
+
+
+def measure(
+    db_path: Path, workers: int, duration: float, writers: int = 0
+) -> Dict[str, Any]:
+    """Run ``workers`` readers (and ``writers``) against ``db_path`` at once."""
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    barrier = context.Barrier(workers + writers)
+    processes = [
+        context.Process(target=read_worker, args=(str(db_path), barrier, duration, results))
+        for _ in range(workers)
+    ]
+    processes += [
+        context.Process(
+            target=write_worker, args=(str(db_path), barrier, 0, results, duration)
+        )
+        for _ in range(writers)
+    ]
+    for process in processes:
+        process.start()
+    outcomes = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    reads = [counts for kind, counts in outcomes if kind == "read"]
+    writes: Dict[int, int] = {}
+    for kind, statuses in outcomes:
+        if kind == "write":
+            for status, count in statuses.items():
+                writes[status] = writes.get(status, 0) + count
+    total = sum(counts["requests"] for counts in reads)
+    return {
+        "workers": workers,
+        "reads": total,
+        "rps": total / duration,
+        "read_errors": sum(counts["errors"] for counts in reads),
+        "writes": writes,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", default="1,2,4")
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--writers", type=int, default=0)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = Path(directory) / "events.db"
+        load_app(db_path)
+        import server
+
+        seed_rows(server, args.rows)
+        server.REPOSITORY.close()
+        print(f"{os.cpu_count()} CPUs, {args.rows} events, {args.writers} writers")
+        baseline = None
+        for workers in [int(count) for count in args.workers.split(",")]:
+            result = measure(db_path, workers, args.duration, args.writers)
+            baseline = baseline or result["rps"]
+            print(
+                f"{workers:>3} workers: {result['rps']:>9.1f} reads/s"
+                f" ({result['rps'] / baseline:.2f}x), read errors"
+                f" {result['read_errors']}, write statuses {result['writes']}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,14 @@
+"""Shared fixtures for the benchmark suites."""
+
+import pytest
+
+
+@pytest.fixture
+def bench_app(tmp_path, monkeypatch):
+    """Return the Events API app bound to a fresh temporary database."""
+
+    from benchmarks.loadtest import load_app
+
+    db_path = tmp_path / "events.db"
+    monkeypatch.setenv("EVENTS_DB_PATH", str(db_path))
+    return load_app(db_path)
@@ -0,0 +1,256 @@
+"""Deterministic synthetic events for scaling benchmarks.
+
+Usage::
+
+    python -m benchmarks.datagen --rows 100000 --db /tmp/events-100k.db
+
+Events look like the real pipeline: weddings, corporate mixers and
+parties at a few dozen venues, spread over two years with most of them
+on Fridays and Saturdays, evening start times, payouts that follow the
+guest count, staff assigned from a shared pool according to the
+staffing status, statuses that depend on whether the date has passed,
+and notes ranging from empty to a long paragraph. The same ``--rows``,
+``--seed`` and ``--start`` always produce the same events, IDs and
+``updated_at`` values, so benchmark runs are comparable.
+
+Rows are written through ``server._insert_event``, so the assignment,
+statistics and search tables are filled by the same code as the API.
+"""
+
+import argparse
+import random
+import time
+import uuid
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from benchmarks.loadtest import load_app
+
+DEFAULT_START = date(2024, 1, 1)
+DEFAULT_DAYS = 730
+# Events ending on or after this date are upcoming, the rest have happened.
+DEFAULT_TODAY = date(2025, 3, 1)
+
+OCCASIONS = (
+    ("Wedding reception", 8),
+    ("Rehearsal dinner", 3),
+    ("Corporate mixer", 5),
+    ("Holiday party", 3),
+    ("Birthday party", 6),
+    ("Graduation party", 2),
+    ("Fundraiser gala", 2),
+    ("Baby shower", 2),
+    ("Anniversary dinner", 2),
+    ("Product launch", 1),
+)
+VENUES = (
+    "The Astorian, Houston",
+    "Hotel ZaZa Memorial City, Houston",
+    "The Revaire, Houston",
+    "Butler's Courtyard, League City",
+    "The Corinthian, Houston",
+    "Avant Garden, Houston",
+    "The Bell Tower on 34th, Houston",
+    "Marigold Ballroom, Spring",
+    "Sugar Land Marriott Town Square, Sugar Land",
+    "The Springs Event Venue, Katy",
+    "Dunvegan Keep, Rosharon",
+    "Agave Estates, Kendleton",
+    "The Houstonian Hotel, Houston",
+    "Post Oak Hotel, Houston",
+    "Moody Gardens, Galveston",
+    "San Luis Resort, Galveston",
+    "Private residence, The Woodlands",
+    "Private residence, Bellaire",
+    "Private residence, Pearland",
+    "Office rooftop, Downtown Houston",
+)
+PACKAGES = (
+    ("Beer & Wine", 3),
+    ("Standard Bar", 5),
+    ("Premium Bar", 3),
+    ("Signature Cocktails", 2),
+)
+FIRST_NAMES = (
+    "Olivia", "Liam", "Emma", "Noah", "Ava", "Mateo", "Sophia", "Elijah",
+    "Isabella", "James", "Mia", "Lucas", "Camila", "Benjamin", "Harper",
+    "Diego", "Aaliyah", "Ethan", "Priya", "Minh",
+)
+LAST_NAMES = (
+    "Garcia", "Nguyen", "Johnson", "Smith", "Martinez", "Brown", "Patel",
+    "Williams", "Lopez", "Davis", "Hernandez", "Jackson", "Kim", "Okafor",
+    "Thompson", "Rodriguez", "Wilson", "Moore", "Tran", "Anderson",
+)
+NOTE_SENTENCES = (
+    "Client prefers a signature cocktail named after the couple.",
+    "Guests arrive at 6pm, bar should be set up 45 minutes earlier.",
+    "Load-in through the service entrance on the east side.",
+    "No glass on the pool deck, use acrylic cups outside.",
+    "Champagne toast at 8:30pm for all guests.",
+    "Client is providing wine; we supply mixers, ice and garnish.",
+    "Parking is limited, staff should carpool or use the garage on Main.",
+    "Two guests with severe nut allergies, avoid orgeat and nut liqueurs.",
+    "Venue coordinator is Dana, call on arrival.",
+    "Mocktail menu requested for the family table.",
+    "Last call at 10:45pm, venue requires cleanup by midnight.",
+    "Bring the portable bar and two extra coolers.",
+    "Dress code is black tie for staff.",
+    "Deposit received, balance due one week before the event.",
+)
+# Weights of (status, staffing_status) for events that have and have not happened.
+PAST_STATUSES = (("Completed", 86), ("Canceled", 9), ("Scheduled", 5))
+UPCOMING_STATUSES = (("Scheduled", 70), ("Draft", 24), ("Canceled", 6))
+STAFFING = (("Fully staffed", 6), ("Partially staffed", 3), ("Unstaffed", 1))
+# Weekday weights, Monday first: most events fall on Fridays and Saturdays.
+WEEKDAYS = (2, 2, 3, 4, 10, 14, 5)
+
+GeneratedEvent = Tuple[str, Dict[str, Any], str]
+
+
+def _pick(rng: random.Random, weighted: Tuple[Tuple[str, int], ...]) -> str:
+    return rng.choices([value for value, _ in weighted], [w for _, w in weighted])[0]
+
+
+def _event_date(rng: random.Random, start: date, days: int) -> date:
+    # Draw a week, then a weekday by weight, so the span stays uniform.
+    week = rng.randrange(max(days // 7, 1))
+    weekday = rng.choices(range(7), WEEKDAYS)[0]
+    first = start + timedelta(days=week * 7)
+    return first + timedelta(days=(weekday - first.weekday()) % 7)
+
+
+def _notes(rng: random.Random) -> Optional[str]:
+    count = rng.choices((0, 1, 2, 4, 8), (25, 30, 25, 15, 5))[0]
+    if not count:
+        return None
+    return " ".join(rng.choice(NOTE_SENTENCES) for _ in range(count))
+
+
+def generate_events(
+    count: int,
+    seed: int = 0,
+    start: date = DEFAULT_START,
+    days: int = DEFAULT_DAYS,
+    employees: Optional[int] = None,
+    today: date = DEFAULT_TODAY,
+) -> Iterator[GeneratedEvent]:
+    """Yield ``count`` events as ``(id, EventIn fields, updated_at)``.
+
+    ``employees`` sizes the staff pool; by default it grows with the
+    data set so schedules stay around 40 events per employee.
+    """
+    rng = random.Random(seed)
+    pool = [f"emp-{number:05d}" for number in range(employees or max(count // 40, 20))]
+    for number in range(count):
+        event_id = str(uuid.UUID(int=rng.getrandbits(128), version=4))
+        day = _event_date(rng, start, days)
+        occasion = _pick(rng, OCCASIONS)
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        start_hour = rng.choices(range(11, 20), (1, 1, 2, 2, 3, 4, 6, 6, 3))[0]
+        start_minute = rng.choice((0, 0, 0, 30))
+        hours = rng.randint(3, min(6, 23 - start_hour))
+        guests = int(rng.lognormvariate(4.5, 0.6)) + 10
+        target = max(1, min(12, guests // 60 + rng.randint(0, 1)))
+        status = _pick(rng, PAST_STATUSES if day < today else UPCOMING_STATUSES)
+        staffing = _pick(rng, STAFFING)
+        staffed = {"Fully staffed": target, "Partially staffed": max(target // 2, 1)}
+        assigned = rng.sample(pool, min(staffed.get(staffing, 0), len(pool)))
+        # Edited between a few months before the event and shortly after it.
+        updated = datetime.combine(day, datetime.min.time()) - timedelta(
+            seconds=rng.randrange(-7 * 86400, 120 * 86400)
+        )
+        payload = {
+            "name": f"{last} {occasion}",
+            "date": day.isoformat(),
+            "start_time": f"{start_hour:02d}:{start_minute:02d}",
+            "end_time": f"{start_hour + hours:02d}:{start_minute:02d}",
+            "location": rng.choice(VENUES),
+            "package": _pick(rng, PACKAGES),
+            "guest_count": guests,
+            "payout": round(guests * rng.uniform(18, 42) / 5) * 5.0,
+            "target_staff_count": target,
+            "assign_employees": assigned,
+            "client_name": f"{first} {last}",
+            "client_phone": f"(713) {rng.randrange(200, 1000)}-{rng.randrange(10000):04d}",
+            "status": status,
+            "staffing_status": staffing,
+            "notes": _notes(rng),
+        }
+        yield event_id, payload, updated.isoformat(timespec="seconds")
+
+
+def populate(
+    server: Any, count: int, seed: int = 0, batch_size: int = 5000, **options: Any
+) -> List[str]:
+    """Insert ``count`` generated events into ``server``'s database.
+
+    Rows are committed ``batch_size`` at a time and conflict checks are
+    skipped, as with bulk imports. Returns the event IDs in insertion
+    order; ``options`` are passed on to :func:`generate_events`.
+    """
+    server.init_db()
+    conn = server.get_connection()
+    ids: List[str] = []
+    batch: List[GeneratedEvent] = []
+    for generated in generate_events(count, seed, **options):
+        batch.append(generated)
+        if len(batch) >= batch_size:
+            ids.extend(_write_batch(server, conn, batch))
+            batch = []
+    ids.extend(_write_batch(server, conn, batch))
+    return ids
+
+
+def _write_batch(server: Any, conn: Any, batch: List[GeneratedEvent]) -> List[str]:
+    with conn:
+        for event_id, payload, updated_at in batch:
+            server._insert_event(
+                conn,
+                event_id,
+                server.EventIn(**payload),
+                updated_at,
+                check_conflicts=False,
+            )
+    return [event_id for event_id, _, _ in batch]
+
+
+def write_database(db_path: Path, count: int, seed: int = 0, **options: Any) -> Path:
+    """Create the database at ``db_path`` holding ``count`` generated events."""
+    load_app(db_path)
+    import server
+
+    try:
+        populate(server, count, seed, **options)
+    finally:
+        server.REPOSITORY.close()
+    return db_path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--db", type=Path, required=True, help="Database file to create")
+    parser.add_argument("--start", type=date.fromisoformat, default=DEFAULT_START)
+    parser.add_argument("--days", type=int, default=DEFAULT_DAYS)
+    parser.add_argument("--employees", type=int)
+    args = parser.parse_args()
+    if args.db.exists():
+        parser.error(f"{args.db} already exists")
+    started = time.perf_counter()
+    write_database(
+        args.db,
+        args.rows,
+        args.seed,
+        start=args.start,
+        days=args.days,
+        employees=args.employees,
+    )
+    elapsed = time.perf_counter() - started
+    size = args.db.stat().st_size / 1024 / 1024
+    print(f"{args.rows} events written to {args.db} in {elapsed:.1f} s ({size:.1f} MiB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+"""Concurrent in-process load generator for the Events API.
+
+Requests are sent straight to the ASGI app through
+``simple_testclient.TestClient`` on a single event loop, so no network,
+uvicorn or extra dependencies are involved. ``concurrency`` workers
+issue a mixed list/create/update/delete workload until ``requests``
+have completed, and the result reports latency percentiles per
+operation, throughput and SQLite lock errors.
+
+Usage::
+
+    python -m benchmarks.loadtest --requests 2000 --concurrency 64
+
+The module can also be driven from pytest, see ``bench_load.py``.
+"""
+
+import argparse
+import asyncio
+import importlib
+import json
+import logging
+import os
+import random
+import sqlite3
+import subprocess
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from simple_testclient import TestClient
+
+DEFAULT_MIX = {"list": 0.6, "create": 0.15, "update": 0.2, "delete": 0.05}
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """Return the ``fraction`` percentile of ``samples`` (nearest rank)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(int(round(fraction * len(ordered) + 0.5)) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 3)
+
+
+@dataclass
+class LoadResult:
+    """Outcome of :func:`run_load`."""
+
+    concurrency: int
+    duration: float
+    latencies: Dict[str, List[float]] = field(default_factory=dict)
+    statuses: Dict[int, int] = field(default_factory=dict)
+    lock_errors: int = 0
+    errors: int = 0
+
+    @property
+    def requests(self) -> int:
+        return sum(len(samples) for samples in self.latencies.values())
+
+    @property
+    def requests_per_second(self) -> float:
+        return self.requests / self.duration if self.duration else 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        """Return a JSON-friendly summary; latencies are in milliseconds."""
+        every = [sample for samples in self.latencies.values() for sample in samples]
+        operations = {
+            name: {
+                "count": len(samples),
+                "p50_ms": _ms(percentile(samples, 0.50)),
+                "p95_ms": _ms(percentile(samples, 0.95)),
+                "p99_ms": _ms(percentile(samples, 0.99)),
+            }
+            for name, samples in sorted(self.latencies.items())
+        }
+        return {
+            "concurrency": self.concurrency,
+            "requests": self.requests,
+            "duration_s": round(self.duration, 4),
+            "rps": round(self.requests_per_second, 1),
+            "p50_ms": _ms(percentile(every, 0.50)),
+            "p95_ms": _ms(percentile(every, 0.95)),
+            "p99_ms": _ms(percentile(every, 0.99)),
+            "lock_errors": self.lock_errors,
+            "errors": self.errors,
+            "statuses": {str(code): count for code, count in sorted(self.statuses.items())},
+            "operations": operations,
+        }
+
+
+def _event_payload(rng: random.Random, number: int) -> Dict[str, Any]:
+    start = rng.randrange(10, 20)
+    return {
+        "name": f"Load test event {number}",
+        "date": f"2025-{rng.randrange(1, 13):02d}-{rng.randrange(1, 29):02d}",
+        "start_time": f"{start:02d}:00",
+        "end_time": f"{start + 4:02d}:00",
+        "location": "Houston",
+        "guest_count": rng.randrange(20, 300),
+        "payout": float(rng.randrange(500, 8000)),
+        "target_staff_count": rng.randrange(1, 6),
+        "assign_employees": [f"emp-{rng.randrange(50)}"],
+        "status": "Scheduled",
+        "notes": "Generated by benchmarks.loadtest",
+    }
+
+
+async def _drive(
+    client: TestClient,
+    requests: int,
+    concurrency: int,
+    mix: Dict[str, float],
+    seed: int,
+    seed_events: int,
+) -> LoadResult:
+    rng = random.Random(seed)
+    ids: List[str] = []
+    for number in range(seed_events):
+        response = await client.arequest(
+            "POST",
+            "/events",
+            params={"allow_conflicts": "true"},
+            json=_event_payload(rng, number),
+        )
+        ids.append(response.json()["id"])
+
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    plan = rng.choices(names, weights, k=requests)
+    result = LoadResult(concurrency=concurrency, duration=0.0)
+    result.latencies = {name: [] for name in names}
+    position = 0
+
+    async def worker() -> None:
+        nonlocal position
+        while position < len(plan):
+            operation = plan[position]
+            position += 1
+            if operation in ("update", "delete") and not ids:
+                operation = "create"
+            if operation == "list":
+                call = ("GET", "/events", {"params": {"limit": 50}})
+            elif operation == "create":
+                payload = _event_payload(rng, position)
+                call = (
+                    "POST",
+                    "/events",
+                    {"params": {"allow_conflicts": "true"}, "json": payload},
+                )
+            elif operation == "update":
+                payload = _event_payload(rng, position)
+                call = (
+                    "PUT",
+                    f"/events/{rng.choice(ids)}",
+                    {"params": {"allow_conflicts": "true"}, "json": payload},
+                )
+            else:
+                event_id = ids.pop(rng.randrange(len(ids)))
+                call = ("DELETE", f"/events/{event_id}", {})
+            method, url, kwargs = call
+            started = time.perf_counter()
+            try:
+                response = await client.arequest(method, url, **kwargs)
+            except sqlite3.OperationalError as exc:
+                elapsed = time.perf_counter() - started
+                if "locked" in str(exc) or "busy" in str(exc):
+                    result.lock_errors += 1
+                else:
+                    result.errors += 1
+                result.latencies[operation].append(elapsed)
+                continue
+            except Exception:
+                result.errors += 1
+                result.latencies[operation].append(time.perf_counter() - started)
+                continue
+            result.latencies[operation].append(time.perf_counter() - started)
+            result.statuses[response.status_code] = (
+                result.statuses.get(response.status_code, 0) + 1
+            )
+            if response.status_code >= 500:
+                result.errors += 1
+            elif operation == "create" and response.status_code == 200:
+                ids.append(response.json()["id"])
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    result.duration = time.perf_counter() - started
+    return result
+
+
+def run_load(
+    app: Any,
+    requests: int = 2000,
+    concurrency: int = 64,
+    mix: Optional[Dict[str, float]] = None,
+    seed: int = 1,
+    seed_events: int = 200,
+) -> LoadResult:
+    """Fire ``requests`` mixed requests at ``app`` from ``concurrency`` workers."""
+    with TestClient(app) as client:
+        return client.run(
+            _drive(client, requests, concurrency, mix or DEFAULT_MIX, seed, seed_events)
+        )
+
+
+def load_app(db_path: Path) -> Any:
+    """Import ``server`` against the database at ``db_path`` and return its app."""
+    os.environ["EVENTS_DB_PATH"] = str(db_path)
+    import server
+
+    app = importlib.reload(server).app
+    # Per-request INFO lines would dominate the measurement.
+    logging.getLogger("events_api").setLevel(logging.WARNING)
+    return app
+
+
+def git_revision() -> Optional[str]:
+    """Return the current commit hash, if the tree is a git checkout."""
+    try:
+        output = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.stdout.strip() or None
+
+
+def record(summary: Dict[str, Any], path: Optional[str], name: str) -> None:
+    """Append ``summary`` as one JSON line to ``path`` for trend tracking."""
+    if not path:
+        return
+    entry = {"name": name, "revision": git_revision(), "time": time.time(), **summary}
+    with open(path, "a", encoding="utf-8") as handle:
+        handle.write(json.dumps(entry) + "\n")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument(
+        "--record", help="Append the JSON summary to this file (one line per run)"
+    )
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        app = load_app(Path(directory) / "events.db")
+        result = run_load(app, args.requests, args.concurrency, seed=args.seed)
+    summary = result.summary()
+    record(summary, args.record, f"loadtest-c{args.concurrency}")
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
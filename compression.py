@@ -0,0 +1,205 @@
+"""Response compression for the Events API.
+
+:class:`CompressionMiddleware` is a plain ASGI middleware that encodes
+response bodies with brotli or gzip, whichever the client prefers in
+``Accept-Encoding``. Brotli needs the optional ``brotli`` package; gzip
+comes from :mod:`zlib`. Bodies smaller than the threshold are sent as
+they are, since the framing overhead outweighs the saving. Streaming
+responses are compressed chunk by chunk with a flush after each, so
+exports keep streaming, while ``text/event-stream`` is never touched.
+"""
+
+import zlib
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+try:  # Optional: better ratios than gzip for JSON at similar speed.
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+Message = Dict[str, Any]
+Send = Callable[[Message], Awaitable[None]]
+
+# Media types that must reach the client unbuffered and uncompressed.
+DEFAULT_EXCLUDED_TYPES = ("text/event-stream",)
+
+
+def available_encodings() -> Tuple[str, ...]:
+    """Return the supported content codings, most preferred first."""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate(header: str, supported: Sequence[str]) -> Optional[str]:
+    """Pick the coding from ``supported`` the ``Accept-Encoding`` header ranks best.
+
+    Ties keep the order of ``supported``; codings with ``q=0`` are refused.
+    """
+    weights: Dict[str, float] = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        weight = 1.0
+        name, _, value = params.strip().partition("=")
+        if name.strip().lower() == "q":
+            try:
+                weight = float(value)
+            except ValueError:
+                weight = 0.0
+        weights[coding] = weight
+    best: Optional[str] = None
+    best_weight = 0.0
+    for coding in supported:
+        weight = weights.get(coding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = coding, weight
+    return best
+
+
+class _Encoder:
+    """Incremental compressor for one response body."""
+
+    def __init__(self, coding: str, gzip_level: int, brotli_quality: int) -> None:
+        if coding == "br":
+            self._brotli = brotli.Compressor(quality=brotli_quality)
+            self._zlib = None
+        else:
+            self._brotli = None
+            # wbits 16 + 15 writes the gzip header and trailer.
+            self._zlib = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+
+    def chunk(self, data: bytes) -> bytes:
+        """Compress ``data`` and flush it so the client can decode it now."""
+        if self._brotli is not None:
+            return self._brotli.process(data) + self._brotli.flush()
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        """Compress the remaining ``data`` and end the stream."""
+        if self._brotli is not None:
+            return self._brotli.process(data) + self._brotli.finish()
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_FINISH)
+
+
+class CompressionMiddleware:
+    """Compress responses of at least ``minimum_size`` bytes.
+
+    A complete body shorter than the threshold is passed through, as are
+    responses that already carry a ``Content-Encoding`` and the media
+    types in ``excluded_types``. Every response that could have been
+    compressed gets ``Vary: Accept-Encoding`` so shared caches keep the
+    variants apart. A strong ``ETag`` on an encoded response is made
+    weak, because the encoded bytes differ from the ones it validates;
+    weak tags still match ``If-None-Match``.
+    """
+
+    def __init__(
+        self,
+        app: Callable[..., Awaitable[None]],
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        excluded_types: Sequence[str] = DEFAULT_EXCLUDED_TYPES,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.excluded_types = tuple(excluded_types)
+
+    async def __call__(self, scope: Message, receive: Any, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        accept = ""
+        for name, value in scope.get("headers", ()):
+            if name == b"accept-encoding":
+                accept = value.decode("latin-1")
+                break
+        coding = negotiate(accept, available_encodings()) if accept else None
+        if coding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _Responder(self, coding, send)
+        await self.app(scope, receive, responder.send)
+
+
+class _Responder:
+    """Per-request ``send`` wrapper that decides whether to compress."""
+
+    def __init__(self, middleware: CompressionMiddleware, coding: str, send: Send) -> None:
+        self.middleware = middleware
+        self.coding = coding
+        self._send = send
+        self._start: Optional[Message] = None
+        self._encoder: Optional[_Encoder] = None
+        self._passthrough = False
+
+    def _eligible(self) -> bool:
+        status = self._start["status"]
+        if status < 200 or status in (204, 304):
+            return False
+        for name, value in self._start.get("headers", ()):
+            if name == b"content-encoding":
+                return False
+            if name == b"content-type":
+                media_type = value.decode("latin-1").split(";")[0].strip().lower()
+                if media_type in self.middleware.excluded_types:
+                    return False
+        return True
+
+    def _start_message(self, encoded_length: Optional[int] = None) -> Message:
+        """Return the held start message, marked as encoded when compressing."""
+        headers = list(self._start.get("headers", ()))
+        if self._encoder is not None:
+            headers = [
+                (name, b"W/" + value)
+                if name == b"etag" and not value.startswith(b"W/")
+                else (name, value)
+                for name, value in headers
+                if name != b"content-length"
+            ]
+            headers.append((b"content-encoding", self.coding.encode("latin-1")))
+            if encoded_length is not None:
+                headers.append((b"content-length", str(encoded_length).encode("latin-1")))
+        if not any(
+            name == b"vary" and b"accept-encoding" in value.lower()
+            for name, value in headers
+        ):
+            headers.append((b"vary", b"Accept-Encoding"))
+        return {**self._start, "headers": headers}
+
+    async def send(self, message: Message) -> None:
+        kind = message["type"]
+        if kind == "http.response.start":
+            self._start = message
+            self._passthrough = not self._eligible()
+            if self._passthrough:
+                await self._send(message)
+            return
+        if kind != "http.response.body" or self._passthrough:
+            await self._send(message)
+            return
+        body = message.get("body", b"")
+        more = message.get("more_body", False)
+        if self._encoder is not None:
+            encoded = self._encoder.chunk(body) if more else self._encoder.finish(body)
+            await self._send({**message, "body": encoded})
+            return
+        if not more and len(body) < self.middleware.minimum_size:
+            # The whole body arrived at once and is too small to be worth it.
+            self._passthrough = True
+            await self._send(self._start_message())
+            await self._send(message)
+            return
+        self._encoder = _Encoder(
+            self.coding, self.middleware.gzip_level, self.middleware.brotli_quality
+        )
+        if more:
+            await self._send(self._start_message())
+            await self._send({**message, "body": self._encoder.chunk(body)})
+        else:
+            encoded = self._encoder.finish(body)
+            await self._send(self._start_message(len(encoded)))
+            await self._send({**message, "body": encoded})
@@ -0,0 +1,308 @@
+"""Minimal Prometheus metrics and slow-request profiling for the Events API.
+
+Counters, gauges and histograms are kept in process and rendered in the
+Prometheus text exposition format by :meth:`Registry.render`, so the API
+can expose ``/metrics`` without the ``prometheus_client`` dependency.
+Every metric is safe to update from the event loop and from the database
+worker threads at the same time. :class:`SlowRequestProfiler` samples
+requests with ``cProfile`` and keeps the traces of slow ones.
+"""
+
+import cProfile
+import math
+import random
+import re
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, TypeVar
+
+LabelValues = Tuple[str, ...]
+
+# Latency buckets in seconds, from sub-millisecond SQLite reads up to the
+# data layer timeout.
+DEFAULT_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Metric:
+    """Base class holding one value per combination of label values."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, values: Sequence[str]) -> LabelValues:
+        if len(values) != len(self.labels):
+            raise ValueError(f"{self.name} expects labels {self.labels}")
+        return tuple(str(value) for value in values)
+
+    def lines(self) -> List[str]:
+        """Return the sample lines of this metric."""
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.help}",
+            f"# TYPE {self.name} {self.kind}",
+            *self.lines(),
+        ]
+
+
+class _Value(Metric):
+    """Single value per label set, optionally read from a callback."""
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: Sequence[str] = (),
+        callback: Optional[Callable[[], float]] = None,
+    ) -> None:
+        super().__init__(name, help, labels)
+        self._values: Dict[LabelValues, float] = {}
+        self._callback = callback
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        if self._callback is not None:
+            return self._callback()
+        return self._values.get(self._key(labels), 0.0)
+
+    def lines(self) -> List[str]:
+        if self._callback is not None:
+            return [f"{self.name} {_format_value(self._callback())}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"
+            for key, value in items
+        ]
+
+
+class Counter(_Value):
+    """Monotonically increasing count."""
+
+    kind = "counter"
+
+
+class Gauge(_Value):
+    """Value that can go up and down."""
+
+    kind = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def set(self, value: float, *labels: str) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+
+class Histogram(Metric):
+    """Distribution of observed values over fixed buckets."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: Sequence[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: non-cumulative bucket counts (plus +Inf), sum.
+        self._values: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = ([0] * (len(self.buckets) + 1), [0.0])
+            entry[0][index] += 1
+            entry[1][0] += value
+
+    def count(self, *labels: str) -> int:
+        entry = self._values.get(self._key(labels))
+        return sum(entry[0]) if entry else 0
+
+    def lines(self) -> List[str]:
+        with self._lock:
+            items = sorted(
+                (key, (list(counts), total[0]))
+                for key, (counts, total) in self._values.items()
+            )
+        lines = []
+        label_names = (*self.labels, "le")
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), counts):
+                cumulative += count
+                labels = _format_labels(label_names, (*key, _format_value(bound)))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labels, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+M = TypeVar("M", bound=Metric)
+
+
+class Registry:
+    """Ordered collection of metrics rendered together."""
+
+    content_type = "text/plain; version=0.0.4; charset=utf-8"
+
+    def __init__(self) -> None:
+        self._metrics: List[Metric] = []
+
+    def register(self, metric: M) -> M:
+        self._metrics.append(metric)
+        return metric
+
+    def counter(
+        self,
+        name: str,
+        help: str,
+        labels: Sequence[str] = (),
+        callback: Optional[Callable[[], float]] = None,
+    ) -> Counter:
+        return self.register(Counter(name, help, labels, callback))
+
+    def gauge(
+        self,
+        name: str,
+        help: str,
+        labels: Sequence[str] = (),
+        callback: Optional[Callable[[], float]] = None,
+    ) -> Gauge:
+        return self.register(Gauge(name, help, labels, callback))
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labels: Sequence[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self.register(Histogram(name, help, labels, buckets))
+
+    def render(self) -> str:
+        """Return every metric in the Prometheus text format."""
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+class SlowRequestProfiler:
+    """Profile a sample of requests and keep the traces of slow ones.
+
+    Whether a request will be slow is only known once it finishes, so a
+    ``sample_rate`` fraction of requests runs under ``cProfile`` and the
+    trace is written to ``directory`` when the request took at least
+    ``threshold_s`` seconds. Only one request is profiled at a time, the
+    newest ``keep`` traces are retained, and the files load with
+    :mod:`pstats` or snakeviz. Profiling covers the event loop thread, so
+    a trace also shows other work the loop did meanwhile; database time is
+    covered by the data layer metrics instead.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str],
+        threshold_s: float,
+        sample_rate: float,
+        keep: int = 100,
+    ) -> None:
+        self.directory = Path(directory) if directory else None
+        self.threshold_s = threshold_s
+        self.sample_rate = sample_rate
+        self.keep = keep
+        self.captured = 0
+        self._active = False
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.directory is not None and self.sample_rate > 0
+
+    def start(self) -> Optional[cProfile.Profile]:
+        """Return a running profiler if this request is sampled."""
+        if not self.enabled or random.random() >= self.sample_rate:
+            return None
+        with self._lock:
+            if self._active:
+                return None
+            self._active = True
+        profile = cProfile.Profile()
+        profile.enable()
+        return profile
+
+    def finish(
+        self, profile: cProfile.Profile, label: str, duration: float
+    ) -> Optional[Path]:
+        """Stop ``profile`` and save it if the request was slow."""
+        profile.disable()
+        with self._lock:
+            self._active = False
+        if duration < self.threshold_s or self.directory is None:
+            return None
+        self.directory.mkdir(parents=True, exist_ok=True)
+        slug = re.sub(r"[^A-Za-z0-9]+", "-", label).strip("-")[:80]
+        path = self.directory / (
+            f"{time.time_ns() // 1_000_000}-{slug}-{duration * 1000:.0f}ms.prof"
+        )
+        profile.dump_stats(str(path))
+        self.captured += 1
+        traces = sorted(self.directory.glob("*.prof"))
+        for stale in traces[: max(len(traces) - self.keep, 0)]:
+            stale.unlink(missing_ok=True)
+        return path
@@ -8,20 +8,108 @@ The database file location can be customised with the
 ``EVENTS_DB_PATH`` environment variable. When the application
 starts it automatically creates the ``events`` table (if needed)
 and logs where the database lives.
+
+Connections are long-lived: each worker thread keeps one pooled
+connection opened in WAL mode, tuned through the ``EVENTS_DB_*``
+environment variables documented next to ``DATABASE_PATH``.
+
+Endpoints are ``async`` and never touch SQLite on the event loop or on
+FastAPI's shared threadpool. Database work goes through
+:class:`EventRepository`, which runs reads on a small dedicated reader
+pool and funnels every write through a single writer thread.
+
+Several worker processes (``uvicorn server:app --workers N``) can share
+one database: schema initialisation and every write transaction hold
+:data:`WRITE_LOCK`, an advisory file lock next to the database, so the
+processes take turns writing instead of failing with ``database is
+locked``.
 """
 
+import asyncio
+import base64
+import binascii
+import csv
+import hashlib
+import io
 import json
 import logging
+import operator
 import os
+import random
 import sqlite3
+import threading
+import time
 import uuid
-from datetime import datetime
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import List, Optional
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
 
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import (
+    Depends,
+    FastAPI,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+)
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
+from fastapi.responses import StreamingResponse
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    TypeAdapter,
+    ValidationError,
+    field_validator,
+)
+
+try:  # Optional: a much faster JSON encoder for the fast serialization path.
+    import orjson
+except ImportError:  # pragma: no cover - exercised when orjson is absent
+    orjson = None
+
+try:  # Optional: binary list responses (``GET /events?format=msgpack``).
+    import msgpack
+except ImportError:  # pragma: no cover - exercised when msgpack is absent
+    msgpack = None
+
+try:  # POSIX only: serialises writers across worker processes.
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+from compression import CompressionMiddleware
+from metrics import Registry, SlowRequestProfiler
+from staffing import (
+    DAY_SECONDS,
+    INACTIVE_STATUSES,
+    IntervalIndex,
+    ScheduleIndex,
+    StaffingNeed,
+    event_window,
+    is_active,
+    parse_date,
+    parse_time,
+    solve_staffing,
+    staffing_status,
+)
 
 
 logger = logging.getLogger("events_api")
@@ -29,17 +117,707 @@ logging.basicConfig(level=logging.INFO)
 
 
 DATABASE_PATH = Path(os.getenv("EVENTS_DB_PATH", "events.db")).resolve()
+# Archived events live in a separate file attached to every connection as
+# ``archive``, so the main database only holds the live working set.
+ARCHIVE_PATH = Path(
+    os.getenv(
+        "EVENTS_ARCHIVE_PATH",
+        str(DATABASE_PATH.with_name(f"{DATABASE_PATH.stem}-archive.db")),
+    )
+).resolve()
+# Connection tuning. WAL lets readers proceed while a writer commits and
+# ``synchronous=NORMAL`` is durable across application crashes in WAL mode.
+DB_JOURNAL_MODE = os.getenv("EVENTS_DB_JOURNAL_MODE", "WAL").upper()
+DB_SYNCHRONOUS = os.getenv("EVENTS_DB_SYNCHRONOUS", "NORMAL").upper()
+DB_BUSY_TIMEOUT_MS = int(os.getenv("EVENTS_DB_BUSY_TIMEOUT_MS", "5000"))
+DB_CACHE_SIZE_KIB = int(os.getenv("EVENTS_DB_CACHE_SIZE_KIB", "16384"))
+DB_MMAP_SIZE = int(os.getenv("EVENTS_DB_MMAP_SIZE", str(256 * 1024 * 1024)))
+# Cross-process write lock. A contended lock is polled with exponential
+# backoff from ``EVENTS_DB_WRITE_BACKOFF_MS`` up to ``..._MAX_MS``; a write
+# that cannot get it within ``EVENTS_DB_WRITE_LOCK_TIMEOUT_S`` fails with 503.
+DB_WRITE_BACKOFF_MS = float(os.getenv("EVENTS_DB_WRITE_BACKOFF_MS", "1"))
+DB_WRITE_BACKOFF_MAX_MS = float(os.getenv("EVENTS_DB_WRITE_BACKOFF_MAX_MS", "50"))
+DB_WRITE_LOCK_TIMEOUT_S = float(os.getenv("EVENTS_DB_WRITE_LOCK_TIMEOUT_S", "5"))
+
+# Prometheus metrics served by ``GET /metrics``.
+METRICS = Registry()
+HTTP_REQUESTS = METRICS.counter(
+    "events_http_requests_total",
+    "HTTP requests by route template and status code.",
+    ("method", "route", "status"),
+)
+HTTP_LATENCY = METRICS.histogram(
+    "events_http_request_duration_seconds",
+    "Time until the response headers were ready, by route template.",
+    ("method", "route"),
+)
+HTTP_IN_FLIGHT = METRICS.gauge(
+    "events_http_requests_in_flight", "Requests currently being handled.", ("method",)
+)
+DB_STATEMENTS = METRICS.counter(
+    "events_db_statements_total",
+    "SQL statements run by SQLite, including statements inside triggers.",
+)
+DB_OPERATIONS = METRICS.histogram(
+    "events_db_operation_duration_seconds",
+    "Time data layer operations spent on a database thread.",
+    ("kind", "operation"),
+)
+DB_QUEUE_WAIT = METRICS.histogram(
+    "events_db_queue_wait_seconds",
+    "Time data layer operations waited for a free database thread.",
+    ("kind",),
+)
+DB_REJECTED = METRICS.counter(
+    "events_db_rejected_total",
+    "Data layer operations rejected as busy or locked (503) or timed out (504).",
+    ("reason",),
+)
+DB_WRITE_BATCH = METRICS.histogram(
+    "events_db_write_batch_size",
+    "Writes committed together per coalesced transaction.",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512),
+)
+DB_LOCK_WAIT = METRICS.histogram(
+    "events_db_write_lock_wait_seconds",
+    "Time write transactions waited for the cross-process write lock.",
+)
+
+# Opt-in profiling: with EVENTS_PROFILE_DIR set, a sample of requests runs
+# under cProfile and traces of requests slower than the threshold are kept.
+PROFILER = SlowRequestProfiler(
+    directory=os.getenv("EVENTS_PROFILE_DIR") or None,
+    threshold_s=float(os.getenv("EVENTS_PROFILE_SLOW_MS", "250")) / 1000,
+    sample_rate=float(os.getenv("EVENTS_PROFILE_SAMPLE_RATE", "0.1")),
+    keep=int(os.getenv("EVENTS_PROFILE_KEEP", "100")),
+)
+
+_JOURNAL_MODES = {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"}
+_SYNCHRONOUS_MODES = {"OFF", "NORMAL", "FULL", "EXTRA"}
+
+
+def _count_statement(_sql: str) -> None:
+    DB_STATEMENTS.inc()
+
+
+def _connect() -> sqlite3.Connection:
+    """Open a new tuned connection to the events database."""
+    if DB_SYNCHRONOUS not in _SYNCHRONOUS_MODES:
+        raise ValueError(f"Unsupported EVENTS_DB_SYNCHRONOUS: {DB_SYNCHRONOUS}")
+    conn = sqlite3.connect(
+        str(DATABASE_PATH),
+        timeout=DB_BUSY_TIMEOUT_MS / 1000,
+        check_same_thread=False,
+    )
+    conn.row_factory = sqlite3.Row
+    conn.set_trace_callback(_count_statement)
+    conn.execute("ATTACH DATABASE ? AS archive", (str(ARCHIVE_PATH),))
+    conn.execute(f"PRAGMA busy_timeout = {DB_BUSY_TIMEOUT_MS:d}")
+    conn.execute(f"PRAGMA synchronous = {DB_SYNCHRONOUS}")
+    conn.execute(f"PRAGMA archive.synchronous = {DB_SYNCHRONOUS}")
+    conn.execute(f"PRAGMA cache_size = {-DB_CACHE_SIZE_KIB:d}")
+    conn.execute(f"PRAGMA mmap_size = {DB_MMAP_SIZE:d}")
+    return conn
+
+
+class ConnectionPool:
+    """Hand out one long-lived connection per thread.
+
+    SQLite connections are cheap to keep but comparatively expensive to
+    open, so each worker thread reuses its own connection for the lifetime
+    of the process. Connections of threads that have exited are closed the
+    next time a new connection is opened, and :meth:`close_all` releases
+    everything on shutdown.
+    """
+
+    def __init__(self) -> None:
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: List[Tuple[threading.Thread, sqlite3.Connection]] = []
+
+    def connection(self) -> sqlite3.Connection:
+        """Return the calling thread's connection, opening it if needed."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            return conn
+        conn = _connect()
+        with self._lock:
+            self._prune()
+            self._connections.append((threading.current_thread(), conn))
+        self._local.conn = conn
+        return conn
+
+    def _prune(self) -> None:
+        alive = []
+        for thread, conn in self._connections:
+            if thread.is_alive():
+                alive.append((thread, conn))
+            else:
+                conn.close()
+        self._connections = alive
+
+    def close_all(self) -> None:
+        """Close every pooled connection."""
+        with self._lock:
+            connections, self._connections = self._connections, []
+            # Drop the thread-local handles so later calls reconnect.
+            self._local = threading.local()
+        for _, conn in connections:
+            conn.close()
+
+    def size(self) -> int:
+        """Return the number of open pooled connections."""
+        with self._lock:
+            return len(self._connections)
+
+
+POOL = ConnectionPool()
+
+
+class ProcessLock:
+    """Exclusive lock shared by every process that uses the database.
+
+    Threads of this process are serialised by a ``threading.Lock`` and
+    processes by an advisory ``flock`` on ``path``. The file lock is
+    polled rather than waited on, sleeping with exponential backoff and
+    jitter between attempts, so :meth:`hold` can give up after a timeout.
+    Where ``fcntl`` is unavailable only threads are excluded and SQLite's
+    busy handler is the sole guard between processes.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        backoff_s: float = DB_WRITE_BACKOFF_MS / 1000,
+        max_backoff_s: float = DB_WRITE_BACKOFF_MAX_MS / 1000,
+    ) -> None:
+        self.path = path
+        self.backoff_s = backoff_s
+        self.max_backoff_s = max(max_backoff_s, backoff_s)
+        self._lock = threading.Lock()
+        self._fd: Optional[int] = None
+        self._pid: Optional[int] = None
+
+    def _handle(self) -> int:
+        # A forked child must not share the parent's open file description,
+        # or both would hold the lock at once.
+        if self._fd is None or self._pid != os.getpid():
+            self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            self._pid = os.getpid()
+        return self._fd
+
+    @contextmanager
+    def hold(self, timeout: Optional[float] = None) -> Iterator[float]:
+        """Hold the lock for the ``with`` block; yields the seconds waited.
+
+        Raises ``TimeoutError`` when the lock is not acquired within
+        ``timeout`` seconds; ``None`` waits as long as it takes.
+        """
+        started = time.perf_counter()
+        deadline = None if timeout is None else started + timeout
+        if not self._lock.acquire(timeout=-1 if timeout is None else timeout):
+            raise TimeoutError(f"{self.path} is held by another thread")
+        try:
+            if fcntl is not None:
+                fd = self._handle()
+                delay = self.backoff_s
+                while True:
+                    try:
+                        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                        break
+                    except BlockingIOError:
+                        now = time.perf_counter()
+                        if deadline is not None and now >= deadline:
+                            raise TimeoutError(f"{self.path} is held by another process")
+                        pause = delay * random.uniform(0.5, 1.0)
+                        if deadline is not None:
+                            pause = min(pause, deadline - now)
+                        time.sleep(pause)
+                        delay = min(delay * 2, self.max_backoff_s)
+            try:
+                yield time.perf_counter() - started
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(self._handle(), fcntl.LOCK_UN)
+        finally:
+            self._lock.release()
+
+    def close(self) -> None:
+        """Close the lock file handle; the next :meth:`hold` reopens it."""
+        with self._lock:
+            if self._fd is not None and self._pid == os.getpid():
+                os.close(self._fd)
+            self._fd = self._pid = None
+
+
+# Held around schema initialisation and every write transaction, so worker
+# processes sharing the database take turns as its single writer.
+WRITE_LOCK = ProcessLock(DATABASE_PATH.with_name(DATABASE_PATH.name + ".lock"))
+
+# Async data layer limits. Operations beyond ``DB_MAX_PENDING`` are
+# rejected with 503 instead of queueing without bound, and operations
+# that do not finish within ``DB_TIMEOUT_S`` seconds fail with 504.
+DB_READ_WORKERS = int(os.getenv("EVENTS_DB_READ_WORKERS", "4"))
+DB_MAX_PENDING = int(os.getenv("EVENTS_DB_MAX_PENDING", "256"))
+DB_TIMEOUT_S = float(os.getenv("EVENTS_DB_TIMEOUT_S", "10"))
+# Opt-in write coalescing: writes arriving within EVENTS_WRITE_COALESCE_MS
+# of each other share one transaction of at most EVENTS_WRITE_BATCH_MAX.
+WRITE_COALESCE = os.getenv("EVENTS_WRITE_COALESCE", "").lower() in {"1", "true", "yes"}
+WRITE_COALESCE_MS = float(os.getenv("EVENTS_WRITE_COALESCE_MS", "2"))
+WRITE_BATCH_MAX = int(os.getenv("EVENTS_WRITE_BATCH_MAX", "256"))
+
+T = TypeVar("T")
+
+
+@dataclass
+class QueuedWrite:
+    """A write waiting for the next coalesced transaction."""
+
+    fn: Callable[..., Any]
+    args: Tuple[Any, ...]
+    # Event the write touches; ``None`` if it may touch any, which keeps
+    # writes on either side of it from being collapsed together.
+    key: Optional[str]
+    # Whether the write replaces the whole event, like ``PUT``.
+    replaceable: bool
+    submitted: float
+    future: Future = field(default_factory=Future)
+    replaced: bool = False
+    result: Any = None
+    error: Optional[BaseException] = None
+
+
+def _mark_replaced(writes: List[QueuedWrite]) -> None:
+    """Flag replaceable writes that a later write of the same event replaces.
+
+    Any other write of that event, or a write without a key, in between
+    keeps the earlier one from being replaced.
+    """
+    latest: Dict[str, QueuedWrite] = {}
+    for write in writes:
+        if write.key is None:
+            latest.clear()
+            continue
+        previous = latest.pop(write.key, None)
+        if write.replaceable:
+            if previous is not None:
+                previous.replaced = True
+            latest[write.key] = write
+
+
+class EventRepository:
+    """Async access to the events database.
+
+    Reads run on ``read_workers`` dedicated threads, each holding its own
+    pooled connection. Writes run on a single writer thread inside a
+    transaction, so writers never contend for SQLite's write lock within
+    the process. With a ``write_lock``, each write transaction also holds
+    it, which makes the writer threads of several processes take turns.
+    Callables receive the connection as first argument.
+
+    With ``coalesce_s`` set, writes are queued and the writer commits
+    everything that arrived within that many seconds in one transaction,
+    each write in its own savepoint so it succeeds or fails on its own.
+    A replaceable write followed in the batch by another of the same
+    event only checks its preconditions and bumps the version, because
+    the later write overwrites its content anyway; see
+    :func:`_update_event`. Callers still resume only after the commit.
+    """
+
+    def __init__(
+        self,
+        pool: ConnectionPool,
+        read_workers: int = DB_READ_WORKERS,
+        max_pending: int = DB_MAX_PENDING,
+        timeout: float = DB_TIMEOUT_S,
+        write_lock: Optional[ProcessLock] = None,
+        lock_timeout: float = DB_WRITE_LOCK_TIMEOUT_S,
+        coalesce_s: Optional[float] = None,
+        max_batch: int = WRITE_BATCH_MAX,
+    ) -> None:
+        self.pool = pool
+        self.read_workers = read_workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.write_lock = write_lock
+        self.lock_timeout = lock_timeout
+        self.coalesce_s = coalesce_s
+        self.max_batch = max(max_batch, 1)
+        self.pending = 0
+        self._queue: List[QueuedWrite] = []
+        self._flush_scheduled = False
+        self._queue_lock = threading.Lock()
+        # Called when a write fails unexpectedly, so in-memory state derived
+        # from the database can be discarded along with the transaction.
+        self.rollback_hooks: List[Callable[[], None]] = []
+        # Called with the writer's connection after a write transaction that
+        # changed data has committed.
+        self.commit_hooks: List[Callable[[sqlite3.Connection], None]] = []
+        # Called when another process changed the data since this one last
+        # looked, so in-memory state derived from the database is rebuilt.
+        self.stale_hooks: List[Callable[[], None]] = []
+        self._seen_version: Optional[str] = None
+        self._version_lock = threading.Lock()
+        self._readers: Optional[ThreadPoolExecutor] = None
+        self._writer: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _executors(self) -> Tuple[ThreadPoolExecutor, ThreadPoolExecutor]:
+        with self._lock:
+            if self._readers is None or self._writer is None:
+                self._readers = ThreadPoolExecutor(
+                    max_workers=self.read_workers, thread_name_prefix="events-reader"
+                )
+                self._writer = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="events-writer"
+                )
+            return self._readers, self._writer
+
+    def _run_read(self, fn: Callable[..., T], args: Tuple[Any, ...]) -> T:
+        return fn(self.pool.connection(), *args)
+
+    def sync_version(self, conn: sqlite3.Connection) -> None:
+        """Run :attr:`stale_hooks` if the data changed behind this process.
+
+        Writes of this process record the version they commit, so a
+        different stored version means another process wrote meanwhile.
+        """
+        version = read_data_version(conn)
+        with self._version_lock:
+            if version == self._seen_version:
+                return
+            self._seen_version = version
+        for hook in self.stale_hooks:
+            hook()
+
+    @contextmanager
+    def _exclusive(self) -> Iterator[None]:
+        if self.write_lock is None:
+            yield
+            return
+        try:
+            with self.write_lock.hold(self.lock_timeout) as waited:
+                DB_LOCK_WAIT.observe(waited)
+                yield
+        except TimeoutError as exc:
+            # Raised before the transaction began; ``asyncio.TimeoutError`` is
+            # the same class, so it must not escape as a timeout (504).
+            DB_REJECTED.inc("locked")
+            raise HTTPException(
+                status_code=503,
+                detail="Database is busy, retry shortly",
+                headers={"Retry-After": "1"},
+            ) from exc
+
+    def _run_write(self, fn: Callable[..., T], args: Tuple[Any, ...]) -> T:
+        conn = self.pool.connection()
+        with self._exclusive():
+            try:
+                with conn:
+                    # Take SQLite's write lock up front so reads made by ``fn``
+                    # cannot be invalidated by a writer outside this process.
+                    conn.execute("BEGIN IMMEDIATE")
+                    self.sync_version(conn)
+                    changes = conn.total_changes
+                    result = fn(conn, *args)
+                    if conn.total_changes != changes:
+                        bump_data_version(conn)
+                        version = read_data_version(conn)
+            except HTTPException:
+                raise
+            except BaseException:
+                for hook in self.rollback_hooks:
+                    hook()
+                raise
+        if conn.total_changes != changes:
+            with self._version_lock:
+                self._seen_version = version
+            for hook in self.commit_hooks:
+                hook(conn)
+        return result
+
+    def _run_timed(
+        self,
+        kind: str,
+        runner: Callable[..., T],
+        fn: Callable[..., Any],
+        args: Tuple[Any, ...],
+        submitted: float,
+    ) -> T:
+        started = time.perf_counter()
+        DB_QUEUE_WAIT.observe(started - submitted, kind)
+        try:
+            return runner(fn, args)
+        finally:
+            DB_OPERATIONS.observe(
+                time.perf_counter() - started, kind, getattr(fn, "__name__", "?")
+            )
+
+    async def _submit(
+        self,
+        start: Callable[[], Future],
+        timeout: Optional[float],
+        finish_started: bool = False,
+    ) -> Any:
+        """Run the work ``start`` submits, holding a pending slot until it ends.
+
+        On timeout, work still queued is cancelled and answered with 504.
+        Work already running keeps its slot until the thread is done with
+        it; with ``finish_started`` (writes) the caller also waits for its
+        outcome, since it may commit after the client has given up.
+        """
+        if self.pending >= self.max_pending:
+            DB_REJECTED.inc("busy")
+            raise HTTPException(
+                status_code=503,
+                detail="Database is busy, retry shortly",
+                headers={"Retry-After": "1"},
+            )
+        self.pending += 1
+        try:
+            work = start()
+        except BaseException:
+            self.pending -= 1
+            raise
+        future = asyncio.wrap_future(work)
+        future.add_done_callback(self._release)
+        try:
+            return await asyncio.wait_for(
+                asyncio.shield(future), self.timeout if timeout is None else timeout
+            )
+        except asyncio.TimeoutError as exc:
+            if future.done():
+                # Finished meanwhile, or ``fn`` itself raised TimeoutError.
+                return future.result()
+            if not work.cancel() and finish_started:
+                return await asyncio.shield(future)
+            DB_REJECTED.inc("timeout")
+            raise HTTPException(
+                status_code=504, detail="Database operation timed out"
+            ) from exc
+
+    def _release(self, _: "asyncio.Future[Any]") -> None:
+        self.pending -= 1
+
+    async def read(
+        self, fn: Callable[..., T], *args: Any, timeout: Optional[float] = None
+    ) -> T:
+        """Run ``fn(conn, *args)`` on a reader thread."""
+        readers, _ = self._executors()
+        return await self._submit(
+            lambda: readers.submit(
+                self._run_timed, "read", self._run_read, fn, args, time.perf_counter()
+            ),
+            timeout,
+        )
+
+    async def write(
+        self,
+        fn: Callable[..., T],
+        *args: Any,
+        timeout: Optional[float] = None,
+        key: Optional[str] = None,
+        replaceable: bool = False,
+    ) -> T:
+        """Run ``fn(conn, *args)`` in a transaction on the writer thread.
+
+        ``key`` names the event the write touches and ``replaceable``
+        marks writes that replace it entirely; both only matter when
+        writes are coalesced.
+        """
+        _, writer = self._executors()
+        if self.coalesce_s is None:
+            return await self._submit(
+                lambda: writer.submit(
+                    self._run_timed,
+                    "write",
+                    self._run_write,
+                    fn,
+                    args,
+                    time.perf_counter(),
+                ),
+                timeout,
+                finish_started=True,
+            )
+        queued = QueuedWrite(fn, args, key, replaceable, time.perf_counter())
+        return await self._submit(
+            lambda: self._enqueue(writer, queued), timeout, finish_started=True
+        )
+
+    def _enqueue(self, writer: ThreadPoolExecutor, queued: QueuedWrite) -> Future:
+        with self._queue_lock:
+            self._queue.append(queued)
+            if not self._flush_scheduled:
+                self._flush_scheduled = True
+                writer.submit(self._flush, writer)
+        return queued.future
+
+    def _flush(self, writer: ThreadPoolExecutor) -> None:
+        # Give writes fired together a moment to join the batch.
+        if self.coalesce_s:
+            time.sleep(self.coalesce_s)
+        with self._queue_lock:
+            batch = self._queue[: self.max_batch]
+            del self._queue[: self.max_batch]
+            if self._queue:
+                writer.submit(self._flush, writer)
+            else:
+                self._flush_scheduled = False
+        # Writes whose caller gave up before they started are dropped.
+        batch = [
+            queued for queued in batch if queued.future.set_running_or_notify_cancel()
+        ]
+        if batch:
+            self._run_batch(batch)
+
+    def _run_queued(
+        self,
+        conn: sqlite3.Connection,
+        queued: QueuedWrite,
+        unwritten: Dict[str, QueuedWrite],
+    ) -> None:
+        kwargs = {"write_content": False} if queued.replaced else {}
+        started = time.perf_counter()
+        conn.execute("SAVEPOINT queued_write")
+        try:
+            queued.result = queued.fn(conn, *queued.args, **kwargs)
+        except Exception as exc:
+            conn.execute("ROLLBACK TO queued_write")
+            if not isinstance(exc, HTTPException):
+                for hook in self.rollback_hooks:
+                    hook()
+            queued.error = exc
+        conn.execute("RELEASE queued_write")
+        DB_OPERATIONS.observe(
+            time.perf_counter() - started,
+            "write",
+            getattr(queued.fn, "__name__", "?"),
+        )
+        if not queued.replaceable or queued.key is None:
+            return
+        if queued.replaced:
+            if queued.error is None:
+                unwritten[queued.key] = queued
+            return
+        # The write that should have replaced the content failed, so store
+        # the content of the last replaced write that succeeded.
+        previous = unwritten.pop(queued.key, None)
+        if previous is not None and queued.error is not None:
+            previous.fn(conn, *previous.args, bump_version=False)
+
+    def _run_batch(self, batch: List[QueuedWrite]) -> None:
+        started = time.perf_counter()
+        for queued in batch:
+            DB_QUEUE_WAIT.observe(started - queued.submitted, "write")
+        DB_WRITE_BATCH.observe(len(batch))
+        _mark_replaced(batch)
+        conn = self.pool.connection()
+        try:
+            with self._exclusive():
+                try:
+                    with conn:
+                        conn.execute("BEGIN IMMEDIATE")
+                        self.sync_version(conn)
+                        changes = conn.total_changes
+                        unwritten: Dict[str, QueuedWrite] = {}
+                        for queued in batch:
+                            self._run_queued(conn, queued, unwritten)
+                        if conn.total_changes != changes:
+                            bump_data_version(conn)
+                            version = read_data_version(conn)
+                except HTTPException:
+                    raise
+                except BaseException:
+                    for hook in self.rollback_hooks:
+                        hook()
+                    raise
+        except BaseException as exc:
+            for queued in batch:
+                queued.future.set_exception(exc)
+            return
+        if conn.total_changes != changes:
+            with self._version_lock:
+                self._seen_version = version
+            for hook in self.commit_hooks:
+                hook(conn)
+        for queued in batch:
+            if queued.error is not None:
+                queued.future.set_exception(queued.error)
+            else:
+                queued.future.set_result(queued.result)
+
+    async def stream(
+        self, sql: str, params: Iterable[Any], batch_size: int
+    ) -> AsyncIterator[List[sqlite3.Row]]:
+        """Yield the rows of ``sql`` in batches of at most ``batch_size``.
+
+        The query runs on a dedicated connection so a long export never
+        holds a pooled one; each ``fetchmany`` call runs on a reader
+        thread, keeping memory bounded by the batch size.
+        """
+        conn = await self.read(lambda _: _connect())
+        try:
+            cursor = await self.read(lambda _: conn.execute(sql, tuple(params)))
+            while True:
+                rows = await self.read(lambda _: cursor.fetchmany(batch_size))
+                if not rows:
+                    break
+                yield rows
+        finally:
+            conn.close()
+
+    def close(self) -> None:
+        """Stop the worker threads and close their connections."""
+        with self._lock:
+            executors = [self._readers, self._writer]
+            self._readers = self._writer = None
+        for executor in executors:
+            if executor is not None:
+                executor.shutdown(wait=True)
+        self.pool.close_all()
+        if self.write_lock is not None:
+            self.write_lock.close()
+
+
+REPOSITORY = EventRepository(
+    POOL,
+    write_lock=WRITE_LOCK,
+    coalesce_s=WRITE_COALESCE_MS / 1000 if WRITE_COALESCE else None,
+)
+# Per-employee interval index used for double-booking checks.
+SCHEDULE = ScheduleIndex()
+REPOSITORY.rollback_hooks.append(SCHEDULE.invalidate)
+REPOSITORY.stale_hooks.append(SCHEDULE.invalidate)
+
+
+def bump_data_version(conn: sqlite3.Connection) -> None:
+    """Advance the table-level version counter inside the current transaction."""
+    conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'data_version'")
+
+
+def read_data_version(conn: sqlite3.Connection) -> str:
+    """Return an opaque token that changes whenever event data changes.
+
+    The token combines a random per-database instance ID with the version
+    counter, so recreating the database never reuses an old token.
+    """
+    rows = dict(
+        conn.execute(
+            "SELECT key, value FROM meta WHERE key IN ('instance', 'data_version')"
+        ).fetchall()
+    )
+    return f"{rows['instance']}.{rows['data_version']}"
 
 
 def get_connection() -> sqlite3.Connection:
-    """Return a new database connection with row factory set.
+    """Return the calling thread's pooled database connection.
 
     The connection uses ``sqlite3.Row`` so that rows can be
-    accessed like dictionaries.
+    accessed like dictionaries. Using it as a context manager
+    commits (or rolls back) a transaction; it does not close the
+    connection, which stays in the pool.
     """
-    conn = sqlite3.connect(str(DATABASE_PATH))
-    conn.row_factory = sqlite3.Row
-    return conn
+    return POOL.connection()
 
 
 def init_db() -> None:
@@ -47,8 +825,17 @@ def init_db() -> None:
 
     Creates the ``events`` table if it does not already exist.
     The table schema mirrors the fields accepted by the API.
+
+    Every step is idempotent and runs under :data:`WRITE_LOCK`, so worker
+    processes starting together migrate the schema one after another and
+    the later ones find nothing left to do.
     """
-    with get_connection() as conn:
+    if DB_JOURNAL_MODE not in _JOURNAL_MODES:
+        raise ValueError(f"Unsupported EVENTS_DB_JOURNAL_MODE: {DB_JOURNAL_MODE}")
+    with WRITE_LOCK.hold(), get_connection() as conn:
+        # The journal mode is persistent, so it only needs setting once.
+        conn.execute(f"PRAGMA journal_mode = {DB_JOURNAL_MODE}")
+        conn.execute(f"PRAGMA archive.journal_mode = {DB_JOURNAL_MODE}")
         conn.execute(
             """
             CREATE TABLE IF NOT EXISTS events (
@@ -68,18 +855,625 @@ def init_db() -> None:
                 status TEXT,
                 staffing_status TEXT,
                 notes TEXT,
-                updated_at TEXT NOT NULL
+                updated_at TEXT NOT NULL,
+                start_at INTEGER,
+                end_at INTEGER,
+                version INTEGER NOT NULL DEFAULT 1
             )
             """
         )
+        _migrate_event_windows(conn)
+        _migrate_event_versions(conn)
+        # Indexes backing the keyset pagination and filters of ``GET /events``.
+        # ``updated_at`` is stored as an ISO-8601 string, so the raw column
+        # sorts chronologically and can be read straight from the index.
+        conn.executescript(
+            """
+            CREATE INDEX IF NOT EXISTS idx_events_updated
+                ON events (updated_at, id);
+            CREATE INDEX IF NOT EXISTS idx_events_status
+                ON events (status, updated_at, id);
+            CREATE INDEX IF NOT EXISTS idx_events_staffing_status
+                ON events (staffing_status, updated_at, id);
+            CREATE INDEX IF NOT EXISTS idx_events_date
+                ON events (date);
+            CREATE INDEX IF NOT EXISTS idx_events_start_at
+                ON events (start_at, end_at);
+            """
+        )
+        _init_assignments(conn)
+        # Table-level version counter used for ETags and cache invalidation.
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value);
+            INSERT OR IGNORE INTO meta (key, value)
+                VALUES ('instance', lower(hex(randomblob(8))));
+            INSERT OR IGNORE INTO meta (key, value) VALUES ('data_version', 0);
+            """
+        )
+        _init_archive(conn)
+        _init_change_log(conn)
+        _init_rollups(conn)
+        _init_search(conn)
 
 
-class EventIn(BaseModel):
-    """Schema for incoming event data.
+def _migrate_event_windows(conn: sqlite3.Connection) -> None:
+    """Add and backfill the ``start_at``/``end_at`` columns.
 
-    All fields are optional except the name. Fields that are not
-    provided will be stored as ``None`` (NULL in the database).
+    They hold the epoch-second window from :func:`staffing.event_window`
+    and back range queries such as ``GET /calendar``. Rows whose stored
+    date or times cannot be parsed keep ``NULL`` windows. The backfill
+    runs once, when the columns are added; the change feed's update
+    trigger is dropped first (``_init_change_log`` recreates it) so the
+    migration does not report every event as changed.
+    """
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(events)")}
+    if "start_at" in columns:
+        return
+    conn.execute("ALTER TABLE events ADD COLUMN start_at INTEGER")
+    conn.execute("ALTER TABLE events ADD COLUMN end_at INTEGER")
+    conn.execute("DROP TRIGGER IF EXISTS trg_events_changes_update")
+    rows = conn.execute(
+        "SELECT rowid, date, start_time, end_time FROM events WHERE date IS NOT NULL"
+    ).fetchall()
+    windows = []
+    for rowid, day, start_time, end_time in rows:
+        window = event_window(day, start_time, end_time)
+        if window is not None:
+            windows.append((*window, rowid))
+    conn.executemany(
+        "UPDATE events SET start_at = ?, end_at = ? WHERE rowid = ?", windows
+    )
+    if len(windows) < len(rows):
+        logger.warning(
+            "%d events have an unparseable date and were left without a window",
+            len(rows) - len(windows),
+        )
+
+
+def _migrate_event_versions(conn: sqlite3.Connection) -> None:
+    """Add the ``version`` column used for optimistic concurrency.
+
+    Existing rows start at version 1, like newly created events.
+    """
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(events)")}
+    if "version" not in columns:
+        conn.execute("ALTER TABLE events ADD COLUMN version INTEGER NOT NULL DEFAULT 1")
+
+
+# ``assign_employees`` arrives as JSON text; anything that is not a JSON
+# array yields no assignment rows instead of failing the write.
+_ASSIGNMENT_ROWS = """
+    SELECT NEW.id, CAST(value AS TEXT), CAST(key AS INTEGER), NEW.updated_at
+    FROM json_each(
+        CASE WHEN json_valid(NEW.assign_employees)
+            AND json_type(NEW.assign_employees) = 'array'
+        THEN NEW.assign_employees ELSE '[]' END
+    )
+    WHERE value IS NOT NULL
+"""
+
+
+def _init_assignments(conn: sqlite3.Connection) -> None:
+    """Create the ``event_assignments`` join table and keep it in sync.
+
+    The table mirrors the Prisma ``Assignment`` model: one row per
+    (event, employee) pair, indexed from both sides so per-employee
+    schedules are an index seek. ``events.assign_employees`` stays the
+    per-event copy returned by the API; triggers derive the join rows
+    from it on every insert, update and delete, and existing rows are
+    backfilled the first time the table is created.
+    """
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'event_assignments'"
+    ).fetchone()
+    conn.executescript(
+        f"""
+        CREATE TABLE IF NOT EXISTS event_assignments (
+            event_id TEXT NOT NULL,
+            employee_id TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            assigned_at TEXT NOT NULL,
+            PRIMARY KEY (event_id, employee_id)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_event_assignments_employee
+            ON event_assignments (employee_id, event_id);
+
+        CREATE TRIGGER IF NOT EXISTS trg_events_assignments_insert
+        AFTER INSERT ON events
+        BEGIN
+            INSERT OR IGNORE INTO event_assignments
+                (event_id, employee_id, position, assigned_at)
+            {_ASSIGNMENT_ROWS};
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_events_assignments_update
+        AFTER UPDATE OF assign_employees ON events
+        WHEN NEW.assign_employees IS NOT OLD.assign_employees
+        BEGIN
+            DELETE FROM event_assignments WHERE event_id = OLD.id;
+            INSERT OR IGNORE INTO event_assignments
+                (event_id, employee_id, position, assigned_at)
+            {_ASSIGNMENT_ROWS};
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_events_assignments_delete
+        AFTER DELETE ON events
+        BEGIN
+            DELETE FROM event_assignments WHERE event_id = OLD.id;
+        END;
+        """
+    )
+    if not exists:
+        conn.execute(
+            """
+            INSERT OR IGNORE INTO event_assignments
+                (event_id, employee_id, position, assigned_at)
+            SELECT events.id, CAST(item.value AS TEXT), CAST(item.key AS INTEGER),
+                events.updated_at
+            FROM events, json_each(
+                CASE WHEN json_valid(events.assign_employees)
+                    AND json_type(events.assign_employees) = 'array'
+                THEN events.assign_employees ELSE '[]' END
+            ) AS item
+            WHERE item.value IS NOT NULL
+            """
+        )
+
+
+def _ensure_trigger(conn: sqlite3.Connection, name: str, sql: str) -> None:
+    """Create trigger ``name`` from ``sql``, replacing an outdated definition.
+
+    An up-to-date trigger is left alone, so a worker starting up never
+    drops a trigger while other workers are writing.
+    """
+    current = conn.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = ?", (name,)
+    ).fetchone()
+    if current is not None and current[0] == sql.strip():
+        return
+    conn.executescript(
+        f"BEGIN; DROP TRIGGER IF EXISTS {name}; {sql.strip()}; COMMIT;"
+    )
+
+
+ARCHIVE_AFTER_DAYS = int(os.getenv("EVENTS_ARCHIVE_AFTER_DAYS", "365"))
+ARCHIVE_INTERVAL_S = float(os.getenv("EVENTS_ARCHIVE_INTERVAL_S", "0"))
+ARCHIVE_BATCH_SIZE = 500
+# Statuses after which an event no longer changes, compared case-insensitively.
+TERMINAL_STATUSES = ("completed", *sorted(INACTIVE_STATUSES))
+# True inside the delete triggers while ``_drop_archived`` moves the row, so
+# they can tell archiving apart from deleting.
+_ARCHIVING = "EXISTS (SELECT 1 FROM event_archive_moves WHERE event_id = OLD.id)"
+
+
+def _init_archive(conn: sqlite3.Connection) -> None:
+    """Create ``archive.archived_events`` for past terminal events.
+
+    The table has the columns of ``events`` plus ``archived_at`` and the
+    indexes behind ``include_archived`` listings and calendar reads.
+    ``event_archive_moves`` in the main database is a scratch table
+    naming the rows being archived; triggers cannot see the attached
+    database, so they consult it instead.
+    """
+    conn.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS archive.archived_events (
+            id TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            date TEXT,
+            start_time TEXT,
+            end_time TEXT,
+            location TEXT,
+            package TEXT,
+            guest_count INTEGER,
+            payout REAL,
+            target_staff_count INTEGER,
+            assign_employees TEXT,
+            client_name TEXT,
+            client_phone TEXT,
+            status TEXT,
+            staffing_status TEXT,
+            notes TEXT,
+            updated_at TEXT NOT NULL,
+            start_at INTEGER,
+            end_at INTEGER,
+            version INTEGER NOT NULL DEFAULT 1,
+            archived_at TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS archive.idx_archived_events_updated
+            ON archived_events (updated_at, id);
+        CREATE INDEX IF NOT EXISTS archive.idx_archived_events_start_at
+            ON archived_events (start_at, end_at);
+        CREATE INDEX IF NOT EXISTS archive.idx_archived_events_date
+            ON archived_events (date);
+
+        CREATE TABLE IF NOT EXISTS event_archive_moves (
+            event_id TEXT PRIMARY KEY
+        ) WITHOUT ROWID;
+        """
+    )
+
+
+CHANGE_LOG_RETENTION = int(os.getenv("EVENTS_CHANGE_LOG_RETENTION", "10000"))
+
+
+def _init_change_log(conn: sqlite3.Connection) -> None:
+    """Create the ``event_changes`` log filled by triggers on ``events``.
+
+    Each insert, update and delete appends ``(seq, event_id, op)``, so
+    every write path, including other processes, feeds the change feed;
+    rows moved to the archive are logged as ``archived``. Only the newest
+    ``CHANGE_LOG_RETENTION`` entries are kept.
+    """
+    conn.executescript(
+        f"""
+        CREATE TABLE IF NOT EXISTS event_changes (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            event_id TEXT NOT NULL,
+            op TEXT NOT NULL,
+            changed_at TEXT NOT NULL
+                DEFAULT (strftime('%Y-%m-%dT%H:%M:%f', 'now'))
+        );
+
+        CREATE TRIGGER IF NOT EXISTS trg_events_changes_insert
+        AFTER INSERT ON events
+        BEGIN
+            INSERT INTO event_changes (event_id, op) VALUES (NEW.id, 'created');
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_events_changes_update
+        AFTER UPDATE ON events
+        BEGIN
+            INSERT INTO event_changes (event_id, op) VALUES (NEW.id, 'updated');
+        END;
+
+        """
+    )
+    _ensure_trigger(
+        conn,
+        "trg_events_changes_delete",
+        f"""
+        CREATE TRIGGER trg_events_changes_delete
+        AFTER DELETE ON events
+        BEGIN
+            INSERT INTO event_changes (event_id, op)
+            VALUES (OLD.id, CASE WHEN {_ARCHIVING} THEN 'archived' ELSE 'deleted' END);
+        END
+        """,
+    )
+    _ensure_trigger(
+        conn,
+        "trg_event_changes_retention",
+        f"""
+        CREATE TRIGGER trg_event_changes_retention
+        AFTER INSERT ON event_changes
+        BEGIN
+            DELETE FROM event_changes
+            WHERE seq <= NEW.seq - {max(CHANGE_LOG_RETENTION, 1):d};
+        END
+        """,
+    )
+
+
+# Distinct employees listed in a row's ``assign_employees`` JSON, with the
+# same guard as ``_ASSIGNMENT_ROWS``. ``{row}`` is NEW, OLD or ``events``.
+_ASSIGNED_EMPLOYEES = """
+    SELECT DISTINCT CAST(value AS TEXT) AS employee_id
+    FROM json_each(
+        CASE WHEN json_valid({row}.assign_employees)
+            AND json_type({row}.assign_employees) = 'array'
+        THEN {row}.assign_employees ELSE '[]' END
+    )
+    WHERE value IS NOT NULL
+"""
+
+# Minutes between ``HH:MM`` start and end times, wrapping past midnight;
+# 0 when either time is missing.
+_EVENT_MINUTES = """
+    CASE WHEN {row}.start_time IS NULL OR {row}.end_time IS NULL THEN 0
+    ELSE ((CAST(substr({row}.end_time, 1, 2) AS INTEGER) * 60
+            + CAST(substr({row}.end_time, 4, 2) AS INTEGER))
+        - (CAST(substr({row}.start_time, 1, 2) AS INTEGER) * 60
+            + CAST(substr({row}.start_time, 4, 2) AS INTEGER))
+        + 1440) % 1440
+    END
+"""
+
+# Rollup tables behind ``/events/stats``: name -> (key columns and their
+# expressions, measure columns and their per-event contribution). Every
+# table is keyed by status too, so the endpoints can filter on it.
+_ROLLUPS: Dict[str, Tuple[Tuple[Tuple[str, str], ...], Tuple[Tuple[str, str], ...]]] = {
+    "stats_monthly": (
+        (
+            ("month", "coalesce(substr({row}.date, 1, 7), '')"),
+            ("status", "coalesce({row}.status, '')"),
+        ),
+        (
+            ("events", "1"),
+            ("payout", "coalesce({row}.payout, 0)"),
+            ("guests", "coalesce({row}.guest_count, 0)"),
+        ),
+    ),
+    "stats_packages": (
+        (
+            ("package", "coalesce({row}.package, '')"),
+            ("month", "coalesce(substr({row}.date, 1, 7), '')"),
+            ("status", "coalesce({row}.status, '')"),
+        ),
+        (
+            ("events", "1"),
+            ("payout", "coalesce({row}.payout, 0)"),
+            ("guests", "coalesce({row}.guest_count, 0)"),
+        ),
+    ),
+    "stats_weekly_staffing": (
+        (
+            # Monday of the event's week.
+            ("week", "coalesce(date({row}.date, 'weekday 0', '-6 days'), '')"),
+            ("status", "coalesce({row}.status, '')"),
+        ),
+        (
+            ("events", "1"),
+            (
+                "understaffed",
+                f"coalesce({{row}}.target_staff_count, 0)"
+                f" > (SELECT count(*) FROM ({_ASSIGNED_EMPLOYEES}))",
+            ),
+            ("staff_needed", "coalesce({row}.target_staff_count, 0)"),
+            ("staff_assigned", f"(SELECT count(*) FROM ({_ASSIGNED_EMPLOYEES}))"),
+        ),
+    ),
+}
+# Columns the rollups are computed from; updates touching none are skipped.
+_ROLLUP_SOURCES = (
+    "date",
+    "start_time",
+    "end_time",
+    "package",
+    "guest_count",
+    "payout",
+    "target_staff_count",
+    "assign_employees",
+    "status",
+)
+
+
+def _rollup_delta(table: str, row: str, sign: int) -> str:
+    """Return the upsert adding (``sign=1``) or removing a row's contribution."""
+    keys, measures = _ROLLUPS[table]
+    key_names = ", ".join(name for name, _ in keys)
+    columns = ", ".join(name for name, _ in (*keys, *measures))
+    values = ", ".join(
+        [expr.format(row=row) for _, expr in keys]
+        + [f"{sign} * ({expr.format(row=row)})" for _, expr in measures]
+    )
+    updates = ", ".join(f"{name} = {name} + excluded.{name}" for name, _ in measures)
+    return (
+        f"INSERT INTO {table} ({columns}) VALUES ({values})"
+        f" ON CONFLICT ({key_names}) DO UPDATE SET {updates};"
+    )
+
+
+def _employee_rollup_delta(row: str, sign: int) -> str:
+    return f"""
+        INSERT INTO stats_employees (employee_id, month, status, events, minutes)
+        SELECT employee_id, coalesce(substr({row}.date, 1, 7), ''),
+            coalesce({row}.status, ''), {sign}, {sign} * ({_EVENT_MINUTES.format(row=row)})
+        FROM ({_ASSIGNED_EMPLOYEES.format(row=row)}) WHERE true
+        ON CONFLICT (employee_id, month, status) DO UPDATE SET
+            events = events + excluded.events,
+            minutes = minutes + excluded.minutes;
+    """
+
+
+def _init_rollups(conn: sqlite3.Connection) -> None:
+    """Create the ``stats_*`` rollup tables and the triggers maintaining them.
+
+    Every insert adds the event's contribution to each rollup, deletes
+    subtract it and updates do both, so the aggregates served by
+    ``/events/stats`` are always current without scanning ``events``.
+    Buckets that drop to zero events are removed. Archived events keep
+    their contribution, so the statistics cover past seasons too.
+    Existing events are aggregated once when the tables are first created.
+    """
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'stats_employees'"
+    ).fetchone()
+    tables = []
+    for table, (keys, measures) in _ROLLUPS.items():
+        key_columns = ", ".join(f"{name} TEXT NOT NULL" for name, _ in keys)
+        measure_columns = ", ".join(f"{name} NOT NULL DEFAULT 0" for name, _ in measures)
+        primary_key = ", ".join(name for name, _ in keys)
+        tables.append(
+            f"CREATE TABLE IF NOT EXISTS {table} ({key_columns}, {measure_columns},"
+            f" PRIMARY KEY ({primary_key})) WITHOUT ROWID;"
+        )
+    tables.append(
+        """
+        CREATE TABLE IF NOT EXISTS stats_employees (
+            employee_id TEXT NOT NULL,
+            month TEXT NOT NULL,
+            status TEXT NOT NULL,
+            events INTEGER NOT NULL DEFAULT 0,
+            minutes INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (employee_id, month, status)
+        ) WITHOUT ROWID;
+        """
+    )
+
+    def deltas(row: str, sign: int) -> str:
+        statements = [_rollup_delta(table, row, sign) for table in _ROLLUPS]
+        statements.append(_employee_rollup_delta(row, sign))
+        return "\n".join(statements)
+
+    cleanup = "\n".join(
+        f"DELETE FROM {table} WHERE events = 0;" for table in (*_ROLLUPS, "stats_employees")
+    )
+    conn.executescript(
+        "\n".join(tables)
+        + f"""
+        CREATE TRIGGER IF NOT EXISTS trg_events_stats_insert
+        AFTER INSERT ON events
+        BEGIN
+            {deltas("NEW", 1)}
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_events_stats_update
+        AFTER UPDATE OF {", ".join(_ROLLUP_SOURCES)} ON events
+        WHEN {" OR ".join(f"OLD.{c} IS NOT NEW.{c}" for c in _ROLLUP_SOURCES)}
+        BEGIN
+            {deltas("OLD", -1)}
+            {deltas("NEW", 1)}
+            {cleanup}
+        END;
+
+        """
+    )
+    _ensure_trigger(
+        conn,
+        "trg_events_stats_delete",
+        f"""
+        CREATE TRIGGER trg_events_stats_delete
+        AFTER DELETE ON events
+        WHEN NOT {_ARCHIVING}
+        BEGIN
+            {deltas("OLD", -1)}
+            {cleanup}
+        END
+        """,
+    )
+    if not exists:
+        for table, (keys, measures) in _ROLLUPS.items():
+            names = [name for name, _ in (*keys, *measures)]
+            key_exprs = [expr.format(row="events") for _, expr in keys]
+            sums = [f"sum({expr.format(row='events')})" for _, expr in measures]
+            conn.execute(
+                f"INSERT INTO {table} ({', '.join(names)})"
+                f" SELECT {', '.join(key_exprs + sums)} FROM events"
+                f" GROUP BY {', '.join(str(i + 1) for i in range(len(keys)))}"
+            )
+        conn.execute(
+            f"""
+            INSERT INTO stats_employees (employee_id, month, status, events, minutes)
+            SELECT employee_id, month, status, count(*), sum(minutes)
+            FROM (
+                SELECT DISTINCT events.id, CAST(item.value AS TEXT) AS employee_id,
+                    coalesce(substr(events.date, 1, 7), '') AS month,
+                    coalesce(events.status, '') AS status,
+                    {_EVENT_MINUTES.format(row="events")} AS minutes
+                FROM events, json_each(
+                    CASE WHEN json_valid(events.assign_employees)
+                        AND json_type(events.assign_employees) = 'array'
+                    THEN events.assign_employees ELSE '[]' END
+                ) AS item
+                WHERE item.value IS NOT NULL
+            )
+            GROUP BY employee_id, month, status
+            """
+        )
+
+
+# Columns mirrored into ``events_fts`` and their bm25 weights: a hit in the
+# event or client name outranks one buried in the notes.
+SEARCH_COLUMNS = {
+    "name": 10.0,
+    "location": 2.0,
+    "client_name": 5.0,
+    "client_phone": 2.0,
+    "notes": 1.0,
+}
+
+
+def _init_search(conn: sqlite3.Connection) -> None:
+    """Create the ``events_fts`` full-text index over ``events``.
+
+    It is an external-content FTS5 table keyed by the ``events`` rowid,
+    so the text is not stored twice; triggers mirror every insert,
+    update and delete. The index is built from existing rows when it is
+    first created. ``VACUUM`` may renumber the rowids of ``events``, so
+    run :func:`rebuild_search_index` after one.
     """
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'events_fts'"
+    ).fetchone()
+    columns = ", ".join(SEARCH_COLUMNS)
+    new_values = ", ".join(f"NEW.{column}" for column in SEARCH_COLUMNS)
+    old_values = ", ".join(f"OLD.{column}" for column in SEARCH_COLUMNS)
+    conn.executescript(
+        f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS events_fts USING fts5(
+            {columns},
+            content = 'events',
+            content_rowid = 'rowid',
+            tokenize = 'unicode61 remove_diacritics 2'
+        );
+
+        CREATE TRIGGER IF NOT EXISTS trg_events_fts_insert
+        AFTER INSERT ON events
+        BEGIN
+            INSERT INTO events_fts (rowid, {columns}) VALUES (NEW.rowid, {new_values});
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_events_fts_update
+        AFTER UPDATE OF {columns} ON events
+        BEGIN
+            INSERT INTO events_fts (events_fts, rowid, {columns})
+                VALUES ('delete', OLD.rowid, {old_values});
+            INSERT INTO events_fts (rowid, {columns}) VALUES (NEW.rowid, {new_values});
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_events_fts_delete
+        AFTER DELETE ON events
+        BEGIN
+            INSERT INTO events_fts (events_fts, rowid, {columns})
+                VALUES ('delete', OLD.rowid, {old_values});
+        END;
+        """
+    )
+    if not exists:
+        rebuild_search_index(conn)
+
+
+def rebuild_search_index(conn: sqlite3.Connection) -> None:
+    """Rebuild ``events_fts`` from the current contents of ``events``."""
+    conn.execute("INSERT INTO events_fts (events_fts) VALUES ('rebuild')")
+
+
+def normalise_date(value: Optional[str]) -> Optional[str]:
+    """Validate a ``YYYY-MM-DD`` date; blank values become ``None``."""
+    if value is None or not value.strip():
+        return None
+    parsed = parse_date(value)
+    if parsed is None:
+        raise ValueError("date must be a valid YYYY-MM-DD date")
+    return parsed.isoformat()
+
+
+def query_date(value: Optional[str], name: str) -> Optional[str]:
+    """Normalise a date query parameter, answering invalid values with 422."""
+    try:
+        return normalise_date(value)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=422, detail=f"{name} must be a valid YYYY-MM-DD date"
+        ) from exc
+
+
+def normalise_time(value: Optional[str]) -> Optional[str]:
+    """Validate an ``HH:MM`` (or ``HH:MM:SS``) time; blank values become ``None``."""
+    if value is None or not value.strip():
+        return None
+    parsed = parse_time(value)
+    if parsed is None or parsed.tzinfo is not None:
+        raise ValueError("time must be a valid HH:MM time")
+    if parsed.second or parsed.microsecond:
+        return parsed.isoformat(timespec="seconds")
+    return parsed.isoformat(timespec="minutes")
+
+
+class EventFields(BaseModel):
+    """Event attributes shared by the request and response schemas."""
 
     name: str = Field(..., description="Event name")
     date: Optional[str] = Field(None, description="Event date (YYYY-MM-DD)")
@@ -115,59 +1509,189 @@ class EventIn(BaseModel):
     notes: Optional[str] = Field(None, description="Notes and client preferences")
 
 
-class Event(EventIn):
-    """Schema for outgoing event data, includes the ID and update timestamp."""
+class EventIn(EventFields):
+    """Schema for incoming event data.
 
-    id: str
-    updated_at: str
+    All fields are optional except the name. Fields that are not
+    provided will be stored as ``None`` (NULL in the database).
+    ``date`` and the times are validated and normalised to
+    ``YYYY-MM-DD`` and ``HH:MM`` (``HH:MM:SS`` when seconds are given);
+    blank strings count as missing.
+    """
 
+    @field_validator("date")
+    @classmethod
+    def _normalise_date(cls, value: Optional[str]) -> Optional[str]:
+        return normalise_date(value)
 
-app = FastAPI(title="Events API")
+    @field_validator("start_time", "end_time")
+    @classmethod
+    def _normalise_time(cls, value: Optional[str]) -> Optional[str]:
+        return normalise_time(value)
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["http://localhost:3000", "http://127.0.0.1:3000"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
 
+class EventPatch(BaseModel):
+    """Sparse event update for ``PATCH /events/{id}``.
 
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    """Log each incoming request with the response status code."""
+    Only the fields present in the body are written; ``null`` clears a
+    field. Values are validated like :class:`EventIn`, and unknown
+    fields are rejected so a typo cannot pass as a no-op.
+    """
 
-    start_time = datetime.utcnow()
-    response = await call_next(request)
-    duration = (datetime.utcnow() - start_time).total_seconds() * 1000
-    logger.info(
-        "%s %s -> %s (%.2f ms)",
-        request.method,
+    model_config = ConfigDict(extra="forbid")
+
+    name: Optional[str] = None
+    date: Optional[str] = None
+    start_time: Optional[str] = None
+    end_time: Optional[str] = None
+    location: Optional[str] = None
+    package: Optional[str] = None
+    guest_count: Optional[int] = None
+    payout: Optional[float] = None
+    target_staff_count: Optional[int] = None
+    assign_employees: Optional[List[str]] = None
+    client_name: Optional[str] = None
+    client_phone: Optional[str] = None
+    status: Optional[str] = None
+    staffing_status: Optional[str] = None
+    notes: Optional[str] = None
+
+    @field_validator("name")
+    @classmethod
+    def _require_name(cls, value: Optional[str]) -> str:
+        if value is None:
+            raise ValueError("name cannot be cleared")
+        return value
+
+    @field_validator("date")
+    @classmethod
+    def _normalise_date(cls, value: Optional[str]) -> Optional[str]:
+        return normalise_date(value)
+
+    @field_validator("start_time", "end_time")
+    @classmethod
+    def _normalise_time(cls, value: Optional[str]) -> Optional[str]:
+        return normalise_time(value)
+
+    def changes(self) -> Dict[str, Any]:
+        """Return the supplied fields as stored column values."""
+        values = self.model_dump(exclude_unset=True)
+        if "assign_employees" in values:
+            employees = values["assign_employees"]
+            values["assign_employees"] = json.dumps(employees) if employees else None
+        return values
+
+
+class Event(EventFields):
+    """Schema for outgoing event data, includes the ID and update timestamp.
+
+    Stored values are returned as they are, so rows written before
+    input validation existed still load.
+    """
+
+    id: str
+    updated_at: str
+    version: int = Field(
+        1, description="Incremented on every change; send it back in If-Match"
+    )
+
+
+app = FastAPI(title="Events API")
+
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["http://localhost:3000", "http://127.0.0.1:3000"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor"],
+)
+
+# Responses of at least this many bytes are gzip or brotli encoded when
+# the client accepts it; a negative value turns compression off.
+COMPRESS_MIN_BYTES = int(os.getenv("EVENTS_COMPRESS_MIN_BYTES", "1024"))
+if COMPRESS_MIN_BYTES >= 0:
+    app.add_middleware(CompressionMiddleware, minimum_size=COMPRESS_MIN_BYTES)
+
+
+def _route_template(request: Request) -> str:
+    """Return the matched route path, keeping metric labels bounded."""
+    route = request.scope.get("route")
+    return getattr(route, "path", None) or "<unmatched>"
+
+
+@app.middleware("http")
+async def log_requests(request: Request, call_next):
+    """Log each request, record its metrics and profile it when sampled."""
+
+    method = request.method
+    HTTP_IN_FLIGHT.inc(method)
+    profile = PROFILER.start()
+    status = 500
+    started = time.perf_counter()
+    try:
+        response = await call_next(request)
+        status = response.status_code
+    finally:
+        duration = time.perf_counter() - started
+        HTTP_IN_FLIGHT.dec(method)
+        route = _route_template(request)
+        HTTP_REQUESTS.inc(method, route, str(status))
+        HTTP_LATENCY.observe(duration, method, route)
+        if profile is not None:
+            trace = PROFILER.finish(profile, f"{method} {route}", duration)
+            if trace is not None:
+                logger.warning("Slow request profiled to %s", trace)
+    logger.info(
+        "%s %s -> %s (%.2f ms)",
+        method,
         request.url.path,
-        response.status_code,
-        duration,
+        status,
+        duration * 1000,
     )
     return response
 
 
+# Background task running ``archive_events`` every EVENTS_ARCHIVE_INTERVAL_S.
+_ARCHIVER: Optional[asyncio.Task] = None
+
+
 @app.on_event("startup")
 def on_startup() -> None:
     """Initialize the database on application startup."""
+    global _ARCHIVER
     init_db()
+    CHANGES.sync(get_connection())
+    if ARCHIVE_INTERVAL_S > 0:
+        _ARCHIVER = asyncio.get_running_loop().create_task(
+            _archive_periodically(ARCHIVE_INTERVAL_S)
+        )
     logger.info("Events API ready on http://127.0.0.1:8000 (db=%s)", DATABASE_PATH)
 
 
+@app.on_event("shutdown")
+def on_shutdown() -> None:
+    """Stop the data layer and close pooled connections on shutdown."""
+    if _ARCHIVER is not None:
+        _ARCHIVER.cancel()
+    REPOSITORY.close()
+
+
+def _parse_assignments(value: Optional[str]) -> List[str]:
+    """Decode the stored ``assign_employees`` JSON into a list of IDs."""
+    if not value:
+        return []
+    try:
+        parsed = json.loads(value)
+    except json.JSONDecodeError:
+        return []
+    if not isinstance(parsed, list):
+        return []
+    return [str(item) for item in parsed if item is not None]
+
+
 def row_to_event(row: sqlite3.Row) -> Event:
     """Convert a database row to an Event model instance."""
-    # Parse assign_employees JSON if present
-    assign_employees: List[str] = []
-    if row["assign_employees"]:
-        try:
-            parsed = json.loads(row["assign_employees"])
-            if isinstance(parsed, list):
-                assign_employees = [str(item) for item in parsed if item is not None]
-        except json.JSONDecodeError:
-            assign_employees = []
     return Event(
         id=row["id"],
         name=row["name"],
@@ -179,150 +1703,2540 @@ def row_to_event(row: sqlite3.Row) -> Event:
         guest_count=row["guest_count"],
         payout=row["payout"],
         target_staff_count=row["target_staff_count"],
-        assign_employees=assign_employees,
+        assign_employees=_parse_assignments(row["assign_employees"]),
         client_name=row["client_name"],
         client_phone=row["client_phone"],
         status=row["status"],
         staffing_status=row["staffing_status"],
         notes=row["notes"],
         updated_at=row["updated_at"],
+        version=row["version"],
     )
 
 
-@app.get("/events", response_model=List[Event])
-def list_events() -> List[Event]:
-    """Return all events sorted by ``updated_at`` descending."""
-    with get_connection() as conn:
-        rows = conn.execute(
-            "SELECT * FROM events ORDER BY datetime(updated_at) DESC"
-        ).fetchall()
-        return [row_to_event(row) for row in rows]
+# Opt-in fast path for list responses: rows are mapped straight to JSON
+# bytes instead of being validated into ``Event`` models first.
+FAST_JSON = os.getenv("EVENTS_FAST_JSON", "").lower() in {"1", "true", "yes"}
 
 
-@app.post("/events", response_model=Event)
-def create_event(event: EventIn) -> Event:
-    """Create a new event and return the created record.
+def _dumps(value: Any) -> bytes:
+    """Encode ``value`` as compact UTF-8 JSON, with orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
 
-    Generates a UUID for the new event and records the current
-    timestamp as ``updated_at``.
+
+class RowEncoder:
+    """Serialize event rows to the JSON produced for ``List[Event]``.
+
+    The position of every ``Event`` field in the result set is resolved
+    once per distinct column layout, after which each row becomes a
+    plain dict in model field order without constructing a model.
+    ``fields`` may be any subset of the model fields, which is how
+    ``fields=`` projections are rendered.
     """
-    event_id = str(uuid.uuid4())
-    updated_at = datetime.utcnow().isoformat()
+
+    def __init__(self, fields: Iterable[str]) -> None:
+        self.fields = tuple(fields)
+        self._layouts: Dict[Tuple[str, ...], Tuple[int, ...]] = {}
+        self._assignments = (
+            self.fields.index("assign_employees")
+            if "assign_employees" in self.fields
+            else None
+        )
+
+    def _positions(self, row: sqlite3.Row) -> Tuple[int, ...]:
+        columns = tuple(row.keys())
+        positions = self._layouts.get(columns)
+        if positions is None:
+            index = {column: position for position, column in enumerate(columns)}
+            positions = tuple(index[field] for field in self.fields)
+            self._layouts[columns] = positions
+        return positions
+
+    def _picker(self, row: sqlite3.Row) -> Callable[[sqlite3.Row], Tuple[Any, ...]]:
+        positions = self._positions(row)
+        if len(positions) == 1:
+            # itemgetter with a single index returns the bare value.
+            (position,) = positions
+            return lambda row: (row[position],)
+        return operator.itemgetter(*positions)
+
+    def records(self, rows: List[sqlite3.Row]) -> List[Dict[str, Any]]:
+        """Return the rows as JSON-ready dicts."""
+        if not rows:
+            return []
+        pick = self._picker(rows[0])
+        fields = self.fields
+        slot = self._assignments
+        if slot is None:
+            return [dict(zip(fields, pick(row))) for row in rows]
+        # Most events share a handful of assignment lists, so each distinct
+        # stored string is decoded once per response.
+        parsed: Dict[Optional[str], List[str]] = {}
+        records = []
+        for row in rows:
+            values = list(pick(row))
+            raw = values[slot]
+            employees = parsed.get(raw)
+            if employees is None:
+                employees = parsed[raw] = _parse_assignments(raw)
+            values[slot] = employees
+            records.append(dict(zip(fields, values)))
+        return records
+
+    def columns(self, rows: List[sqlite3.Row]) -> Dict[str, List[Any]]:
+        """Return the rows as one list of values per field.
+
+        Field names appear once instead of once per row, which roughly
+        halves the size of a page of short values.
+        """
+        if not rows:
+            return {field: [] for field in self.fields}
+        columns = [list(values) for values in zip(*map(self._picker(rows[0]), rows))]
+        slot = self._assignments
+        if slot is not None:
+            parsed: Dict[Optional[str], List[str]] = {}
+            for raw in set(columns[slot]):
+                parsed[raw] = _parse_assignments(raw)
+            columns[slot] = [parsed[raw] for raw in columns[slot]]
+        return dict(zip(self.fields, columns))
+
+    def encode(self, rows: List[sqlite3.Row]) -> bytes:
+        """Return the rows as a JSON array."""
+        return _dumps(self.records(rows))
+
+
+EVENT_ENCODER = RowEncoder(Event.model_fields)
+# Encoders of ``fields=`` projections, keyed by the projected fields.
+_PROJECTIONS: Dict[Tuple[str, ...], RowEncoder] = {}
+MAX_PROJECTIONS = 64
+
+
+def projection_encoder(fields: Tuple[str, ...]) -> RowEncoder:
+    """Return the cached encoder writing only ``fields``."""
+    encoder = _PROJECTIONS.get(fields)
+    if encoder is None:
+        if len(_PROJECTIONS) >= MAX_PROJECTIONS:
+            _PROJECTIONS.clear()
+        encoder = _PROJECTIONS[fields] = RowEncoder(fields)
+    return encoder
+
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+class EventFilters(BaseModel):
+    """Server-side filters shared by the event listing endpoints."""
+
+    date_from: Optional[str] = None
+    date_to: Optional[str] = None
+    status: Optional[str] = None
+    staffing_status: Optional[str] = None
+    employee: Optional[str] = None
+
+    def to_sql(self, archived: bool = False) -> Tuple[List[str], List[Any]]:
+        """Return ``WHERE`` clauses and their parameters for these filters.
+
+        With ``archived`` the clauses target ``archived_events``, which has
+        no assignments table, so the employee filter reads the JSON list.
+        """
+        clauses: List[str] = []
+        params: List[Any] = []
+        if self.date_from is not None:
+            clauses.append("date >= ?")
+            params.append(self.date_from)
+        if self.date_to is not None:
+            clauses.append("date <= ?")
+            params.append(self.date_to)
+        if self.status is not None:
+            clauses.append("status = ?")
+            params.append(self.status)
+        if self.staffing_status is not None:
+            clauses.append("staffing_status = ?")
+            params.append(self.staffing_status)
+        if self.employee is not None and archived:
+            clauses.append(
+                """EXISTS (SELECT 1 FROM json_each(
+                    CASE WHEN json_valid(assign_employees)
+                        AND json_type(assign_employees) = 'array'
+                    THEN assign_employees ELSE '[]' END
+                ) WHERE value = ?)"""
+            )
+            params.append(self.employee)
+        elif self.employee is not None:
+            clauses.append(
+                "id IN (SELECT event_id FROM event_assignments WHERE employee_id = ?)"
+            )
+            params.append(self.employee)
+        return clauses, params
+
+
+def event_filters(
+    date_from: Optional[str] = Query(
+        None, description="Only events on or after this date (YYYY-MM-DD)"
+    ),
+    date_to: Optional[str] = Query(
+        None, description="Only events on or before this date (YYYY-MM-DD)"
+    ),
+    status: Optional[str] = Query(None, description="Exact event status"),
+    staffing_status: Optional[str] = Query(
+        None, description="Exact staffing status"
+    ),
+    employee: Optional[str] = Query(
+        None, description="Only events the given employee is assigned to"
+    ),
+) -> EventFilters:
+    """Collect the list filters from the query string."""
+    return EventFilters(
+        date_from=query_date(date_from, "date_from"),
+        date_to=query_date(date_to, "date_to"),
+        status=status,
+        staffing_status=staffing_status,
+        employee=employee,
+    )
+
+
+INCLUDE_ARCHIVED_QUERY = Query(
+    False, description="Also return archived events (see POST /events/archive)"
+)
+
+
+def encode_cursor(updated_at: str, event_id: str) -> str:
+    """Encode the keyset position of a row as an opaque cursor string."""
+    raw = json.dumps([updated_at, event_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """Decode a cursor produced by :func:`encode_cursor`.
+
+    Raises a 400 error when the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        updated_at, event_id = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, ValueError, TypeError) as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+    if not isinstance(updated_at, str) or not isinstance(event_id, str):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return updated_at, event_id
+
+
+def _archived_part(
+    filters: EventFilters,
+    clauses: List[str],
+    params: List[Any],
+    columns: Optional[str] = None,
+) -> Tuple[str, List[Any]]:
+    """Return the ``UNION ALL`` arm reading ``archived_events``.
+
+    ``clauses`` are added to the filters; rows that are live again, e.g.
+    while an archiving run is between its two steps, are skipped.
+    ``columns`` defaults to every listed column.
+    """
+    archived, archived_params = filters.to_sql(archived=True)
+    archived.extend(clauses)
+    archived.append("NOT EXISTS (SELECT 1 FROM events AS live WHERE live.id = a.id)")
+    return (
+        f" UNION ALL SELECT {columns or _LISTED_COLUMNS} FROM archived_events AS a"
+        f" WHERE {' AND '.join(archived)}",
+        [*archived_params, *params],
+    )
+
+
+def _select_events(
+    conn: sqlite3.Connection,
+    filters: EventFilters,
+    limit: int,
+    cursor: Optional[Tuple[str, str]],
+    include_archived: bool = False,
+    fields: Optional[Tuple[str, ...]] = None,
+) -> List[sqlite3.Row]:
+    # A projection still reads the keyset columns the next cursor is built from.
+    columns = ", ".join(dict.fromkeys(("id", "updated_at", *fields))) if fields else None
+    clauses, params = filters.to_sql()
+    keyset: List[str] = []
+    if cursor is not None:
+        keyset.append("(updated_at, id) < (?, ?)")
+    clauses.extend(keyset)
+    params.extend(cursor or ())
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    if not include_archived:
+        return conn.execute(
+            f"SELECT {columns or '*'} FROM events {where}"
+            " ORDER BY updated_at DESC, id DESC LIMIT ?",
+            (*params, limit),
+        ).fetchall()
+    archived, archived_params = _archived_part(
+        filters, keyset, list(cursor or ()), columns
+    )
+    return conn.execute(
+        f"SELECT {columns or _LISTED_COLUMNS} FROM events {where}{archived}"
+        " ORDER BY updated_at DESC, id DESC LIMIT ?",
+        (*params, *archived_params, limit),
+    ).fetchall()
+
+
+# Event attributes as stored, in API field order.
+EVENT_FIELDS = (
+    "name",
+    "date",
+    "start_time",
+    "end_time",
+    "location",
+    "package",
+    "guest_count",
+    "payout",
+    "target_staff_count",
+    "assign_employees",
+    "client_name",
+    "client_phone",
+    "status",
+    "staffing_status",
+    "notes",
+)
+# Stored columns in the order produced by ``_event_values``: the event
+# attributes plus the derived epoch-second window.
+STORED_FIELDS = (*EVENT_FIELDS, "start_at", "end_at")
+# Columns read when live and archived rows are listed together.
+_LISTED_COLUMNS = ", ".join(("id", *STORED_FIELDS, "updated_at", "version"))
+
+
+def _event_values(event: EventIn) -> Tuple[Any, ...]:
+    """Return the stored column values of ``event`` in schema order."""
     # Serialize assign_employees list to JSON string
     assign_json = json.dumps(event.assign_employees) if event.assign_employees else None
-    with get_connection() as conn:
-        conn.execute(
-            """
-            INSERT INTO events (
-                id, name, date, start_time, end_time, location, package,
-                guest_count, payout, target_staff_count, assign_employees,
-                client_name, client_phone, status, staffing_status, notes, updated_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                event_id,
-                event.name,
-                event.date,
-                event.start_time,
-                event.end_time,
-                event.location,
-                event.package,
-                event.guest_count,
-                event.payout,
-                event.target_staff_count,
-                assign_json,
-                event.client_name,
-                event.client_phone,
-                event.status,
-                event.staffing_status,
-                event.notes,
-                updated_at,
-            ),
+    window = event_window(event.date, event.start_time, event.end_time)
+    start_at, end_at = window if window is not None else (None, None)
+    return (
+        event.name,
+        event.date,
+        event.start_time,
+        event.end_time,
+        event.location,
+        event.package,
+        event.guest_count,
+        event.payout,
+        event.target_staff_count,
+        assign_json,
+        event.client_name,
+        event.client_phone,
+        event.status,
+        event.staffing_status,
+        event.notes,
+        start_at,
+        end_at,
+    )
+
+
+def _ensure_no_conflicts(
+    conn: sqlite3.Connection, event_id: str, event: EventIn
+) -> None:
+    """Raise 409 when ``event`` would double-book an assigned employee."""
+    if not is_active(event.status):
+        return
+    window = event_window(event.date, event.start_time, event.end_time)
+    conflicts = SCHEDULE.conflicts(
+        conn, window, event.assign_employees, exclude=(event_id,)
+    )
+    if conflicts:
+        raise HTTPException(
+            status_code=409,
+            detail={
+                "message": "Assigned employees are already booked at that time",
+                "conflicts": [
+                    {"employee_id": employee, "event_id": other}
+                    for employee, other in conflicts
+                ],
+            },
         )
-    return Event(id=event_id, updated_at=updated_at, **event.dict())
 
 
-@app.put("/events/{event_id}", response_model=Event)
-def update_event(event_id: str, event: EventIn) -> Event:
-    """Update an existing event.
+def _index_event(conn: sqlite3.Connection, event_id: str, event: EventIn) -> None:
+    SCHEDULE.update(
+        conn,
+        event_id,
+        event.date,
+        event.start_time,
+        event.end_time,
+        event.status,
+        event.assign_employees,
+    )
 
-    If the event does not exist, a 404 error is raised. All fields
-    provided in the request body will replace the stored values.
-    The ``updated_at`` timestamp is refreshed.
+
+def _insert_event(
+    conn: sqlite3.Connection,
+    event_id: str,
+    event: EventIn,
+    updated_at: str,
+    check_conflicts: bool = True,
+) -> None:
+    if check_conflicts:
+        _ensure_no_conflicts(conn, event_id, event)
+    conn.execute(
+        """
+        INSERT INTO events (
+            id, name, date, start_time, end_time, location, package,
+            guest_count, payout, target_staff_count, assign_employees,
+            client_name, client_phone, status, staffing_status, notes,
+            start_at, end_at, updated_at
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        (event_id, *_event_values(event), updated_at),
+    )
+    _index_event(conn, event_id, event)
+
+
+# Versions accepted by an ``If-Match`` header; ``None`` accepts any.
+ExpectedVersions = FrozenSet[int]
+
+
+def _version_etag(version: int) -> str:
+    return f'"{version}"'
+
+
+def parse_if_match(header: Optional[str]) -> Optional[ExpectedVersions]:
+    """Return the event versions listed in an ``If-Match`` header.
+
+    ``None`` (no header, or ``*``) places no condition on the version.
+    Tags that are not versions of this API can never match.
     """
-    updated_at = datetime.utcnow().isoformat()
-    assign_json = json.dumps(event.assign_employees) if event.assign_employees else None
-    with get_connection() as conn:
-        cursor = conn.execute(
-            "SELECT COUNT(1) FROM events WHERE id = ?", (event_id,)
+    if header is None:
+        return None
+    tags = [tag.strip() for tag in header.split(",") if tag.strip()]
+    if "*" in tags:
+        return None
+    versions = set()
+    for tag in tags:
+        value = tag.removeprefix("W/").strip('"')
+        if value.isdigit():
+            versions.add(int(value))
+    return frozenset(versions)
+
+
+def _missing_or_stale(
+    conn: sqlite3.Connection, event_id: str, expected: Optional[ExpectedVersions]
+) -> HTTPException:
+    """Explain why a conditional write matched no row: 404 or 412."""
+    row = conn.execute("SELECT version FROM events WHERE id = ?", (event_id,)).fetchone()
+    if row is None:
+        return HTTPException(status_code=404, detail="Event not found")
+    return HTTPException(
+        status_code=412,
+        detail={
+            "message": "Event was modified by someone else",
+            "version": row["version"],
+            "expected": sorted(expected or ()),
+        },
+        headers={"ETag": _version_etag(row["version"])},
+    )
+
+
+def _version_clause(expected: Optional[ExpectedVersions]) -> Tuple[str, List[int]]:
+    """Return the ``AND version IN (...)`` guard for ``If-Match`` versions."""
+    if expected is None:
+        return "", []
+    if not expected:
+        return " AND 0", []
+    return f" AND version IN ({', '.join('?' for _ in expected)})", sorted(expected)
+
+
+def _update_event(
+    conn: sqlite3.Connection,
+    event_id: str,
+    event: EventIn,
+    updated_at: str,
+    check_conflicts: bool = True,
+    expected: Optional[ExpectedVersions] = None,
+    write_content: bool = True,
+    bump_version: bool = True,
+) -> int:
+    """Replace a stored event in one conditional statement; return its version.
+
+    Coalesced writes split the work of a ``PUT`` that a later one in the
+    same transaction replaces: ``write_content=False`` only checks the
+    preconditions, bumps the version and updates the schedule index, as
+    the content is about to be overwritten. Should the later ``PUT`` fail,
+    ``bump_version=False`` stores the content after all, without checks.
+    """
+    if not write_content:
+        if check_conflicts:
+            _ensure_no_conflicts(conn, event_id, event)
+        guard, versions = _version_clause(expected)
+        row = conn.execute(
+            f"UPDATE events SET version = version + 1 WHERE id = ?{guard}"
+            " RETURNING version",
+            (event_id, *versions),
+        ).fetchall()
+        if not row:
+            raise _missing_or_stale(conn, event_id, expected)
+        _index_event(conn, event_id, event)
+        return row[0]["version"]
+    if check_conflicts and bump_version:
+        _ensure_no_conflicts(conn, event_id, event)
+    guard, versions = _version_clause(expected) if bump_version else ("", [])
+    row = conn.execute(
+        f"""
+        UPDATE events SET
+            name = ?,
+            date = ?,
+            start_time = ?,
+            end_time = ?,
+            location = ?,
+            package = ?,
+            guest_count = ?,
+            payout = ?,
+            target_staff_count = ?,
+            assign_employees = ?,
+            client_name = ?,
+            client_phone = ?,
+            status = ?,
+            staffing_status = ?,
+            notes = ?,
+            start_at = ?,
+            end_at = ?,
+            updated_at = ?,
+            version = version + ?
+        WHERE id = ?{guard}
+        RETURNING version
+        """,
+        (*_event_values(event), updated_at, int(bump_version), event_id, *versions),
+    ).fetchall()
+    if not row:
+        raise _missing_or_stale(conn, event_id, expected)
+    _index_event(conn, event_id, event)
+    return row[0]["version"]
+
+
+def _delete_event(
+    conn: sqlite3.Connection,
+    event_id: str,
+    expected: Optional[ExpectedVersions] = None,
+) -> None:
+    guard, versions = _version_clause(expected)
+    cursor = conn.execute(
+        f"DELETE FROM events WHERE id = ?{guard}", (event_id, *versions)
+    )
+    if cursor.rowcount == 0:
+        raise _missing_or_stale(conn, event_id, expected)
+    SCHEDULE.remove(conn, event_id)
+
+
+# Fields that move an event in time or change who works it.
+_WINDOW_FIELDS = {"date", "start_time", "end_time"}
+_SCHEDULE_FIELDS = _WINDOW_FIELDS | {"status", "assign_employees"}
+
+
+def _patch_event(
+    conn: sqlite3.Connection,
+    event_id: str,
+    changes: Dict[str, Any],
+    updated_at: str,
+    check_conflicts: bool = True,
+    expected: Optional[ExpectedVersions] = None,
+) -> sqlite3.Row:
+    """Write only the ``changes`` columns and return the stored row.
+
+    The UPDATE names just the supplied columns, so triggers and indexes
+    on untouched columns are skipped. When the date or times change, the
+    stored window is computed from the merged values and written by the
+    same statement, and the double-booking check runs against the
+    merged row before the transaction commits.
+    """
+    guard, versions = _version_clause(expected)
+    columns = dict(changes)
+    if _WINDOW_FIELDS & changes.keys():
+        current = conn.execute(
+            "SELECT date, start_time, end_time FROM events WHERE id = ?", (event_id,)
+        ).fetchone()
+        if current is None:
+            raise _missing_or_stale(conn, event_id, expected)
+        merged = {field: columns.get(field, current[field]) for field in _WINDOW_FIELDS}
+        window = event_window(merged["date"], merged["start_time"], merged["end_time"])
+        columns["start_at"], columns["end_at"] = (
+            window if window is not None else (None, None)
         )
-        count = cursor.fetchone()[0]
-        if count == 0:
-            raise HTTPException(status_code=404, detail="Event not found")
-        conn.execute(
-            """
-            UPDATE events SET
-                name = ?,
-                date = ?,
-                start_time = ?,
-                end_time = ?,
-                location = ?,
-                package = ?,
-                guest_count = ?,
-                payout = ?,
-                target_staff_count = ?,
-                assign_employees = ?,
-                client_name = ?,
-                client_phone = ?,
-                status = ?,
-                staffing_status = ?,
-                notes = ?,
-                updated_at = ?
-            WHERE id = ?
-            """,
-            (
-                event.name,
-                event.date,
-                event.start_time,
-                event.end_time,
-                event.location,
-                event.package,
-                event.guest_count,
-                event.payout,
-                event.target_staff_count,
-                assign_json,
-                event.client_name,
-                event.client_phone,
-                event.status,
-                event.staffing_status,
-                event.notes,
-                updated_at,
-                event_id,
-            ),
+    assignments = ", ".join(f"{column} = ?" for column in columns)
+    rows = conn.execute(
+        f"""
+        UPDATE events SET {assignments}, updated_at = ?, version = version + 1
+        WHERE id = ?{guard}
+        RETURNING *
+        """,
+        (*columns.values(), updated_at, event_id, *versions),
+    ).fetchall()
+    if not rows:
+        raise _missing_or_stale(conn, event_id, expected)
+    row = rows[0]
+    if _SCHEDULE_FIELDS & changes.keys():
+        event = row_to_event(row)
+        if check_conflicts:
+            _ensure_no_conflicts(conn, event_id, event)
+        _index_event(conn, event_id, event)
+    return row
+
+
+class ResponseCache:
+    """Bounded LRU cache of serialized response bodies.
+
+    Entries are keyed by the data version they were rendered from plus
+    the request key, so a write makes every older entry unreachable;
+    :meth:`clear` additionally frees them as soon as a write commits.
+    The cache holds at most ``max_entries`` entries and ``max_bytes``
+    bytes of bodies, evicting the least recently used first.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._size = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Tuple[str, str]) -> Optional[Tuple[bytes, Dict[str, str]]]:
+        """Return the cached ``(body, headers)`` for ``key``, if any."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: Tuple[str, str], body: bytes, headers: Dict[str, str]) -> None:
+        """Store a rendered body, evicting least recently used entries."""
+        if len(body) > self.max_bytes or self.max_entries <= 0:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous[0])
+            self._entries[key] = (body, headers)
+            self._size += len(body)
+            while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+                _, (evicted, _) = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
+RESPONSE_CACHE = ResponseCache(
+    max_entries=int(os.getenv("EVENTS_CACHE_MAX_ENTRIES", "256")),
+    max_bytes=int(os.getenv("EVENTS_CACHE_MAX_BYTES", str(32 * 1024 * 1024))),
+)
+REPOSITORY.commit_hooks.append(lambda conn: RESPONSE_CACHE.clear())
+EVENT_LIST_ADAPTER = TypeAdapter(List[Event])
+
+
+def render_events(rows: List[sqlite3.Row]) -> bytes:
+    """Serialize event rows, through the fast path when it is enabled."""
+    if FAST_JSON:
+        return EVENT_ENCODER.encode(rows)
+    return EVENT_LIST_ADAPTER.dump_json([row_to_event(row) for row in rows])
+
+
+# ``format=`` values accepted by ``GET /events`` and their media types.
+LIST_FORMATS = {
+    "json": "application/json",
+    "columnar": "application/json",
+    "msgpack": "application/x-msgpack",
+}
+
+
+def response_fields(
+    fields: Optional[str] = Query(
+        None,
+        description="Comma-separated Event fields to return, e.g. id,name,date",
+    ),
+) -> Optional[Tuple[str, ...]]:
+    """Parse ``fields=`` into Event field names in model order."""
+    if fields is None:
+        return None
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested.difference(Event.model_fields)
+    if unknown:
+        raise HTTPException(
+            status_code=422, detail=f"Unknown fields: {', '.join(sorted(unknown))}"
         )
-    return Event(id=event_id, updated_at=updated_at, **event.dict())
+    if not requested:
+        raise HTTPException(status_code=422, detail="fields must name at least one field")
+    return tuple(name for name in Event.model_fields if name in requested)
 
 
-@app.delete("/events/{event_id}")
-def delete_event(event_id: str) -> dict:
-    """Delete an event by ID.
+def render_page(
+    rows: List[sqlite3.Row], fields: Optional[Tuple[str, ...]], output: str
+) -> bytes:
+    """Serialize a page of rows in the ``output`` format, projected to ``fields``.
 
-    Returns a simple JSON object indicating success. If the event
-    does not exist, a 404 error is raised.
+    ``columnar`` is a JSON object holding one array per field; ``msgpack``
+    carries the same records as ``json`` in MessagePack.
+    """
+    if fields is None and output == "json":
+        return render_events(rows)
+    encoder = projection_encoder(fields) if fields else EVENT_ENCODER
+    if output == "columnar":
+        return _dumps(encoder.columns(rows))
+    if output == "msgpack":
+        return msgpack.packb(encoder.records(rows))
+    return encoder.encode(rows)
+
+
+def _etag(version: str, key: str) -> str:
+    """Return the list ETag for the data ``version`` and request ``key``.
+
+    The key covers every query parameter, so pages, filters, projections
+    and formats never share a validator.
+    """
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+    return f'"{version}-{digest}"'
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {value.strip().removeprefix("W/") for value in header.split(",")}
+    return etag in candidates or "*" in candidates
+
+
+def _request_key(request: Request) -> str:
+    """Return a cache key for the request path and its sorted query."""
+    query = sorted(request.query_params.multi_items())
+    digest = hashlib.sha1(json.dumps(query).encode("utf-8")).hexdigest()
+    return f"{request.url.path}?{digest}"
+
+
+def _select_events_snapshot(
+    conn: sqlite3.Connection,
+    filters: EventFilters,
+    limit: int,
+    cursor: Optional[Tuple[str, str]],
+    include_archived: bool = False,
+    fields: Optional[Tuple[str, ...]] = None,
+) -> Tuple[str, List[sqlite3.Row]]:
+    """Read the data version and a page of rows from one snapshot."""
+    conn.execute("BEGIN")
+    try:
+        return read_data_version(conn), _select_events(
+            conn, filters, limit, cursor, include_archived, fields
+        )
+    finally:
+        conn.commit()
+
+
+@app.get(
+    "/events",
+    response_class=Response,
+    responses={
+        200: {
+            "model": List[Event],
+            "description": "Events as JSON objects, columnar JSON or MessagePack",
+            "content": {"application/x-msgpack": {}},
+        }
+    },
+)
+async def list_events(
+    request: Request,
+    filters: EventFilters = Depends(event_filters),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(
+        None, description="Opaque cursor from a previous X-Next-Cursor header"
+    ),
+    include_archived: bool = INCLUDE_ARCHIVED_QUERY,
+    fields: Optional[Tuple[str, ...]] = Depends(response_fields),
+    output: str = Query(
+        "json",
+        alias="format",
+        pattern="^(json|columnar|msgpack)$",
+        description="json (default), columnar JSON or msgpack",
+    ),
+) -> Response:
+    """Return a page of events sorted by ``updated_at`` descending.
+
+    Pagination is keyset based: when more rows are available the
+    ``X-Next-Cursor`` response header carries the cursor for the next
+    page. Ties on ``updated_at`` are broken by ``id`` so pages never
+    overlap or skip rows.
+
+    Responses carry an ``ETag`` derived from the table version, and a
+    matching ``If-None-Match`` is answered with ``304 Not Modified``.
+    Serialized pages are cached in process until the next write.
+    Archived events are left out unless ``include_archived`` is set.
+
+    ``fields`` limits both the columns read and the fields returned, and
+    ``format`` picks columnar JSON or MessagePack instead of an array of
+    objects. Large responses are compressed when the client accepts it.
     """
-    with get_connection() as conn:
-        cursor = conn.execute(
-            "SELECT COUNT(1) FROM events WHERE id = ?", (event_id,)
+    if output == "msgpack" and msgpack is None:
+        raise HTTPException(
+            status_code=406, detail="msgpack output needs the msgpack package"
         )
-        count = cursor.fetchone()[0]
-        if count == 0:
-            raise HTTPException(status_code=404, detail="Event not found")
-        conn.execute("DELETE FROM events WHERE id = ?", (event_id,))
-    return {"ok": True}
+    position = decode_cursor(cursor) if cursor is not None else None
+    key = _request_key(request)
+    version = await REPOSITORY.read(read_data_version)
+    if _etag_matches(request, _etag(version, key)):
+        return Response(status_code=304, headers={"ETag": _etag(version, key)})
+    cached = RESPONSE_CACHE.get((version, key))
+    if cached is None:
+        version, rows = await REPOSITORY.read(
+            _select_events_snapshot,
+            filters,
+            limit + 1,
+            position,
+            include_archived,
+            fields,
+        )
+        headers = {"ETag": _etag(version, key)}
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            headers["X-Next-Cursor"] = encode_cursor(last["updated_at"], last["id"])
+        body = render_page(rows, fields, output)
+        RESPONSE_CACHE.put((version, key), body, headers)
+        cached = (body, headers)
+    body, headers = cached
+    return Response(content=body, media_type=LIST_FORMATS[output], headers=headers)
 
 
-@app.get("/health")
-def healthcheck() -> dict:
-    """Basic health check endpoint used for monitoring."""
+CHANGE_BUFFER_SIZE = int(os.getenv("EVENTS_CHANGE_BUFFER_SIZE", "1024"))
+CHANGE_POLL_S = float(os.getenv("EVENTS_CHANGE_POLL_S", "1.0"))
+SSE_KEEPALIVE_S = 15.0
 
-    return {"ok": True}
+
+class EventChange(BaseModel):
+    """One entry of the change feed."""
+
+    seq: int
+    op: str = Field(description="created, updated, deleted or archived")
+    event_id: str
+    changed_at: str
+    event: Optional[Event] = Field(
+        None, description="Current state of the event, ``null`` once deleted"
+    )
+
+
+class ChangeFeed(BaseModel):
+    """Response of ``GET /events/changes``."""
+
+    changes: List[EventChange]
+    last_seq: int = Field(description="Pass as ``since`` to continue the feed")
+
+
+def _read_changes(
+    conn: sqlite3.Connection, since: int, limit: int
+) -> List[EventChange]:
+    rows = conn.execute(
+        """
+        SELECT c.seq, c.op, c.event_id, c.changed_at, e.*
+        FROM event_changes AS c
+        LEFT JOIN events AS e ON e.id = c.event_id
+        WHERE c.seq > ?
+        ORDER BY c.seq
+        LIMIT ?
+        """,
+        (since, limit),
+    ).fetchall()
+    return [
+        EventChange(
+            seq=row["seq"],
+            op=row["op"],
+            event_id=row["event_id"],
+            changed_at=row["changed_at"],
+            event=row_to_event(row) if row["id"] is not None else None,
+        )
+        for row in rows
+    ]
+
+
+class ChangeHub:
+    """In-memory fan-out of the ``event_changes`` log.
+
+    After each local write commits, the writer checks the end of the
+    log. While feed subscribers are waiting it reads the new entries
+    once, at most a buffer's worth, into a ring buffer and wakes them,
+    so many open dashboards cost one query per write instead of one
+    each. With nobody waiting it only records the new end of the log,
+    and later readers fetch what they missed from the table. Changes
+    written by other processes are picked up by :meth:`refresh`, which
+    waiting subscribers share at most once per ``CHANGE_POLL_S``.
+    """
+
+    def __init__(self, buffer_size: int = CHANGE_BUFFER_SIZE) -> None:
+        self.last_seq = 0
+        self._floor: Optional[int] = None
+        self._buffer: deque = deque(maxlen=max(buffer_size, 1))
+        self._lock = threading.Lock()
+        self._fetch_lock = threading.Lock()
+        self._waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+        self._refreshed_at = 0.0
+
+    def sync(self, conn: sqlite3.Connection) -> None:
+        """Start buffering from the current end of the log."""
+        with self._fetch_lock:
+            last = conn.execute("SELECT MAX(seq) FROM event_changes").fetchone()[0] or 0
+            with self._lock:
+                self._buffer.clear()
+                self._floor = self.last_seq = last
+
+    def capture(self, conn: sqlite3.Connection) -> None:
+        """Buffer and announce log entries newer than ``last_seq``."""
+        if self._floor is None:
+            self.sync(conn)
+            return
+        with self._fetch_lock:
+            last = conn.execute("SELECT MAX(seq) FROM event_changes").fetchone()[0] or 0
+            with self._lock:
+                if last <= self.last_seq:
+                    return
+                if not self._waiters:
+                    self._buffer.clear()
+                    self._floor = self.last_seq = last
+                    return
+            start = max(self.last_seq, last - self._buffer.maxlen)
+            self._publish(_read_changes(conn, start, self._buffer.maxlen), start, last)
+
+    def refresh(self, conn: sqlite3.Connection) -> None:
+        """Pick up entries written by other processes, rate limited."""
+        now = time.monotonic()
+        if now - self._refreshed_at < CHANGE_POLL_S:
+            return
+        self._refreshed_at = now
+        self.capture(conn)
+
+    def _publish(self, changes: List[EventChange], start: int, last: int) -> None:
+        with self._lock:
+            if start > self.last_seq:
+                # Entries up to ``start`` were skipped and must come from the table.
+                self._buffer.clear()
+                self._floor = start
+            for change in changes:
+                if len(self._buffer) == self._buffer.maxlen:
+                    self._floor = self._buffer[0].seq
+                self._buffer.append(change)
+            self.last_seq = last
+            waiters, self._waiters = self._waiters, []
+        for loop, future in waiters:
+            loop.call_soon_threadsafe(_resolve, future)
+
+    def buffered_since(self, since: int, limit: int) -> Optional[List[EventChange]]:
+        """Return buffered changes after ``since``, or ``None`` if not buffered."""
+        with self._lock:
+            if self._floor is None or since < self._floor:
+                return None
+            if since >= self.last_seq:
+                return []
+            result = []
+            for change in self._buffer:
+                if change.seq > since:
+                    result.append(change)
+                    if len(result) == limit:
+                        break
+            return result
+
+    async def wait(self, since: int, timeout: float) -> None:
+        """Wait until a change after ``since`` is buffered or ``timeout`` passes."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self._lock:
+            if self.last_seq > since:
+                return
+            self._waiters.append((loop, future))
+        try:
+            await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            with self._lock:
+                if (loop, future) in self._waiters:
+                    self._waiters.remove((loop, future))
+
+
+def _resolve(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+CHANGES = ChangeHub()
+REPOSITORY.commit_hooks.append(CHANGES.capture)
+
+
+def _changes_or_gone(
+    conn: sqlite3.Connection, since: int, limit: int
+) -> List[EventChange]:
+    oldest = conn.execute("SELECT MIN(seq) FROM event_changes").fetchone()[0]
+    if oldest is not None and since < oldest - 1:
+        raise HTTPException(
+            status_code=410,
+            detail="Changes since this sequence were pruned; reload GET /events",
+        )
+    return _read_changes(conn, since, limit)
+
+
+async def _changes_since(since: int, limit: int, wait: float) -> List[EventChange]:
+    deadline = time.monotonic() + wait
+    while True:
+        changes = CHANGES.buffered_since(since, limit)
+        if changes is None:
+            return await REPOSITORY.read(_changes_or_gone, since, limit)
+        remaining = deadline - time.monotonic()
+        if changes or remaining <= 0:
+            return changes
+        await CHANGES.wait(since, min(remaining, CHANGE_POLL_S))
+        if CHANGES.last_seq <= since:
+            await REPOSITORY.read(CHANGES.refresh)
+
+
+@app.get("/events/changes", response_model=ChangeFeed)
+async def list_changes(
+    since: int = Query(0, ge=0, description="Last sequence number already seen"),
+    limit: int = Query(500, ge=1, le=5000),
+    wait: float = Query(
+        0, ge=0, le=60, description="Seconds to wait for a change (long-poll)"
+    ),
+) -> ChangeFeed:
+    """Return changes to events after sequence number ``since``.
+
+    With ``wait`` the request long-polls: it returns as soon as a change
+    arrives or after ``wait`` seconds with an empty list. Clients apply
+    the deltas and continue from ``last_seq``. A ``410`` means ``since``
+    is older than the retained log and the client must reload the list.
+    """
+    changes = await _changes_since(since, limit, wait)
+    last_seq = changes[-1].seq if changes else since
+    return ChangeFeed(changes=changes, last_seq=last_seq)
+
+
+async def _change_stream(since: int) -> AsyncIterator[bytes]:
+    while True:
+        changes = await _changes_since(since, 500, SSE_KEEPALIVE_S)
+        if not changes:
+            yield b": keep-alive\n\n"
+            continue
+        for change in changes:
+            yield (
+                f"id: {change.seq}\nevent: {change.op}\n"
+                f"data: {change.model_dump_json()}\n\n"
+            ).encode("utf-8")
+        since = changes[-1].seq
+
+
+@app.get("/events/changes/stream")
+async def stream_changes(
+    request: Request,
+    since: Optional[int] = Query(
+        None, ge=0, description="Last sequence number already seen"
+    ),
+) -> StreamingResponse:
+    """Push changes as Server-Sent Events.
+
+    Each event's ``id`` is its sequence number and its ``event`` type is
+    the operation, so ``EventSource`` reconnects resume from
+    ``Last-Event-ID``. Without ``since`` the stream starts at the
+    current end of the log.
+    """
+    if since is None:
+        last_event_id = request.headers.get("last-event-id", "")
+        if last_event_id.isdigit():
+            since = int(last_event_id)
+        else:
+            since = CHANGES.last_seq
+            if CHANGES.buffered_since(since, 1) is None:
+                since = await REPOSITORY.read(
+                    lambda conn: conn.execute(
+                        "SELECT COALESCE(MAX(seq), 0) FROM event_changes"
+                    ).fetchone()[0]
+                )
+    return StreamingResponse(
+        _change_stream(since),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+EXPORT_BATCH_SIZE = 1000
+EXPORT_FORMATS = {
+    "ndjson": ("application/x-ndjson", "events.ndjson"),
+    "csv": ("text/csv; charset=utf-8", "events.csv"),
+}
+EXPORT_COLUMNS = ("id", *EVENT_FIELDS, "updated_at")
+
+
+async def _export_lines(
+    rows: AsyncIterator[List[sqlite3.Row]], fmt: str
+) -> AsyncIterator[bytes]:
+    if fmt == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_COLUMNS)
+        yield buffer.getvalue().encode("utf-8")
+    async for batch in rows:
+        if fmt == "ndjson":
+            chunk = "".join(
+                json.dumps(
+                    {
+                        **{column: row[column] for column in EXPORT_COLUMNS},
+                        "assign_employees": _parse_assignments(row["assign_employees"]),
+                    },
+                    separators=(",", ":"),
+                )
+                + "\n"
+                for row in batch
+            )
+        else:
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows(
+                [
+                    ";".join(_parse_assignments(row[column]))
+                    if column == "assign_employees"
+                    else row[column]
+                    for column in EXPORT_COLUMNS
+                ]
+                for row in batch
+            )
+            chunk = buffer.getvalue()
+        yield chunk.encode("utf-8")
+
+
+@app.get("/events/export")
+async def export_events(
+    filters: EventFilters = Depends(event_filters),
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    include_archived: bool = INCLUDE_ARCHIVED_QUERY,
+) -> StreamingResponse:
+    """Stream every event matching the filters as NDJSON or CSV.
+
+    Rows are read with ``fetchmany`` from a server-side cursor and
+    written out batch by batch, so memory use stays flat regardless of
+    table size. In CSV output ``assign_employees`` is ``;``-separated.
+    Archived events are left out unless ``include_archived`` is set,
+    so exports covering past periods should set it.
+    """
+    clauses, params = filters.to_sql()
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    sql = f"SELECT * FROM events {where}"
+    if include_archived:
+        archived, archived_params = _archived_part(filters, [], [])
+        sql = f"SELECT {_LISTED_COLUMNS} FROM events {where}{archived}"
+        params.extend(archived_params)
+    rows = REPOSITORY.stream(
+        f"{sql} ORDER BY updated_at DESC, id DESC", params, EXPORT_BATCH_SIZE
+    )
+    media_type, filename = EXPORT_FORMATS[format]
+    return StreamingResponse(
+        _export_lines(rows, format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+class MonthlyPayout(BaseModel):
+    """Revenue of the events in one month."""
+
+    month: Optional[str] = Field(description="YYYY-MM, ``null`` for undated events")
+    events: int
+    payout: float
+    guests: int
+
+
+class PackageGuests(BaseModel):
+    """Guest and revenue totals for one service package."""
+
+    package: Optional[str]
+    events: int
+    guests: int
+    payout: float
+    average_guests: float
+
+
+class WeeklyStaffing(BaseModel):
+    """Staffing coverage of the events in one week."""
+
+    week: Optional[str] = Field(description="Monday of the week, ``null`` if undated")
+    events: int
+    understaffed: int = Field(description="Events with fewer staff than targeted")
+    staff_needed: int
+    staff_assigned: int
+
+
+class EmployeeUtilization(BaseModel):
+    """Workload of one employee."""
+
+    employee_id: str
+    events: int
+    hours: float
+    utilization: Optional[float] = Field(
+        None, description="Share of ``capacity_hours`` worked over the period"
+    )
+
+
+class EventStats(BaseModel):
+    """Response of ``GET /events/stats``."""
+
+    payout_by_month: List[MonthlyPayout]
+    guests_by_package: List[PackageGuests]
+    understaffed_by_week: List[WeeklyStaffing]
+    utilization: List[EmployeeUtilization]
+
+
+class StatsFilters(BaseModel):
+    """Period and status selecting the rollup buckets to aggregate.
+
+    Rollups are bucketed by month (by week for staffing), so date bounds
+    select whole buckets. Without an explicit status, canceled events
+    are left out of staffing and utilization figures.
+    """
+
+    date_from: Optional[str] = None
+    date_to: Optional[str] = None
+    status: Optional[str] = None
+
+    def to_sql(
+        self, column: str, bucket: str, active_only: bool = False
+    ) -> Tuple[str, List[Any]]:
+        """Return a ``WHERE`` clause and parameters for a rollup table.
+
+        ``bucket`` is an SQL expression mapping a ``?`` date to the
+        bucket stored in ``column``.
+        """
+        clauses: List[str] = []
+        params: List[Any] = []
+        if self.date_from is not None or self.date_to is not None:
+            clauses.append(f"{column} != ''")
+        if self.date_from is not None:
+            clauses.append(f"{column} >= {bucket}")
+            params.append(self.date_from)
+        if self.date_to is not None:
+            clauses.append(f"{column} <= {bucket}")
+            params.append(self.date_to)
+        if self.status is not None:
+            clauses.append("status = ?")
+            params.append(self.status)
+        elif active_only:
+            placeholders = ", ".join("?" for _ in INACTIVE_STATUSES)
+            clauses.append(f"lower(trim(status)) NOT IN ({placeholders})")
+            params.extend(sorted(INACTIVE_STATUSES))
+        return (f"WHERE {' AND '.join(clauses)}" if clauses else ""), params
+
+
+def stats_filters(
+    date_from: Optional[str] = Query(
+        None, description="First day of the period (YYYY-MM-DD)"
+    ),
+    date_to: Optional[str] = Query(None, description="Last day of the period (YYYY-MM-DD)"),
+    status: Optional[str] = Query(None, description="Only events with this status"),
+) -> StatsFilters:
+    """Collect the stats filters from the query string."""
+    return StatsFilters(
+        date_from=query_date(date_from, "date_from"),
+        date_to=query_date(date_to, "date_to"),
+        status=status,
+    )
+
+
+_MONTH_BUCKET = "substr(?, 1, 7)"
+_WEEK_BUCKET = "date(?, 'weekday 0', '-6 days')"
+
+
+def _payout_by_month(
+    conn: sqlite3.Connection, filters: StatsFilters
+) -> List[MonthlyPayout]:
+    where, params = filters.to_sql("month", _MONTH_BUCKET)
+    rows = conn.execute(
+        f"""
+        SELECT month, sum(events), sum(payout), sum(guests) FROM stats_monthly
+        {where} GROUP BY month ORDER BY month
+        """,
+        params,
+    ).fetchall()
+    return [
+        MonthlyPayout(month=month or None, events=events, payout=payout, guests=guests)
+        for month, events, payout, guests in rows
+    ]
+
+
+def _guests_by_package(
+    conn: sqlite3.Connection, filters: StatsFilters
+) -> List[PackageGuests]:
+    where, params = filters.to_sql("month", _MONTH_BUCKET)
+    rows = conn.execute(
+        f"""
+        SELECT package, sum(events), sum(guests), sum(payout) FROM stats_packages
+        {where} GROUP BY package ORDER BY sum(guests) DESC, package
+        """,
+        params,
+    ).fetchall()
+    return [
+        PackageGuests(
+            package=package or None,
+            events=events,
+            guests=guests,
+            payout=payout,
+            average_guests=round(guests / events, 2) if events else 0.0,
+        )
+        for package, events, guests, payout in rows
+    ]
+
+
+def _understaffed_by_week(
+    conn: sqlite3.Connection, filters: StatsFilters
+) -> List[WeeklyStaffing]:
+    where, params = filters.to_sql("week", _WEEK_BUCKET, active_only=True)
+    rows = conn.execute(
+        f"""
+        SELECT week, sum(events), sum(understaffed), sum(staff_needed),
+            sum(staff_assigned)
+        FROM stats_weekly_staffing {where} GROUP BY week ORDER BY week
+        """,
+        params,
+    ).fetchall()
+    return [
+        WeeklyStaffing(
+            week=week or None,
+            events=events,
+            understaffed=understaffed,
+            staff_needed=needed,
+            staff_assigned=assigned,
+        )
+        for week, events, understaffed, needed, assigned in rows
+    ]
+
+
+def _utilization(
+    conn: sqlite3.Connection, filters: StatsFilters, capacity_hours: Optional[float]
+) -> List[EmployeeUtilization]:
+    where, params = filters.to_sql("month", _MONTH_BUCKET, active_only=True)
+    rows = conn.execute(
+        f"""
+        SELECT employee_id, sum(events), sum(minutes), count(DISTINCT month)
+        FROM stats_employees {where}
+        GROUP BY employee_id ORDER BY sum(minutes) DESC, employee_id
+        """,
+        params,
+    ).fetchall()
+    if capacity_hours and filters.date_from and filters.date_to:
+        first = datetime.strptime(filters.date_from[:7], "%Y-%m")
+        last = datetime.strptime(filters.date_to[:7], "%Y-%m")
+        months: Optional[int] = max(
+            (last.year - first.year) * 12 + last.month - first.month + 1, 1
+        )
+    else:
+        months = None
+    result = []
+    for employee_id, events, minutes, active_months in rows:
+        hours = minutes / 60
+        utilization = None
+        if capacity_hours:
+            available = capacity_hours * (months or active_months)
+            utilization = round(hours / available, 4)
+        result.append(
+            EmployeeUtilization(
+                employee_id=employee_id,
+                events=events,
+                hours=round(hours, 2),
+                utilization=utilization,
+            )
+        )
+    return result
+
+
+def _read_stats(
+    conn: sqlite3.Connection, filters: StatsFilters, capacity_hours: Optional[float]
+) -> EventStats:
+    conn.execute("BEGIN")
+    try:
+        return EventStats(
+            payout_by_month=_payout_by_month(conn, filters),
+            guests_by_package=_guests_by_package(conn, filters),
+            understaffed_by_week=_understaffed_by_week(conn, filters),
+            utilization=_utilization(conn, filters, capacity_hours),
+        )
+    finally:
+        conn.commit()
+
+
+CAPACITY_HOURS_QUERY = Query(
+    None,
+    gt=0,
+    description=(
+        "Hours each employee is available per month; enables ``utilization``."
+        " Without both date bounds the months an employee worked are used."
+    ),
+)
+
+
+@app.get("/events/stats", response_model=EventStats)
+async def event_stats(
+    filters: StatsFilters = Depends(stats_filters),
+    capacity_hours: Optional[float] = CAPACITY_HOURS_QUERY,
+) -> EventStats:
+    """Return every dashboard aggregate in one response.
+
+    Figures come from the ``stats_*`` rollup tables that triggers keep
+    current on every write, so the cost depends on the number of
+    months, packages and employees rather than on the number of events.
+    """
+    return await REPOSITORY.read(_read_stats, filters, capacity_hours)
+
+
+@app.get("/events/stats/payout", response_model=List[MonthlyPayout])
+async def payout_stats(
+    filters: StatsFilters = Depends(stats_filters),
+) -> List[MonthlyPayout]:
+    """Return event count, payout and guests per month."""
+    return await REPOSITORY.read(_payout_by_month, filters)
+
+
+@app.get("/events/stats/packages", response_model=List[PackageGuests])
+async def package_stats(
+    filters: StatsFilters = Depends(stats_filters),
+) -> List[PackageGuests]:
+    """Return guests and payout per service package, largest first."""
+    return await REPOSITORY.read(_guests_by_package, filters)
+
+
+@app.get("/events/stats/staffing", response_model=List[WeeklyStaffing])
+async def staffing_stats(
+    filters: StatsFilters = Depends(stats_filters),
+) -> List[WeeklyStaffing]:
+    """Return under-staffed event counts and staff coverage per week."""
+    return await REPOSITORY.read(_understaffed_by_week, filters)
+
+
+@app.get("/events/stats/utilization", response_model=List[EmployeeUtilization])
+async def utilization_stats(
+    filters: StatsFilters = Depends(stats_filters),
+    capacity_hours: Optional[float] = CAPACITY_HOURS_QUERY,
+) -> List[EmployeeUtilization]:
+    """Return events and hours worked per employee, busiest first."""
+    return await REPOSITORY.read(_utilization, filters, capacity_hours)
+
+
+def _match_expression(q: str) -> str:
+    """Turn free text into an FTS5 query matching every term as a prefix.
+
+    Terms are quoted, so FTS5 operators and punctuation in user input
+    are searched for literally instead of being parsed as syntax.
+    """
+    terms = [term.replace('"', '""') for term in q.split()]
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def encode_offset(offset: int) -> str:
+    """Encode a result offset as an opaque cursor string."""
+    return base64.urlsafe_b64encode(str(offset).encode("ascii")).decode("ascii").rstrip("=")
+
+
+def decode_offset(cursor: str) -> int:
+    """Decode a cursor produced by :func:`encode_offset`.
+
+    Raises a 400 error when the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        offset = int(base64.urlsafe_b64decode(padded).decode("ascii"))
+    except (binascii.Error, ValueError, UnicodeDecodeError) as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+    if offset < 0:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return offset
+
+
+def _search_events(
+    conn: sqlite3.Connection,
+    match: str,
+    filters: EventFilters,
+    limit: int,
+    offset: int,
+) -> List[sqlite3.Row]:
+    clauses, params = filters.to_sql()
+    where = "".join(f" AND e.{clause}" for clause in clauses)
+    weights = ", ".join(str(weight) for weight in SEARCH_COLUMNS.values())
+    return conn.execute(
+        f"""
+        SELECT e.* FROM events_fts
+        JOIN events AS e ON e.rowid = events_fts.rowid
+        WHERE events_fts MATCH ?{where}
+        ORDER BY bm25(events_fts, {weights}), e.id
+        LIMIT ? OFFSET ?
+        """,
+        (match, *params, limit, offset),
+    ).fetchall()
+
+
+@app.get("/events/search", response_model=List[Event])
+async def search_events(
+    q: str = Query(
+        ...,
+        min_length=1,
+        max_length=200,
+        description="Words to find in the name, location, client or notes",
+    ),
+    filters: EventFilters = Depends(event_filters),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(
+        None, description="Opaque cursor from a previous X-Next-Cursor header"
+    ),
+) -> Response:
+    """Return events matching ``q``, best matches first.
+
+    Every word must match the start of a word in ``name``, ``location``,
+    ``client_name``, ``client_phone`` or ``notes``; case and accents are
+    ignored. Ranking uses bm25 with name and client hits weighted above
+    notes. The ``GET /events`` filters narrow the results, and
+    ``X-Next-Cursor`` carries the cursor of the next page.
+    """
+    match = _match_expression(q)
+    if not match:
+        raise HTTPException(status_code=422, detail="Query has no search terms")
+    offset = decode_offset(cursor) if cursor is not None else 0
+    try:
+        rows = await REPOSITORY.read(
+            _search_events, match, filters, limit + 1, offset
+        )
+    except sqlite3.OperationalError as exc:
+        raise HTTPException(status_code=400, detail="Invalid search query") from exc
+    headers = {}
+    if len(rows) > limit:
+        rows = rows[:limit]
+        headers["X-Next-Cursor"] = encode_offset(offset + limit)
+    return Response(
+        content=render_events(rows), media_type="application/json", headers=headers
+    )
+
+
+ALLOW_CONFLICTS_QUERY = Query(
+    False, description="Store the event even if it double-books an employee"
+)
+
+
+IF_MATCH_HEADER = Header(
+    None,
+    alias="If-Match",
+    description="Only apply the change if the event still has this version",
+)
+
+
+@app.post("/events", response_model=Event)
+async def create_event(
+    event: EventIn, allow_conflicts: bool = ALLOW_CONFLICTS_QUERY
+) -> Event:
+    """Create a new event and return the created record.
+
+    Generates a UUID for the new event and records the current
+    timestamp as ``updated_at``. Responds with 409 when an assigned
+    employee is already booked at an overlapping time, unless
+    ``allow_conflicts`` is set. New events start at ``version`` 1.
+    """
+    event_id = str(uuid.uuid4())
+    updated_at = datetime.utcnow().isoformat()
+    await REPOSITORY.write(
+        _insert_event, event_id, event, updated_at, not allow_conflicts, key=event_id
+    )
+    return Event(id=event_id, updated_at=updated_at, version=1, **event.model_dump())
+
+
+@app.put("/events/{event_id}", response_model=Event)
+async def update_event(
+    event_id: str,
+    event: EventIn,
+    response: Response,
+    allow_conflicts: bool = ALLOW_CONFLICTS_QUERY,
+    if_match: Optional[str] = IF_MATCH_HEADER,
+) -> Event:
+    """Update an existing event.
+
+    If the event does not exist, a 404 error is raised. All fields
+    provided in the request body will replace the stored values.
+    The ``updated_at`` timestamp is refreshed and ``version`` goes up
+    by one. Double-booking is rejected with 409 as for ``POST /events``.
+
+    With ``If-Match: "<version>"`` the update only applies if nobody
+    changed the event since that version was read; otherwise it fails
+    with 412 and the current version, so concurrent edits are never
+    silently lost.
+    """
+    updated_at = datetime.utcnow().isoformat()
+    version = await REPOSITORY.write(
+        _update_event,
+        event_id,
+        event,
+        updated_at,
+        not allow_conflicts,
+        parse_if_match(if_match),
+        key=event_id,
+        replaceable=True,
+    )
+    response.headers["ETag"] = _version_etag(version)
+    return Event(id=event_id, updated_at=updated_at, version=version, **event.model_dump())
+
+
+@app.patch("/events/{event_id}", response_model=Event)
+async def patch_event(
+    event_id: str,
+    patch: EventPatch,
+    response: Response,
+    allow_conflicts: bool = ALLOW_CONFLICTS_QUERY,
+    if_match: Optional[str] = IF_MATCH_HEADER,
+) -> Event:
+    """Change only the fields present in the body.
+
+    Returns the full stored event. Like ``PUT`` it refreshes
+    ``updated_at``, bumps ``version``, honours ``If-Match`` and rejects
+    double-booking with 409. An empty body is rejected with 422.
+    """
+    changes = patch.changes()
+    if not changes:
+        raise HTTPException(status_code=422, detail="No fields to update")
+    updated_at = datetime.utcnow().isoformat()
+    row = await REPOSITORY.write(
+        _patch_event,
+        event_id,
+        changes,
+        updated_at,
+        not allow_conflicts,
+        parse_if_match(if_match),
+        key=event_id,
+    )
+    response.headers["ETag"] = _version_etag(row["version"])
+    return row_to_event(row)
+
+
+@app.delete("/events/{event_id}")
+async def delete_event(
+    event_id: str, if_match: Optional[str] = IF_MATCH_HEADER
+) -> dict:
+    """Delete an event by ID.
+
+    Returns a simple JSON object indicating success. If the event
+    does not exist, a 404 error is raised. ``If-Match`` makes the
+    delete conditional as for ``PUT``.
+    """
+    await REPOSITORY.write(
+        _delete_event, event_id, parse_if_match(if_match), key=event_id
+    )
+    return {"ok": True}
+
+
+def _select_employee_events(
+    conn: sqlite3.Connection,
+    employee_id: str,
+    date_from: Optional[str],
+    date_to: Optional[str],
+    limit: int,
+) -> List[sqlite3.Row]:
+    clauses = ["a.employee_id = ?"]
+    params: List[Any] = [employee_id]
+    if date_from is not None:
+        clauses.append("e.date >= ?")
+        params.append(date_from)
+    if date_to is not None:
+        clauses.append("e.date <= ?")
+        params.append(date_to)
+    return conn.execute(
+        f"""
+        SELECT e.* FROM event_assignments AS a
+        JOIN events AS e ON e.id = a.event_id
+        WHERE {" AND ".join(clauses)}
+        ORDER BY e.date, e.start_time, e.id
+        LIMIT ?
+        """,
+        (*params, limit),
+    ).fetchall()
+
+
+@app.get("/employees/{employee_id}/events", response_model=List[Event])
+async def list_employee_events(
+    employee_id: str,
+    date_from: Optional[str] = Query(
+        None, description="Only events on or after this date (YYYY-MM-DD)"
+    ),
+    date_to: Optional[str] = Query(
+        None, description="Only events on or before this date (YYYY-MM-DD)"
+    ),
+    limit: int = Query(MAX_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+) -> Response:
+    """Return the events an employee is assigned to, in date order.
+
+    Served from the ``event_assignments`` index, so the cost depends on
+    the employee's schedule rather than on the size of ``events``.
+    """
+    rows = await REPOSITORY.read(
+        _select_employee_events,
+        employee_id,
+        query_date(date_from, "date_from"),
+        query_date(date_to, "date_to"),
+        limit,
+    )
+    return Response(content=render_events(rows), media_type="application/json")
+
+
+def _parse_instant(value: str, name: str) -> int:
+    """Parse a ``from``/``to`` bound into epoch seconds.
+
+    Accepts a date (midnight) or a date and time. Times are wall-clock
+    values read as UTC, like the stored event windows.
+    """
+    try:
+        parsed = datetime.fromisoformat(value.strip())
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=422, detail=f"{name} must be an ISO date or date-time"
+        ) from exc
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp())
+
+
+def _select_calendar(
+    conn: sqlite3.Connection,
+    start: int,
+    end: int,
+    filters: EventFilters,
+    limit: int,
+    cursor: Optional[Tuple[int, str]],
+    include_archived: bool = False,
+) -> List[sqlite3.Row]:
+    # No event window is longer than a day, so every event overlapping
+    # ``[start, end)`` starts in ``[start - DAY_SECONDS, end)``: a bounded
+    # range scan of ``idx_events_start_at`` with ``end_at`` checked from
+    # the same index entries.
+    window = ["start_at >= ?", "start_at < ?", "end_at > ?"]
+    window_params: List[Any] = [start - DAY_SECONDS, end, start]
+    if cursor is not None:
+        window.append("(start_at, id) > (?, ?)")
+        window_params.extend(cursor)
+    clauses, params = filters.to_sql()
+    columns, archived, archived_params = "*", "", []
+    if include_archived:
+        columns = _LISTED_COLUMNS
+        archived, archived_params = _archived_part(filters, window, window_params)
+    return conn.execute(
+        f"""
+        SELECT {columns} FROM events INDEXED BY idx_events_start_at
+        WHERE {" AND ".join(window + clauses)}{archived}
+        ORDER BY start_at, id
+        LIMIT ?
+        """,
+        (*window_params, *params, *archived_params, limit),
+    ).fetchall()
+
+
+@app.get("/calendar", response_model=List[Event])
+async def calendar(
+    start: str = Query(
+        ..., alias="from", description="Start of the window (date or date-time)"
+    ),
+    end: str = Query(
+        ..., alias="to", description="End of the window, exclusive (date or date-time)"
+    ),
+    filters: EventFilters = Depends(event_filters),
+    limit: int = Query(MAX_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(
+        None, description="Opaque cursor from a previous X-Next-Cursor header"
+    ),
+    include_archived: bool = INCLUDE_ARCHIVED_QUERY,
+) -> Response:
+    """Return events overlapping ``[from, to)`` in start order.
+
+    Overlap uses each event's stored window: missing times cover the
+    whole day and an end at or before the start runs past midnight.
+    Events without a valid date never appear. A month view is one
+    index range scan; pages beyond ``limit`` continue through the
+    ``X-Next-Cursor`` header. ``include_archived`` adds archived events.
+    """
+    window_start = _parse_instant(start, "from")
+    window_end = _parse_instant(end, "to")
+    if window_end <= window_start:
+        raise HTTPException(status_code=422, detail="to must be after from")
+    position = None
+    if cursor is not None:
+        start_at, event_id = decode_cursor(cursor)
+        if not start_at.lstrip("-").isdigit():
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        position = (int(start_at), event_id)
+    rows = await REPOSITORY.read(
+        _select_calendar,
+        window_start,
+        window_end,
+        filters,
+        limit + 1,
+        position,
+        include_archived,
+    )
+    headers = {}
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        headers["X-Next-Cursor"] = encode_cursor(str(last["start_at"]), last["id"])
+    return Response(
+        content=render_events(rows), media_type="application/json", headers=headers
+    )
+
+
+class ConflictCheckItem(BaseModel):
+    """Proposed event timing and staff to check for double-booking."""
+
+    id: Optional[str] = Field(
+        None, description="ID of the stored event this proposal replaces, if any"
+    )
+    date: Optional[str] = None
+    start_time: Optional[str] = None
+    end_time: Optional[str] = None
+    status: Optional[str] = None
+    assign_employees: List[str] = Field(default_factory=list)
+
+    @field_validator("date")
+    @classmethod
+    def _normalise_date(cls, value: Optional[str]) -> Optional[str]:
+        return normalise_date(value)
+
+    @field_validator("start_time", "end_time")
+    @classmethod
+    def _normalise_time(cls, value: Optional[str]) -> Optional[str]:
+        return normalise_time(value)
+
+
+class ConflictCheckRequest(BaseModel):
+    """Batch of proposals, optionally plus stored events in a date range."""
+
+    events: List[ConflictCheckItem] = Field(default_factory=list)
+    date_from: Optional[str] = Field(
+        None, description="Also re-check stored events on or after this date"
+    )
+    date_to: Optional[str] = Field(
+        None, description="Also re-check stored events on or before this date"
+    )
+
+    @field_validator("date_from", "date_to")
+    @classmethod
+    def _normalise_date(cls, value: Optional[str]) -> Optional[str]:
+        return normalise_date(value)
+
+
+class StaffConflict(BaseModel):
+    """An employee booked on two overlapping events."""
+
+    index: int = Field(description="Position of the checked event in ``checked``")
+    event_id: Optional[str]
+    employee_id: str
+    conflicting_event_id: str
+
+
+class ConflictCheckResult(BaseModel):
+    """Outcome of ``POST /events/conflicts``."""
+
+    checked: List[Optional[str]] = Field(
+        description="IDs of the checked events (``null`` for new proposals)"
+    )
+    conflicts: List[StaffConflict]
+
+
+def _check_conflicts(
+    conn: sqlite3.Connection, request: ConflictCheckRequest
+) -> ConflictCheckResult:
+    REPOSITORY.sync_version(conn)
+    items = list(request.events)
+    if request.date_from is not None or request.date_to is not None:
+        filters = EventFilters(date_from=request.date_from, date_to=request.date_to)
+        clauses, params = filters.to_sql()
+        proposed = {item.id for item in items if item.id}
+        rows = conn.execute(
+            "SELECT id, date, start_time, end_time, status, assign_employees"
+            f" FROM events WHERE {' AND '.join(clauses)}",
+            params,
+        )
+        # Stored rows skip validation: legacy values must not fail the check.
+        items.extend(
+            ConflictCheckItem.model_construct(
+                id=row["id"],
+                date=row["date"],
+                start_time=row["start_time"],
+                end_time=row["end_time"],
+                status=row["status"],
+                assign_employees=_parse_assignments(row["assign_employees"]),
+            )
+            for row in rows
+            if row["id"] not in proposed
+        )
+
+    # Proposals supersede the stored versions of the same events and are
+    # checked against each other through a throwaway overlay index.
+    keys = [item.id or f"#{index}" for index, item in enumerate(items)]
+    windows = [
+        event_window(item.date, item.start_time, item.end_time)
+        if is_active(item.status)
+        else None
+        for item in items
+    ]
+    overlay = IntervalIndex()
+    for key, window, item in zip(keys, windows, items):
+        if window is not None and item.assign_employees:
+            overlay.add(key, window, item.assign_employees)
+
+    conflicts: List[StaffConflict] = []
+    for index, (key, window, item) in enumerate(zip(keys, windows, items)):
+        if window is None:
+            continue
+        found = SCHEDULE.conflicts(conn, window, item.assign_employees, exclude=keys)
+        for employee in dict.fromkeys(item.assign_employees):
+            found.extend(
+                (employee, other)
+                for other in overlay.overlapping(employee, window, exclude=(key,))
+            )
+        conflicts.extend(
+            StaffConflict(
+                index=index,
+                event_id=item.id,
+                employee_id=employee,
+                conflicting_event_id=other,
+            )
+            for employee, other in found
+        )
+    return ConflictCheckResult(checked=[item.id for item in items], conflicts=conflicts)
+
+
+@app.post("/events/conflicts", response_model=ConflictCheckResult)
+async def check_conflicts(request: ConflictCheckRequest) -> ConflictCheckResult:
+    """Report staff double-booking for a batch of proposed events.
+
+    Each proposal is checked against the stored schedule and against the
+    other proposals. Passing ``date_from``/``date_to`` also re-checks the
+    stored events in that range, e.g. a whole weekend. Conflicts between
+    two proposals without an ID refer to them as ``#<index>``.
+    """
+    return await REPOSITORY.read(_check_conflicts, request)
+
+
+class EmployeeCapacity(BaseModel):
+    """An employee available to the staffing solver."""
+
+    id: str
+    max_hours: Optional[float] = Field(
+        None, ge=0, description="Most hours to schedule within the range"
+    )
+
+
+class SolveRequest(BaseModel):
+    """Optional roster for ``POST /schedule/solve``."""
+
+    employees: Optional[List[EmployeeCapacity]] = Field(
+        None,
+        description=(
+            "Employees to schedule. Defaults to everyone who has ever been"
+            " assigned to an event, without hour limits."
+        ),
+    )
+
+
+class SolvedEvent(BaseModel):
+    """Staffing proposal for one event."""
+
+    id: str
+    target_staff_count: int
+    assign_employees: List[str]
+    added: List[str]
+    staffing_status: Optional[str]
+
+
+class SolveResult(BaseModel):
+    """Outcome of ``POST /schedule/solve``."""
+
+    applied: bool
+    events: List[SolvedEvent]
+    hours: Dict[str, float] = Field(description="Scheduled hours per employee")
+    unfilled_slots: int
+
+
+def _solve_schedule(
+    conn: sqlite3.Connection,
+    date_from: str,
+    date_to: str,
+    roster: Optional[List[EmployeeCapacity]],
+    apply: bool,
+) -> SolveResult:
+    REPOSITORY.sync_version(conn)
+    rows = conn.execute(
+        """
+        SELECT id, date, start_time, end_time, status, target_staff_count,
+            assign_employees, staffing_status
+        FROM events WHERE date >= ? AND date <= ?
+        """,
+        (date_from, date_to),
+    ).fetchall()
+    needs: List[StaffingNeed] = []
+    stored: Dict[str, sqlite3.Row] = {}
+    for row in rows:
+        window = event_window(row["date"], row["start_time"], row["end_time"])
+        if window is None or not is_active(row["status"]):
+            continue
+        assigned = _parse_assignments(row["assign_employees"])
+        target = row["target_staff_count"] or 0
+        needs.append(StaffingNeed(row["id"], window, target, assigned))
+        stored[row["id"]] = row
+
+    if roster is None:
+        capacity: Dict[str, Optional[int]] = {
+            row["employee_id"]: None
+            for row in conn.execute(
+                "SELECT DISTINCT employee_id FROM event_assignments"
+            )
+        }
+    else:
+        capacity = {
+            employee.id: None
+            if employee.max_hours is None
+            else int(employee.max_hours * 3600)
+            for employee in roster
+        }
+
+    # Stored events outside the range still keep their staff busy.
+    solving = frozenset(stored)
+    plan = solve_staffing(
+        needs,
+        capacity,
+        busy=lambda employee, window: bool(
+            SCHEDULE.conflicts(conn, window, (employee,), exclude=solving)
+        ),
+    )
+
+    events: List[SolvedEvent] = []
+    for need in needs:
+        if not need.target:
+            continue
+        staff = plan.staff[need.event_id]
+        events.append(
+            SolvedEvent(
+                id=need.event_id,
+                target_staff_count=need.target,
+                assign_employees=staff,
+                added=plan.added.get(need.event_id, []),
+                staffing_status=staffing_status(len(staff), need.target),
+            )
+        )
+
+    if apply:
+        updated_at = datetime.utcnow().isoformat()
+        changed = [
+            event
+            for event in events
+            if event.added
+            or event.staffing_status != stored[event.id]["staffing_status"]
+        ]
+        conn.executemany(
+            "UPDATE events SET assign_employees = ?, staffing_status = ?,"
+            " updated_at = ?, version = version + 1 WHERE id = ?",
+            [
+                (
+                    json.dumps(event.assign_employees)
+                    if event.assign_employees
+                    else None,
+                    event.staffing_status,
+                    updated_at,
+                    event.id,
+                )
+                for event in changed
+            ],
+        )
+        for event in changed:
+            row = stored[event.id]
+            SCHEDULE.update(
+                conn,
+                event.id,
+                row["date"],
+                row["start_time"],
+                row["end_time"],
+                row["status"],
+                event.assign_employees,
+            )
+
+    return SolveResult(
+        applied=apply,
+        events=events,
+        hours={
+            employee: round(seconds / 3600, 2)
+            for employee, seconds in sorted(plan.seconds.items())
+        },
+        unfilled_slots=sum(plan.unfilled.values()),
+    )
+
+
+@app.post("/schedule/solve", response_model=SolveResult)
+async def solve_schedule(
+    date_from: str = Query(..., alias="from", description="First date (YYYY-MM-DD)"),
+    date_to: str = Query(..., alias="to", description="Last date (YYYY-MM-DD)"),
+    apply: bool = Query(False, description="Store the proposed assignments"),
+    request: Optional[SolveRequest] = None,
+) -> SolveResult:
+    """Fill under-staffed events in a date range from the employee roster.
+
+    Open slots (``target_staff_count`` minus assigned staff) are filled
+    without double-booking anyone, preferring the employees with the
+    fewest scheduled hours, and the result is rebalanced by a local
+    search. Returns the proposed staff and ``staffing_status`` for every
+    event with a target; with ``apply=true`` they are stored as well.
+    """
+    date_from = query_date(date_from, "from")
+    date_to = query_date(date_to, "to")
+    if date_from is None or date_to is None:
+        raise HTTPException(status_code=422, detail="from and to are required")
+    roster = request.employees if request is not None else None
+    if apply:
+        return await REPOSITORY.write(
+            _solve_schedule, date_from, date_to, roster, True
+        )
+    return await REPOSITORY.read(_solve_schedule, date_from, date_to, roster, False)
+
+
+BULK_BATCH_SIZE = 500
+BULK_MAX_ITEMS = 50_000
+NDJSON_MEDIA_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+
+class EventBulkItem(EventIn):
+    """Event accepted by the bulk endpoint; ``id`` selects upsert targets."""
+
+    id: Optional[str] = Field(
+        None, description="Existing or desired event ID (generated when omitted)"
+    )
+
+
+class BulkItemError(BaseModel):
+    """Validation or write error for one item of a bulk request."""
+
+    index: int
+    id: Optional[str] = None
+    detail: Any
+
+
+class BulkUpsertResult(BaseModel):
+    """Outcome of ``POST /events:bulk``."""
+
+    received: int
+    created: int
+    updated: int
+    ids: List[Optional[str]] = Field(
+        description="Stored ID per input item, ``null`` for failed items"
+    )
+    errors: List[BulkItemError]
+    stopped: Optional[str] = Field(
+        None,
+        description=(
+            "Why the request stopped early; items after the first ``received``"
+            " were not read"
+        ),
+    )
+
+
+class BulkDeleteResult(BaseModel):
+    """Outcome of ``DELETE /events:bulk``."""
+
+    received: int
+    deleted: int
+    not_found: List[str]
+    errors: List[BulkItemError]
+    stopped: Optional[str] = Field(
+        None,
+        description=(
+            "Why the request stopped early; items after the first ``received``"
+            " were not read"
+        ),
+    )
+
+
+async def _iter_bulk_payload(request: Request) -> AsyncIterator[Tuple[int, Any]]:
+    """Yield ``(index, item)`` pairs from a JSON array or NDJSON body.
+
+    NDJSON bodies are parsed incrementally as they stream in. Lines that
+    are not valid JSON are yielded as :class:`ValueError` instances so the
+    caller can report them per item. A JSON array longer than
+    ``BULK_MAX_ITEMS`` is rejected with 413 before anything is yielded;
+    an NDJSON stream cannot be counted up front, so the caller stops at
+    the limit instead.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    if content_type in NDJSON_MEDIA_TYPES:
+        index = 0
+        buffer = bytearray()
+
+        def parse(line: bytes) -> Any:
+            try:
+                return json.loads(line)
+            except ValueError:
+                return ValueError("Invalid JSON")
+
+        async for chunk in request.stream():
+            buffer.extend(chunk)
+            *lines, rest = buffer.split(b"\n")
+            buffer = bytearray(rest)
+            for line in lines:
+                if line.strip():
+                    yield index, parse(line)
+                    index += 1
+        if buffer.strip():
+            yield index, parse(bytes(buffer))
+        return
+
+    try:
+        payload = json.loads(await request.body())
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail="Body must be valid JSON") from exc
+    if isinstance(payload, dict) and isinstance(payload.get("items"), list):
+        payload = payload["items"]
+    if not isinstance(payload, list):
+        raise HTTPException(status_code=400, detail="Body must be a JSON array")
+    if len(payload) > BULK_MAX_ITEMS:
+        raise _too_many_items()
+    for index, item in enumerate(payload):
+        yield index, item
+
+
+def _existing_ids(conn: sqlite3.Connection, ids: Iterable[str]) -> set:
+    ids = list(ids)
+    placeholders = ", ".join("?" for _ in ids)
+    rows = conn.execute(
+        f"SELECT id FROM events WHERE id IN ({placeholders})", ids
+    ).fetchall()
+    return {row["id"] for row in rows}
+
+
+_UPSERT_SQL = f"""
+    INSERT INTO events (id, {", ".join(STORED_FIELDS)}, updated_at)
+    VALUES ({", ".join("?" for _ in range(len(STORED_FIELDS) + 2))})
+    ON CONFLICT(id) DO UPDATE SET
+        {", ".join(f"{field} = excluded.{field}" for field in STORED_FIELDS)},
+        updated_at = excluded.updated_at,
+        version = events.version + 1
+"""
+
+
+def _upsert_events(
+    conn: sqlite3.Connection, items: List[Tuple[str, EventIn]], updated_at: str
+) -> int:
+    """Upsert ``items`` in one transaction and return how many were new."""
+    existing = _existing_ids(conn, (event_id for event_id, _ in items))
+    created = 0
+    for event_id, _ in items:
+        if event_id not in existing:
+            existing.add(event_id)
+            created += 1
+    conn.executemany(
+        _UPSERT_SQL,
+        [(event_id, *_event_values(event), updated_at) for event_id, event in items],
+    )
+    for event_id, event in items:
+        _index_event(conn, event_id, event)
+    return created
+
+
+def _delete_events(conn: sqlite3.Connection, ids: List[str]) -> List[str]:
+    """Delete ``ids`` in one transaction and return those that existed."""
+    existing = _existing_ids(conn, ids)
+    conn.executemany(
+        "DELETE FROM events WHERE id = ?", [(event_id,) for event_id in existing]
+    )
+    for event_id in existing:
+        SCHEDULE.remove(conn, event_id)
+    return [event_id for event_id in dict.fromkeys(ids) if event_id in existing]
+
+
+def _too_many_items() -> HTTPException:
+    return HTTPException(
+        status_code=413, detail=f"Bulk requests are limited to {BULK_MAX_ITEMS} items"
+    )
+
+
+def _batch_failed(
+    errors: List[BulkItemError], indexes: List[int], ids: List[str], exc: HTTPException
+) -> str:
+    """Report every item of a batch whose write failed; return the stop reason."""
+    errors.extend(
+        BulkItemError(index=index, id=event_id, detail=exc.detail)
+        for index, event_id in zip(indexes, ids)
+    )
+    return f"A write failed with {exc.status_code}: {exc.detail}"
+
+
+@app.post("/events:bulk", response_model=BulkUpsertResult)
+async def bulk_upsert_events(request: Request) -> BulkUpsertResult:
+    """Create or update many events from a JSON array or an NDJSON stream.
+
+    Each item is validated like ``POST /events``. Items carrying an ``id``
+    replace the stored event with that ID (or create it); items without
+    one get a generated ID. Valid items are written in batched
+    transactions and invalid ones are reported in ``errors`` without
+    failing the rest of the request. Imports are not checked for
+    double-booking; use ``POST /events/conflicts`` to audit them.
+
+    Batches committed before a write fails, or before an NDJSON stream
+    passes ``BULK_MAX_ITEMS``, stay written: the request then stops and
+    the result says why in ``stopped``, with the failed batch's items in
+    ``errors``.
+    """
+    result = BulkUpsertResult(received=0, created=0, updated=0, ids=[], errors=[])
+    batch: List[Tuple[str, EventIn]] = []
+    indexes: List[int] = []
+
+    async def flush() -> bool:
+        if not batch:
+            return True
+        try:
+            created = await REPOSITORY.write(
+                _upsert_events, list(batch), datetime.utcnow().isoformat()
+            )
+        except HTTPException as exc:
+            for index in indexes:
+                result.ids[index] = None
+            ids = [event_id for event_id, _ in batch]
+            result.stopped = _batch_failed(result.errors, indexes, ids, exc)
+            return False
+        result.created += created
+        result.updated += len(batch) - created
+        batch.clear()
+        indexes.clear()
+        return True
+
+    async for index, item in _iter_bulk_payload(request):
+        if index >= BULK_MAX_ITEMS:
+            result.stopped = _too_many_items().detail
+            break
+        result.received += 1
+        try:
+            if isinstance(item, ValueError):
+                raise item
+            event = EventBulkItem.model_validate(item)
+        except ValidationError as exc:
+            detail = json.loads(exc.json(include_url=False))
+            result.errors.append(BulkItemError(index=index, detail=detail))
+            result.ids.append(None)
+            continue
+        except ValueError as exc:
+            result.errors.append(BulkItemError(index=index, detail=str(exc)))
+            result.ids.append(None)
+            continue
+        event_id = event.id or str(uuid.uuid4())
+        batch.append((event_id, event))
+        indexes.append(index)
+        result.ids.append(event_id)
+        if len(batch) >= BULK_BATCH_SIZE and not await flush():
+            return result
+    await flush()
+    return result
+
+
+@app.delete("/events:bulk", response_model=BulkDeleteResult)
+async def bulk_delete_events(request: Request) -> BulkDeleteResult:
+    """Delete many events given a JSON array (or NDJSON stream) of IDs.
+
+    IDs that do not exist are listed in ``not_found``; entries that are
+    not strings are reported in ``errors``. Like the bulk upsert, a failed
+    write or an NDJSON stream past ``BULK_MAX_ITEMS`` stops the request
+    after the batches already committed, explained in ``stopped``.
+    """
+    result = BulkDeleteResult(received=0, deleted=0, not_found=[], errors=[])
+    batch: List[str] = []
+    indexes: List[int] = []
+
+    async def flush() -> bool:
+        if not batch:
+            return True
+        try:
+            deleted = await REPOSITORY.write(_delete_events, list(batch))
+        except HTTPException as exc:
+            result.stopped = _batch_failed(result.errors, indexes, batch, exc)
+            return False
+        result.deleted += len(deleted)
+        found = set(deleted)
+        result.not_found.extend(event_id for event_id in batch if event_id not in found)
+        batch.clear()
+        indexes.clear()
+        return True
+
+    async for index, item in _iter_bulk_payload(request):
+        if index >= BULK_MAX_ITEMS:
+            result.stopped = _too_many_items().detail
+            break
+        result.received += 1
+        if isinstance(item, dict):
+            item = item.get("id")
+        if not isinstance(item, str):
+            result.errors.append(
+                BulkItemError(index=index, detail="Expected an event ID string")
+            )
+            continue
+        batch.append(item)
+        indexes.append(index)
+        if len(batch) >= BULK_BATCH_SIZE and not await flush():
+            return result
+    await flush()
+    return result
+
+
+class ArchiveResult(BaseModel):
+    """Outcome of an archiving run."""
+
+    before: str = Field(description="Events dated before this day were eligible")
+    archived: int = Field(description="Events moved to the archive")
+
+
+def _copy_to_archive(
+    conn: sqlite3.Connection, before: str, archived_at: str, limit: int
+) -> List[Tuple[str, int]]:
+    """Copy up to ``limit`` archivable events; return their IDs and versions."""
+    statuses = ", ".join("?" for _ in TERMINAL_STATUSES)
+    rows = conn.execute(
+        f"""
+        SELECT id, version FROM events
+        WHERE date < ? AND lower(trim(status)) IN ({statuses})
+        ORDER BY date
+        LIMIT ?
+        """,
+        (before, *TERMINAL_STATUSES, limit),
+    ).fetchall()
+    if rows:
+        ids = [row["id"] for row in rows]
+        conn.execute(
+            f"INSERT OR REPLACE INTO archived_events ({_LISTED_COLUMNS}, archived_at)"
+            f" SELECT {_LISTED_COLUMNS}, ? FROM events"
+            f" WHERE id IN ({', '.join('?' for _ in ids)})",
+            (archived_at, *ids),
+        )
+    return [(row["id"], row["version"]) for row in rows]
+
+
+def _drop_archived(conn: sqlite3.Connection, copied: List[Tuple[str, int]]) -> int:
+    """Delete archived events from ``events``; return how many were moved.
+
+    Events changed or deleted since they were copied stay as they are
+    and their archive copy is discarded instead.
+    """
+    conn.executemany(
+        "INSERT OR IGNORE INTO event_archive_moves (event_id) VALUES (?)",
+        [(event_id,) for event_id, _ in copied],
+    )
+    stale = []
+    for event_id, version in copied:
+        deleted = conn.execute(
+            "DELETE FROM events WHERE id = ? AND version = ?", (event_id, version)
+        )
+        if deleted.rowcount:
+            SCHEDULE.remove(conn, event_id)
+        else:
+            stale.append(event_id)
+    conn.execute("DELETE FROM event_archive_moves")
+    if stale:
+        conn.execute(
+            f"DELETE FROM archived_events WHERE id IN ({', '.join('?' for _ in stale)})",
+            stale,
+        )
+    return len(copied) - len(stale)
+
+
+async def archive_events(before: str) -> int:
+    """Move terminal events dated before ``before`` to the archive.
+
+    Events with a ``status`` in :data:`TERMINAL_STATUSES` are moved in
+    batches of ``ARCHIVE_BATCH_SIZE``. The main and archive databases
+    do not commit atomically together in WAL mode, so each batch is
+    copied in one transaction and removed from ``events`` in the next:
+    a crash in between leaves duplicates that reads skip and the next
+    run resolves, never a lost event.
+    """
+    archived = 0
+    while True:
+        copied = await REPOSITORY.write(
+            _copy_to_archive, before, datetime.utcnow().isoformat(), ARCHIVE_BATCH_SIZE
+        )
+        if copied:
+            archived += await REPOSITORY.write(_drop_archived, copied)
+        if len(copied) < ARCHIVE_BATCH_SIZE:
+            return archived
+
+
+def _default_archive_cutoff() -> str:
+    return (datetime.utcnow().date() - timedelta(days=ARCHIVE_AFTER_DAYS)).isoformat()
+
+
+@app.post("/events/archive", response_model=ArchiveResult)
+async def run_archive(
+    before: Optional[str] = Query(
+        None,
+        description="Archive events dated before this day (YYYY-MM-DD); defaults to"
+        " EVENTS_ARCHIVE_AFTER_DAYS ago",
+    ),
+) -> ArchiveResult:
+    """Move completed and canceled events of past seasons to the archive.
+
+    Archived events live in the attached archive database: listings and
+    the calendar skip them unless ``include_archived`` is set, and the
+    change feed reports them as ``archived``. They keep counting in
+    ``/events/stats``.
+    """
+    try:
+        cutoff = normalise_date(before) or _default_archive_cutoff()
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+    return ArchiveResult(before=cutoff, archived=await archive_events(cutoff))
+
+
+async def _archive_periodically(interval: float) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            moved = await archive_events(_default_archive_cutoff())
+        except Exception:  # pragma: no cover - logged and retried next round
+            logger.exception("Archiving failed")
+            continue
+        if moved:
+            logger.info("Archived %d events", moved)
+
+
+@app.get("/health")
+async def healthcheck() -> dict:
+    """Basic health check endpoint used for monitoring."""
+
+    return {"ok": True}
+
+
+METRICS.gauge(
+    "events_db_pending_operations",
+    "Data layer operations queued or running.",
+    callback=lambda: REPOSITORY.pending,
+)
+METRICS.gauge(
+    "events_db_pool_connections",
+    "Open pooled SQLite connections.",
+    callback=POOL.size,
+)
+METRICS.counter(
+    "events_response_cache_hits_total",
+    "GET /events responses served from the response cache.",
+    callback=lambda: RESPONSE_CACHE.hits,
+)
+METRICS.counter(
+    "events_response_cache_misses_total",
+    "GET /events responses rendered from the database.",
+    callback=lambda: RESPONSE_CACHE.misses,
+)
+METRICS.counter(
+    "events_profiles_captured_total",
+    "Slow request traces written by the sampling profiler.",
+    callback=lambda: PROFILER.captured,
+)
+
+
+@app.get("/metrics")
+async def metrics() -> Response:
+    """Expose request, data layer and cache metrics in Prometheus format."""
+
+    return Response(content=METRICS.render(), media_type=METRICS.content_type)
@@ -4,13 +4,24 @@ from __future__ import annotations
 
 import asyncio
 import json
-from contextlib import AsyncExitStack
+from contextlib import AsyncExitStack, contextmanager
 from dataclasses import dataclass
 from types import TracebackType
-from typing import Any, Dict, Iterable, Mapping, MutableMapping, Optional
+from typing import (
+    Any,
+    Awaitable,
+    Dict,
+    Iterable,
+    Iterator,
+    Mapping,
+    MutableMapping,
+    Optional,
+    TypeVar,
+)
 from urllib.parse import urlencode, urljoin, urlsplit
 
 ASGI_SCOPE = Dict[str, Any]
+T = TypeVar("T")
 
 
 @dataclass
@@ -92,15 +103,46 @@ class TestClient:
         *,
         params: Mapping[str, Any] | Iterable[tuple[str, Any]] | None = None,
         json: Any | None = None,
+        content: bytes | str | None = None,
         headers: Mapping[str, str] | None = None,
     ) -> Response:
         if self._loop is None:
             raise RuntimeError("TestClient must be used as a context manager")
 
         return self._loop.run_until_complete(
-            self._make_request(method, url, params=params, json=json, headers=headers)
+            self._make_request(
+                method, url, params=params, json=json, content=content, headers=headers
+            )
         )
 
+    async def arequest(
+        self,
+        method: str,
+        url: str,
+        *,
+        params: Mapping[str, Any] | Iterable[tuple[str, Any]] | None = None,
+        json: Any | None = None,
+        content: bytes | str | None = None,
+        headers: Mapping[str, str] | None = None,
+    ) -> Response:
+        """Awaitable variant of :meth:`request` for use inside :meth:`run`.
+
+        Several ``arequest`` calls can be in flight at once on the client's
+        event loop, which is how concurrent load is generated without a
+        network or a server process.
+        """
+        if self._loop is None:
+            raise RuntimeError("TestClient must be used as a context manager")
+        return await self._make_request(
+            method, url, params=params, json=json, content=content, headers=headers
+        )
+
+    def run(self, awaitable: Awaitable[T]) -> T:
+        """Run ``awaitable`` to completion on the client's event loop."""
+        if self._loop is None:
+            raise RuntimeError("TestClient must be used as a context manager")
+        return self._loop.run_until_complete(awaitable)
+
     def get(self, url: str, **kwargs: Any) -> Response:
         return self.request("GET", url, **kwargs)
 
@@ -110,21 +152,53 @@ class TestClient:
     def put(self, url: str, **kwargs: Any) -> Response:
         return self.request("PUT", url, **kwargs)
 
+    def patch(self, url: str, **kwargs: Any) -> Response:
+        return self.request("PATCH", url, **kwargs)
+
     def delete(self, url: str, **kwargs: Any) -> Response:
         return self.request("DELETE", url, **kwargs)
 
     def close(self) -> None:
         self.__exit__(None, None, None)
 
-    async def _make_request(
+    @contextmanager
+    def stream(
         self,
         method: str,
         url: str,
         *,
+        params: Mapping[str, Any] | Iterable[tuple[str, Any]] | None = None,
+        json: Any | None = None,
+        content: bytes | str | None = None,
+        headers: Mapping[str, str] | None = None,
+    ) -> Iterator[StreamResponse]:
+        """Send a request and consume the response body incrementally.
+
+        The app keeps running between chunks, so endless responses such as
+        Server-Sent Events can be read piecemeal. Leaving the block
+        disconnects the client and stops the app.
+        """
+        if self._loop is None:
+            raise RuntimeError("TestClient must be used as a context manager")
+        scope, body = self._build_scope(method, url, params, json, content, headers)
+        exchange = _Exchange(self.app, scope, body)
+        task = self._loop.create_task(exchange.run())
+        response = StreamResponse(self._loop, exchange, task)
+        try:
+            self._loop.run_until_complete(exchange.wait_started())
+            yield response
+        finally:
+            response.close()
+
+    def _build_scope(
+        self,
+        method: str,
+        url: str,
         params: Mapping[str, Any] | Iterable[tuple[str, Any]] | None,
         json: Any | None,
+        content: bytes | str | None,
         headers: Mapping[str, str] | None,
-    ) -> Response:
+    ) -> tuple[ASGI_SCOPE, bytes]:
         if not url.startswith("http://") and not url.startswith("https://"):
             target = urljoin(self.base_url, url)
         else:
@@ -152,10 +226,15 @@ class TestClient:
         body_bytes = b""
         header_items: list[tuple[bytes, bytes]] = []
         if headers:
-            header_items.extend((k.lower().encode("latin-1"), v.encode("latin-1")) for k, v in headers.items())
+            header_items.extend(
+                (k.lower().encode("latin-1"), v.encode("latin-1"))
+                for k, v in headers.items()
+            )
         if json is not None:
             body_bytes = json_dumps(json)
             header_items.append((b"content-type", b"application/json"))
+        elif content is not None:
+            body_bytes = content.encode("utf-8") if isinstance(content, str) else content
 
         header_items.append((b"host", (parsed.netloc or "testserver").encode("latin-1")))
 
@@ -174,35 +253,164 @@ class TestClient:
             "server": (parsed.hostname or "testserver", parsed.port or 80),
             "state": {},
         }
+        return scope, body_bytes
+
+    async def _make_request(
+        self,
+        method: str,
+        url: str,
+        *,
+        params: Mapping[str, Any] | Iterable[tuple[str, Any]] | None,
+        json: Any | None,
+        headers: Mapping[str, str] | None,
+        content: bytes | str | None = None,
+    ) -> Response:
+        scope, body = self._build_scope(method, url, params, json, content, headers)
+        exchange = _Exchange(self.app, scope, body)
+        await exchange.run()
+        exchange.raise_error()
+
+        # Chunks are appended to one growing buffer rather than concatenated,
+        # which would copy the whole body again for every chunk.
+        buffer = bytearray()
+        while not exchange.chunks.empty():
+            chunk = exchange.chunks.get_nowait()
+            if chunk is not None:
+                buffer += chunk
+        return Response(
+            status_code=exchange.status_code,
+            headers=exchange.headers,
+            content=bytes(buffer),
+        )
 
-        body_sent = False
-        messages: list[MutableMapping[str, Any]] = []
 
-        async def receive() -> MutableMapping[str, Any]:
-            nonlocal body_sent
-            if not body_sent:
-                body_sent = True
-                return {"type": "http.request", "body": body_bytes, "more_body": False}
-            return {"type": "http.disconnect"}
+class _Exchange:
+    """One ASGI request/response cycle with the body exposed as a queue."""
+
+    def __init__(self, app: Any, scope: ASGI_SCOPE, body: bytes) -> None:
+        self.app = app
+        self.scope = scope
+        self.body = body
+        self.status_code = 500
+        self.headers: Dict[str, str] = {}
+        self.error: BaseException | None = None
+        self.chunks: asyncio.Queue[bytes | None] = asyncio.Queue()
+        self._body_sent = False
+        self._started = asyncio.Event()
+        self._disconnected = asyncio.Event()
+
+    async def receive(self) -> MutableMapping[str, Any]:
+        if not self._body_sent:
+            self._body_sent = True
+            return {"type": "http.request", "body": self.body, "more_body": False}
+        # A real client stays connected until the response is complete or it
+        # hangs up; streaming responses watch for the disconnect to stop early.
+        await self._disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(self, message: MutableMapping[str, Any]) -> None:
+        if message["type"] == "http.response.start":
+            self.status_code = message["status"]
+            self.headers = {
+                k.decode("latin-1"): v.decode("latin-1")
+                for k, v in message.get("headers", [])
+            }
+            self._started.set()
+        elif message["type"] == "http.response.body":
+            body = message.get("body", b"")
+            if body:
+                self.chunks.put_nowait(body)
+            if not message.get("more_body"):
+                self.chunks.put_nowait(None)
+                self._disconnected.set()
+
+    async def run(self) -> None:
+        try:
+            await self.app(self.scope, self.receive, self.send)
+        except BaseException as exc:  # Surface app errors to the caller.
+            self.error = exc
+        finally:
+            self._started.set()
+            self.chunks.put_nowait(None)
+
+    async def wait_started(self) -> None:
+        await self._started.wait()
+        if self.status_code == 500 and self.error is not None:
+            self.raise_error()
+
+    def disconnect(self) -> None:
+        self._disconnected.set()
+
+    def raise_error(self) -> None:
+        if self.error is not None and not isinstance(self.error, asyncio.CancelledError):
+            raise self.error
 
-        async def send(message: MutableMapping[str, Any]) -> None:
-            messages.append(message)
 
-        await self.app(scope, receive, send)
+class StreamResponse:
+    """Response whose body is read incrementally from a running app."""
 
-        status_code = 500
-        response_headers: list[tuple[bytes, bytes]] = []
-        response_body = b""
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        exchange: _Exchange,
+        task: asyncio.Task[None],
+    ) -> None:
+        self._loop = loop
+        self._exchange = exchange
+        self._task = task
+        self._finished = False
 
-        for message in messages:
-            if message["type"] == "http.response.start":
-                status_code = message["status"]
-                response_headers = list(message.get("headers", []))
-            elif message["type"] == "http.response.body":
-                response_body += message.get("body", b"")
-        header_map = {k.decode("latin-1"): v.decode("latin-1") for k, v in response_headers}
+    @property
+    def status_code(self) -> int:
+        return self._exchange.status_code
 
-        return Response(status_code=status_code, headers=header_map, content=response_body)
+    @property
+    def headers(self) -> Mapping[str, str]:
+        return self._exchange.headers
+
+    def iter_bytes(self) -> Iterator[bytes]:
+        """Yield body chunks as the app sends them."""
+        while not self._finished:
+            chunk = self._loop.run_until_complete(self._exchange.chunks.get())
+            if chunk is None:
+                self._finished = True
+                self._exchange.raise_error()
+                return
+            yield chunk
+
+    def iter_lines(self) -> Iterator[str]:
+        """Yield decoded lines, joining lines split across chunks."""
+        pending = bytearray()
+        for chunk in self.iter_bytes():
+            pending += chunk
+            start = 0
+            while True:
+                end = pending.find(b"\n", start)
+                if end == -1:
+                    break
+                yield pending[start:end].rstrip(b"\r").decode("utf-8")
+                start = end + 1
+            del pending[:start]
+        if pending:
+            yield pending.decode("utf-8")
+
+    def read(self) -> bytes:
+        """Read the rest of the body."""
+        buffer = bytearray()
+        for chunk in self.iter_bytes():
+            buffer += chunk
+        return bytes(buffer)
+
+    def close(self) -> None:
+        """Disconnect and wait for the app to stop."""
+        self._finished = True
+        self._exchange.disconnect()
+        if not self._task.done():
+            self._task.cancel()
+        try:
+            self._loop.run_until_complete(self._task)
+        except asyncio.CancelledError:
+            pass
 
 
 def json_dumps(value: Any) -> bytes:
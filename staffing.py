@@ -0,0 +1,391 @@
+"""Staff scheduling helpers for the Events API.
+
+Events store ``date``, ``start_time`` and ``end_time`` as text. The
+helpers here turn them into numeric time windows and keep a per-employee
+interval index so double-booking checks cost ``O(log n)`` instead of a
+scan over every event. :func:`solve_staffing` uses the same index to fill
+under-staffed events automatically.
+"""
+
+import heapq
+import threading
+from bisect import bisect_left, insort
+from dataclasses import dataclass, field
+from datetime import date as date_cls
+from datetime import datetime, time, timedelta, timezone
+from typing import AbstractSet, Callable, Dict, Iterable, List, Optional, Tuple
+
+DAY_SECONDS = 24 * 60 * 60
+# Statuses that free the assigned staff again.
+INACTIVE_STATUSES = {"canceled", "cancelled"}
+
+Window = Tuple[int, int]
+
+
+def parse_date(value: Optional[str]) -> Optional[date_cls]:
+    """Parse a ``YYYY-MM-DD`` string, returning ``None`` when invalid."""
+    if not value:
+        return None
+    try:
+        return date_cls.fromisoformat(value.strip())
+    except ValueError:
+        return None
+
+
+def parse_time(value: Optional[str]) -> Optional[time]:
+    """Parse an ``HH:MM`` (or ``HH:MM:SS``) string, returning ``None`` when invalid."""
+    if not value:
+        return None
+    try:
+        return time.fromisoformat(value.strip())
+    except ValueError:
+        return None
+
+
+def event_window(
+    date: Optional[str], start_time: Optional[str], end_time: Optional[str]
+) -> Optional[Window]:
+    """Return the ``(start, end)`` epoch seconds an event occupies.
+
+    Times are wall-clock values and are converted as if they were UTC,
+    which keeps comparisons consistent without a timezone setting. A
+    missing start means the start of the day and a missing end means the
+    end of the day; an end at or before the start runs past midnight.
+    Every window is therefore at most one day long. Events without a
+    valid date have no window.
+    """
+    day = parse_date(date)
+    if day is None:
+        return None
+    midnight = datetime.combine(day, time(), tzinfo=timezone.utc)
+    start = midnight
+    end = midnight + timedelta(days=1)
+    start_clock = parse_time(start_time)
+    end_clock = parse_time(end_time)
+    if start_clock is not None:
+        start = datetime.combine(day, start_clock, tzinfo=timezone.utc)
+    if end_clock is not None:
+        end = datetime.combine(day, end_clock, tzinfo=timezone.utc)
+        if end <= start:
+            end += timedelta(days=1)
+    return int(start.timestamp()), int(end.timestamp())
+
+
+def is_active(status: Optional[str]) -> bool:
+    """Return whether an event with ``status`` still needs its staff."""
+    return (status or "").strip().lower() not in INACTIVE_STATUSES
+
+
+class IntervalIndex:
+    """Per-employee sorted intervals supporting fast overlap queries.
+
+    Each employee maps to a list of ``(start, end, event_id)`` tuples
+    sorted by start. Because no window is longer than the longest one
+    recorded for that employee, every interval overlapping ``[s, e)``
+    starts in ``[s - longest, e)``; two bisections bound the candidates,
+    so a lookup costs ``O(log n + k)`` for ``k`` nearby intervals.
+    """
+
+    def __init__(self) -> None:
+        self._by_employee: Dict[str, List[Tuple[int, int, str]]] = {}
+        self._longest: Dict[str, int] = {}
+        self._events: Dict[str, Tuple[Window, Tuple[str, ...]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def __contains__(self, event_id: str) -> bool:
+        return event_id in self._events
+
+    def add(self, event_id: str, window: Window, employees: Iterable[str]) -> None:
+        """Record ``event_id`` occupying ``window`` for ``employees``."""
+        self.discard(event_id)
+        start, end = window
+        staff = tuple(dict.fromkeys(employees))
+        for employee in staff:
+            insort(self._by_employee.setdefault(employee, []), (start, end, event_id))
+            self._longest[employee] = max(self._longest.get(employee, 0), end - start)
+        self._events[event_id] = (window, staff)
+
+    def discard(self, event_id: str) -> None:
+        """Forget ``event_id`` if it is indexed."""
+        entry = self._events.pop(event_id, None)
+        if entry is None:
+            return
+        (start, end), staff = entry
+        for employee in staff:
+            intervals = self._by_employee[employee]
+            position = bisect_left(intervals, (start, end, event_id))
+            if position < len(intervals) and intervals[position][2] == event_id:
+                del intervals[position]
+            if not intervals:
+                del self._by_employee[employee]
+                del self._longest[employee]
+
+    def overlapping(
+        self, employee: str, window: Window, exclude: Iterable[str] = ()
+    ) -> List[str]:
+        """Return IDs of indexed events overlapping ``window`` for ``employee``."""
+        intervals = self._by_employee.get(employee)
+        if not intervals:
+            return []
+        start, end = window
+        excluded = exclude if isinstance(exclude, AbstractSet) else set(exclude)
+        low = bisect_left(intervals, (start - self._longest[employee],))
+        high = bisect_left(intervals, (end,))
+        return [
+            event_id
+            for _, other_end, event_id in intervals[low:high]
+            if other_end > start and event_id not in excluded
+        ]
+
+    def window(self, event_id: str) -> Optional[Window]:
+        """Return the indexed window of ``event_id``."""
+        entry = self._events.get(event_id)
+        return entry[0] if entry else None
+
+    def employees(self) -> List[str]:
+        """Return every employee with at least one indexed interval."""
+        return list(self._by_employee)
+
+
+class ScheduleIndex:
+    """Thread-safe interval index over the stored event assignments.
+
+    The index is built lazily from the database and then maintained
+    incrementally by the write path. :meth:`invalidate` drops it so the
+    next use rebuilds it, which is how failed transactions are handled.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._index: Optional[IntervalIndex] = None
+
+    def invalidate(self) -> None:
+        """Drop the index so the next use rebuilds it from the database."""
+        with self._lock:
+            self._index = None
+
+    def _ensure(self, conn) -> IntervalIndex:
+        if self._index is None:
+            index = IntervalIndex()
+            staff: Dict[str, List[str]] = {}
+            windows: Dict[str, Window] = {}
+            rows = conn.execute(
+                """
+                SELECT e.id, e.date, e.start_time, e.end_time, e.status, a.employee_id
+                FROM event_assignments AS a
+                JOIN events AS e ON e.id = a.event_id
+                ORDER BY a.event_id, a.position
+                """
+            )
+            for row in rows:
+                if not is_active(row["status"]):
+                    continue
+                window = event_window(row["date"], row["start_time"], row["end_time"])
+                if window is None:
+                    continue
+                windows[row["id"]] = window
+                staff.setdefault(row["id"], []).append(row["employee_id"])
+            for event_id, employees in staff.items():
+                index.add(event_id, windows[event_id], employees)
+            self._index = index
+        return self._index
+
+    def update(
+        self,
+        conn,
+        event_id: str,
+        date: Optional[str],
+        start_time: Optional[str],
+        end_time: Optional[str],
+        status: Optional[str],
+        employees: Iterable[str],
+    ) -> None:
+        """Reflect the stored state of ``event_id`` in the index."""
+        with self._lock:
+            index = self._ensure(conn)
+            window = event_window(date, start_time, end_time)
+            employees = list(employees)
+            if window is None or not employees or not is_active(status):
+                index.discard(event_id)
+            else:
+                index.add(event_id, window, employees)
+
+    def remove(self, conn, event_id: str) -> None:
+        """Drop ``event_id`` from the index."""
+        with self._lock:
+            self._ensure(conn).discard(event_id)
+
+    def conflicts(
+        self,
+        conn,
+        window: Optional[Window],
+        employees: Iterable[str],
+        exclude: Iterable[str] = (),
+    ) -> List[Tuple[str, str]]:
+        """Return ``(employee_id, event_id)`` pairs double-booked by ``window``."""
+        if window is None:
+            return []
+        excluded = exclude if isinstance(exclude, AbstractSet) else set(exclude)
+        with self._lock:
+            index = self._ensure(conn)
+            return [
+                (employee, other)
+                for employee in dict.fromkeys(employees)
+                for other in index.overlapping(employee, window, excluded)
+            ]
+
+
+FULLY_STAFFED = "Fully staffed"
+PARTIALLY_STAFFED = "Partially staffed"
+UNSTAFFED = "Unstaffed"
+
+
+def staffing_status(assigned: int, target: Optional[int]) -> Optional[str]:
+    """Return the staffing status label for ``assigned`` of ``target`` staff."""
+    if not target:
+        return None
+    if assigned >= target:
+        return FULLY_STAFFED
+    return PARTIALLY_STAFFED if assigned else UNSTAFFED
+
+
+@dataclass
+class StaffingNeed:
+    """An event taking part in a staffing solve."""
+
+    event_id: str
+    window: Window
+    target: int
+    assigned: List[str] = field(default_factory=list)
+
+    @property
+    def duration(self) -> int:
+        return self.window[1] - self.window[0]
+
+
+@dataclass
+class StaffingPlan:
+    """Result of :func:`solve_staffing`."""
+
+    staff: Dict[str, List[str]]
+    added: Dict[str, List[str]]
+    seconds: Dict[str, int]
+    unfilled: Dict[str, int]
+
+
+def solve_staffing(
+    needs: List[StaffingNeed],
+    capacity: Dict[str, Optional[int]],
+    busy: Optional[Callable[[str, Window], bool]] = None,
+    max_passes: int = 5,
+) -> StaffingPlan:
+    """Assign employees to under-staffed events without double-booking.
+
+    ``capacity`` maps every available employee to the most seconds they
+    may work across ``needs`` (``None`` for no limit) and ``busy`` reports
+    commitments outside the solve. Existing assignments are kept.
+
+    A greedy pass visits events by start time and gives each open slot to
+    the least-loaded employee who is free and has capacity left, using a
+    heap keyed by scheduled seconds. A local search then moves new
+    assignments from employees above the mean load to lightly loaded
+    ones while that narrows the gap, balancing hours per person. Every
+    feasibility check is an interval-index lookup, so the greedy pass
+    costs about ``O(s log E)`` for ``s`` open slots and ``E`` employees.
+    """
+    index = IntervalIndex()
+    staff: Dict[str, List[str]] = {}
+    load: Dict[str, int] = {employee: 0 for employee in capacity}
+    by_id = {need.event_id: need for need in needs}
+    for need in needs:
+        staff[need.event_id] = list(dict.fromkeys(need.assigned))
+        if staff[need.event_id]:
+            index.add(need.event_id, need.window, staff[need.event_id])
+        for employee in staff[need.event_id]:
+            load[employee] = load.get(employee, 0) + need.duration
+    shortest = min((need.duration for need in needs), default=0)
+
+    def has_room(employee: str, extra: int) -> bool:
+        limit = capacity.get(employee)
+        return limit is None or load[employee] + extra <= limit
+
+    def is_free(employee: str, need: StaffingNeed) -> bool:
+        if index.overlapping(employee, need.window):
+            return False
+        return busy is None or not busy(employee, need.window)
+
+    # Heap entries go stale when an employee's load changes; stale ones
+    # are skipped when popped and the fresh entry is pushed alongside.
+    heap = [(load[employee], employee) for employee in capacity]
+    heapq.heapify(heap)
+    added: Dict[str, List[str]] = {}
+    for need in sorted(needs, key=lambda item: (item.window, item.event_id)):
+        current = staff[need.event_id]
+        missing = need.target - len(current)
+        skipped = []
+        while missing > 0 and heap:
+            entry = heapq.heappop(heap)
+            seconds, employee = entry
+            if seconds != load[employee]:
+                continue
+            if not has_room(employee, shortest):
+                continue  # Full for the rest of the solve.
+            if (
+                employee in current
+                or not has_room(employee, need.duration)
+                or not is_free(employee, need)
+            ):
+                skipped.append(entry)
+                continue
+            current.append(employee)
+            added.setdefault(need.event_id, []).append(employee)
+            load[employee] += need.duration
+            skipped.append((load[employee], employee))
+            missing -= 1
+        for entry in skipped:
+            heapq.heappush(heap, entry)
+        if need.event_id in added:
+            index.add(need.event_id, need.window, current)
+
+    for _ in range(max_passes):
+        moved = False
+        mean = sum(load[employee] for employee in capacity) / max(len(capacity), 1)
+        order = sorted(capacity, key=lambda item: (load[item], item))
+        moves = [
+            (event_id, employee)
+            for event_id, employees in added.items()
+            for employee in employees
+            if load[employee] > mean
+        ]
+        moves.sort(key=lambda move: (-load[move[1]], move))
+        for event_id, employee in moves:
+            need = by_id[event_id]
+            current = staff[event_id]
+            for candidate in order:
+                if load[candidate] + need.duration >= load[employee]:
+                    break
+                if (
+                    candidate in current
+                    or not has_room(candidate, need.duration)
+                    or not is_free(candidate, need)
+                ):
+                    continue
+                current[current.index(employee)] = candidate
+                new = added[event_id]
+                new[new.index(employee)] = candidate
+                load[employee] -= need.duration
+                load[candidate] += need.duration
+                index.add(event_id, need.window, current)
+                moved = True
+                break
+        if not moved:
+            break
+
+    unfilled = {
+        need.event_id: need.target - len(staff[need.event_id])
+        for need in needs
+        if len(staff[need.event_id]) < need.target
+    }
+    return StaffingPlan(staff=staff, added=added, seconds=load, unfilled=unfilled)
@@ -82,3 +82,1518 @@ def test_event_crud_cycle(tmp_path, monkeypatch):
         assert response.json() == []
 
     assert Path(db_path).exists()
+
+
+@pytest.fixture
+def server_module(tmp_path, monkeypatch):
+    """Reload the server against a fresh temporary database."""
+
+    monkeypatch.setenv("EVENTS_DB_PATH", str(tmp_path / "events.db"))
+
+    import server as server_module
+
+    return importlib.reload(server_module)
+
+
+def test_list_events_cursor_pagination_and_filters(server_module):
+    """Pages follow X-Next-Cursor without overlap and filters run server-side."""
+
+    with TestClient(server_module.app) as client:
+        created_ids = []
+        for index in range(7):
+            response = client.post(
+                "/events",
+                json={
+                    "name": f"Event {index}",
+                    "date": f"2025-09-{index + 1:02d}",
+                    "status": "scheduled" if index % 2 else "draft",
+                    "staffing_status": "Fully staffed" if index < 3 else None,
+                    "assign_employees": ["emp-1"] if index in (2, 5) else [],
+                },
+            )
+            assert response.status_code == 200
+            created_ids.append(response.json()["id"])
+
+        seen = []
+        cursor = None
+        while True:
+            params = {"limit": 3}
+            if cursor:
+                params["cursor"] = cursor
+            response = client.get("/events", params=params)
+            assert response.status_code == 200
+            page = response.json()
+            assert len(page) <= 3
+            seen.extend(item["id"] for item in page)
+            cursor = response.headers.get("x-next-cursor")
+            if not cursor:
+                break
+        assert sorted(seen) == sorted(created_ids)
+        assert len(seen) == len(set(seen))
+
+        response = client.get("/events", params={"status": "scheduled"})
+        assert {item["name"] for item in response.json()} == {
+            "Event 1",
+            "Event 3",
+            "Event 5",
+        }
+
+        response = client.get(
+            "/events", params={"date_from": "2025-09-02", "date_to": "2025-09-04"}
+        )
+        assert {item["date"] for item in response.json()} == {
+            "2025-09-02",
+            "2025-09-03",
+            "2025-09-04",
+        }
+        for bad in ({"date_from": "2025-9-2"}, {"date_to": "June"}):
+            response = client.get("/events", params=bad)
+            assert response.status_code == 422
+            assert "YYYY-MM-DD" in response.json()["detail"]
+
+        response = client.get("/events", params={"staffing_status": "Fully staffed"})
+        assert len(response.json()) == 3
+
+        response = client.get("/events", params={"employee": "emp-1"})
+        assert {item["name"] for item in response.json()} == {"Event 2", "Event 5"}
+
+        response = client.get("/events", params={"cursor": "not-a-cursor"})
+        assert response.status_code == 400
+
+    with server_module.get_connection() as conn:
+        plan = conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM events"
+            " ORDER BY updated_at DESC, id DESC LIMIT 10"
+        ).fetchall()
+    assert any("idx_events_updated" in row["detail"] for row in plan)
+
+
+def test_connection_pool_reuses_tuned_connections(server_module):
+    """Each thread reuses one WAL connection and shutdown closes them all."""
+
+    with TestClient(server_module.app) as client:
+        for _ in range(3):
+            assert client.get("/events").status_code == 200
+
+        conn = server_module.get_connection()
+        assert conn is server_module.get_connection()
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == (
+            server_module.DB_BUSY_TIMEOUT_MS
+        )
+        assert server_module.POOL.size() >= 1
+
+    assert server_module.POOL.size() == 0
+
+
+def test_repository_backpressure_and_timeouts(server_module):
+    """The async data layer rejects overload with 503 and slow work with 504."""
+
+    import asyncio
+    import inspect
+    import time
+
+    from fastapi import HTTPException
+
+    for handler in (
+        server_module.list_events,
+        server_module.create_event,
+        server_module.update_event,
+        server_module.delete_event,
+    ):
+        assert inspect.iscoroutinefunction(handler)
+
+    server_module.init_db()
+    repository = server_module.EventRepository(
+        server_module.ConnectionPool(), read_workers=2, max_pending=1, timeout=0.05
+    )
+
+    def slow_read(conn, seconds):
+        time.sleep(seconds)
+        return conn.execute("SELECT 1").fetchone()[0]
+
+    async def scenario():
+        assert await repository.read(slow_read, 0) == 1
+
+        with pytest.raises(HTTPException) as timed_out:
+            await repository.read(slow_read, 0.2)
+        assert timed_out.value.status_code == 504
+        # The reader thread is still busy, so its slot stays taken.
+        assert repository.pending == 1
+        await asyncio.sleep(0.25)
+        assert repository.pending == 0
+
+        results = await asyncio.gather(
+            repository.read(slow_read, 0.01, timeout=1),
+            repository.read(slow_read, 0.01, timeout=1),
+            return_exceptions=True,
+        )
+        rejected = [r for r in results if isinstance(r, HTTPException)]
+        assert [r.status_code for r in rejected] == [503]
+        assert rejected[0].headers["Retry-After"] == "1"
+
+        # A write that started is waited for rather than timed out, since it
+        # commits anyway; one still queued behind it is cancelled unrun.
+        repository.max_pending = 2
+        ran = []
+
+        def slow_write(conn, seconds, label):
+            time.sleep(seconds)
+            ran.append(label)
+            return label
+
+        results = await asyncio.gather(
+            repository.write(slow_write, 0.2, "started"),
+            repository.write(slow_write, 0, "queued"),
+            return_exceptions=True,
+        )
+        assert results[0] == "started"
+        assert isinstance(results[1], HTTPException)
+        assert results[1].status_code == 504
+        assert ran == ["started"]
+        assert repository.pending == 0
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        repository.close()
+
+
+def test_bulk_upsert_and_delete(server_module, monkeypatch):
+    """Bulk endpoints upsert by id, accept NDJSON and report per-item errors."""
+
+    import json
+
+    with TestClient(server_module.app) as client:
+        response = client.post(
+            "/events:bulk",
+            json=[
+                {"id": "evt-1", "name": "Gala", "guest_count": 80},
+                {"name": "Brunch"},
+                {"guest_count": 10},
+                {"id": "evt-1", "name": "Gala (revised)"},
+            ],
+        )
+        assert response.status_code == 200
+        result = response.json()
+        assert result["received"] == 4
+        assert result["created"] == 2
+        assert result["updated"] == 1
+        assert result["ids"][0] == "evt-1" and result["ids"][2] is None
+        assert [error["index"] for error in result["errors"]] == [2]
+        assert result["errors"][0]["detail"][0]["loc"] == ["name"]
+
+        lines = [json.dumps({"id": f"nd-{i}", "name": f"Row {i}"}) for i in range(5)]
+        lines.insert(2, "{not json")
+        response = client.post(
+            "/events:bulk",
+            content="\n".join(lines) + "\n",
+            headers={"content-type": "application/x-ndjson"},
+        )
+        result = response.json()
+        assert result["created"] == 5
+        assert [error["index"] for error in result["errors"]] == [2]
+
+        names = {item["id"]: item["name"] for item in client.get("/events").json()}
+        assert names["evt-1"] == "Gala (revised)"
+        assert len(names) == 7
+
+        response = client.request(
+            "DELETE", "/events:bulk", json=["nd-0", "nd-1", "missing", 42]
+        )
+        result = response.json()
+        assert result["deleted"] == 2
+        assert result["not_found"] == ["missing"]
+        assert [error["index"] for error in result["errors"]] == [3]
+        assert len(client.get("/events").json()) == 5
+
+        response = client.post("/events:bulk", json={"name": "not a list"})
+        assert response.status_code == 400
+
+        # Over the limit: arrays are refused before any write, NDJSON
+        # streams stop at the limit and keep what was committed.
+        monkeypatch.setattr(server_module, "BULK_MAX_ITEMS", 3)
+        monkeypatch.setattr(server_module, "BULK_BATCH_SIZE", 2)
+        rows = [{"id": f"cap-{i}", "name": f"Cap {i}"} for i in range(4)]
+        assert client.post("/events:bulk", json=rows).status_code == 413
+        response = client.post(
+            "/events:bulk",
+            content="\n".join(json.dumps(row) for row in rows),
+            headers={"content-type": "application/x-ndjson"},
+        )
+        result = response.json()
+        assert response.status_code == 200
+        assert (result["received"], result["created"]) == (3, 3)
+        assert "limited to 3 items" in result["stopped"]
+
+        # A failed write stops the request and reports its batch per item.
+        calls = []
+        write = server_module.REPOSITORY.write
+
+        async def flaky_write(fn, *args, **kwargs):
+            calls.append(fn.__name__)
+            if len(calls) == 2:
+                raise server_module.HTTPException(status_code=503, detail="busy")
+            return await write(fn, *args, **kwargs)
+
+        monkeypatch.setattr(server_module.REPOSITORY, "write", flaky_write)
+        rows = [{"id": f"part-{i}", "name": f"Part {i}"} for i in range(3)]
+        result = client.post("/events:bulk", json=rows).json()
+        assert result["created"] == 2
+        assert result["ids"] == ["part-0", "part-1", None]
+        assert [(e["index"], e["id"]) for e in result["errors"]] == [(2, "part-2")]
+        assert "503" in result["stopped"]
+        calls.clear()
+        response = client.request(
+            "DELETE", "/events:bulk", json=["part-0", "part-1", "part-2"]
+        )
+        result = response.json()
+        assert result["deleted"] == 2
+        assert [(e["index"], e["id"]) for e in result["errors"]] == [(2, "part-2")]
+        assert result["stopped"] is not None
+
+
+def test_export_streams_ndjson_and_csv(server_module, monkeypatch):
+    """The export endpoint streams filtered rows in fetchmany-sized batches."""
+
+    import csv
+    import io
+    import json
+
+    monkeypatch.setattr(server_module, "EXPORT_BATCH_SIZE", 3)
+    with TestClient(server_module.app) as client:
+        client.post(
+            "/events:bulk",
+            json=[
+                {
+                    "id": f"evt-{i}",
+                    "name": f"Event {i}",
+                    "status": "Completed" if i % 2 else "Scheduled",
+                    "assign_employees": ["emp-1", "emp-2"] if i == 1 else [],
+                }
+                for i in range(10)
+            ],
+        )
+
+        response = client.get("/events/export")
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert len(rows) == 10
+        assert {row["id"] for row in rows} == {f"evt-{i}" for i in range(10)}
+
+        response = client.get(
+            "/events/export", params={"format": "csv", "status": "Completed"}
+        )
+        assert response.status_code == 200
+        assert "events.csv" in response.headers["content-disposition"]
+        records = list(csv.DictReader(io.StringIO(response.text)))
+        assert len(records) == 5
+        assert {r["status"] for r in records} == {"Completed"}
+        by_id = {r["id"]: r for r in records}
+        assert by_id["evt-1"]["assign_employees"] == "emp-1;emp-2"
+
+        assert client.get("/events/export", params={"format": "xml"}).status_code == 422
+
+
+def test_assignments_table_backs_employee_schedules(tmp_path, monkeypatch):
+    """Assignments are migrated from JSON, kept in sync and served per employee."""
+
+    import sqlite3
+
+    db_path = tmp_path / "events.db"
+    legacy = sqlite3.connect(db_path)
+    legacy.execute(
+        "CREATE TABLE events (id TEXT PRIMARY KEY, name TEXT NOT NULL, date TEXT,"
+        " start_time TEXT, end_time TEXT, location TEXT, package TEXT,"
+        " guest_count INTEGER, payout REAL, target_staff_count INTEGER,"
+        " assign_employees TEXT, client_name TEXT, client_phone TEXT, status TEXT,"
+        " staffing_status TEXT, notes TEXT, updated_at TEXT NOT NULL)"
+    )
+    legacy.executemany(
+        "INSERT INTO events (id, name, date, assign_employees, updated_at)"
+        " VALUES (?, ?, ?, ?, '2025-01-01T00:00:00')",
+        [
+            ("old-1", "Legacy wedding", "2025-05-01", '["emp-1", "emp-2"]'),
+            ("old-2", "Legacy gala", "2025-04-01", '["emp-1"]'),
+            ("old-3", "Broken row", "2025-04-02", "not json"),
+        ],
+    )
+    legacy.commit()
+    legacy.close()
+
+    monkeypatch.setenv("EVENTS_DB_PATH", str(db_path))
+    import server as server_module
+
+    server_module = importlib.reload(server_module)
+
+    with TestClient(server_module.app) as client:
+        response = client.get("/employees/emp-1/events")
+        assert [item["id"] for item in response.json()] == ["old-2", "old-1"]
+
+        created = client.post(
+            "/events",
+            json={"name": "New", "date": "2025-06-01", "assign_employees": ["emp-2"]},
+        ).json()
+        response = client.get("/employees/emp-2/events")
+        assert [item["id"] for item in response.json()] == ["old-1", created["id"]]
+
+        client.put(
+            "/events/old-1", json={"name": "Legacy wedding", "assign_employees": []}
+        )
+        client.delete("/events/old-2")
+        assert client.get("/employees/emp-1/events").json() == []
+
+        response = client.get(
+            "/employees/emp-2/events", params={"date_from": "2025-05-15"}
+        )
+        assert [item["id"] for item in response.json()] == [created["id"]]
+        for bad in ({"date_from": "2025-9-1"}, {"date_to": "June"}):
+            response = client.get("/employees/emp-2/events", params=bad)
+            assert response.status_code == 422
+            assert "YYYY-MM-DD" in response.json()["detail"]
+
+    with server_module.get_connection() as conn:
+        plan = conn.execute(
+            "EXPLAIN QUERY PLAN SELECT event_id FROM event_assignments"
+            " WHERE employee_id = ?",
+            ("emp-1",),
+        ).fetchall()
+    assert any("idx_event_assignments_employee" in row["detail"] for row in plan)
+
+
+def test_double_booking_is_rejected_and_batch_checked(server_module):
+    """Overlapping assignments return 409 and show up in batch checks."""
+
+    base = {
+        "date": "2025-08-01",
+        "start_time": "18:00",
+        "end_time": "22:00",
+        "assign_employees": ["emp-1"],
+    }
+    with TestClient(server_module.app) as client:
+        first = client.post("/events", json={"name": "Gala", **base}).json()
+
+        response = client.post(
+            "/events", json={**base, "name": "Clash", "start_time": "21:00"}
+        )
+        assert response.status_code == 409
+        assert response.json()["detail"]["conflicts"] == [
+            {"employee_id": "emp-1", "event_id": first["id"]}
+        ]
+
+        later = client.post(
+            "/events",
+            json={**base, "name": "After", "start_time": "22:00", "end_time": "01:00"},
+        )
+        assert later.status_code == 200
+
+        # Moving the first event onto the second one conflicts; editing it in
+        # place does not conflict with itself.
+        response = client.put(
+            f"/events/{first['id']}", json={**base, "name": "Gala", "end_time": "23:00"}
+        )
+        assert response.status_code == 409
+        response = client.put(
+            f"/events/{first['id']}", json={**base, "name": "Gala", "end_time": "21:30"}
+        )
+        assert response.status_code == 200
+
+        forced = client.post(
+            "/events",
+            params={"allow_conflicts": "true"},
+            json={**base, "name": "Forced", "start_time": "19:00"},
+        )
+        assert forced.status_code == 200
+
+        response = client.post(
+            "/events/conflicts",
+            json={
+                "events": [
+                    {
+                        "date": "2025-08-02",
+                        "start_time": "10:00",
+                        "end_time": "12:00",
+                        "assign_employees": ["emp-2"],
+                    },
+                    {
+                        "date": "2025-08-02",
+                        "start_time": "11:00",
+                        "end_time": "13:00",
+                        "assign_employees": ["emp-2", "emp-3"],
+                    },
+                ],
+                "date_from": "2025-08-01",
+                "date_to": "2025-08-01",
+            },
+        )
+        assert response.status_code == 200
+        result = response.json()
+        assert len(result["checked"]) == 5
+        pairs = {
+            (c["event_id"] or f"#{c['index']}", c["conflicting_event_id"])
+            for c in result["conflicts"]
+        }
+        assert ("#0", "#1") in pairs and ("#1", "#0") in pairs
+        assert (first["id"], forced.json()["id"]) in pairs
+        assert (later.json()["id"], first["id"]) not in pairs
+        for bad in (
+            {"date_from": "2025-8-1"},
+            {"date_to": "June"},
+            {"events": [{"date": "nonsense", "assign_employees": ["emp-2"]}]},
+        ):
+            assert client.post("/events/conflicts", json=bad).status_code == 422
+
+        late_slot = {**base, "start_time": "23:00", "end_time": "00:30"}
+        response = client.post("/events", json={**late_slot, "name": "Rebooked"})
+        assert response.status_code == 409
+        client.delete(f"/events/{later.json()['id']}")
+        response = client.post("/events", json={**late_slot, "name": "Rebooked"})
+        assert response.status_code == 200
+
+
+def test_schedule_solver_proposes_and_applies_staff(server_module):
+    """The solver fills open slots without overlaps and can store the plan."""
+
+    evening = {"date": "2025-08-01", "start_time": "18:00", "end_time": "22:00"}
+    with TestClient(server_module.app) as client:
+        client.post(
+            "/events:bulk",
+            json=[
+                {
+                    "id": "a",
+                    "name": "A",
+                    **evening,
+                    "target_staff_count": 2,
+                    "assign_employees": ["emp-1"],
+                },
+                {"id": "b", "name": "B", **evening, "target_staff_count": 2},
+                {
+                    "id": "c",
+                    "name": "C",
+                    "date": "2025-08-02",
+                    "start_time": "12:00",
+                    "end_time": "16:00",
+                    "target_staff_count": 1,
+                },
+                {"id": "d", "name": "D", "date": "2025-09-01", "target_staff_count": 1},
+            ],
+        )
+        roster = {"employees": [{"id": f"emp-{i}"} for i in range(1, 5)]}
+
+        response = client.post(
+            "/schedule/solve",
+            params={"from": "2025-08-01", "to": "2025-08-02"},
+            json=roster,
+        )
+        assert response.status_code == 200
+        plan = response.json()
+        assert plan["applied"] is False
+        assert plan["unfilled_slots"] == 0
+        staff = {event["id"]: event["assign_employees"] for event in plan["events"]}
+        assert set(staff) == {"a", "b", "c"}
+        assert staff["a"][0] == "emp-1" and len(staff["a"]) == 2
+        assert not set(staff["a"]) & set(staff["b"])
+        assert {event["staffing_status"] for event in plan["events"]} == {
+            "Fully staffed"
+        }
+        stored = {event["id"]: event for event in client.get("/events").json()}
+        assert stored["b"]["assign_employees"] == []
+
+        response = client.post(
+            "/schedule/solve",
+            params={"from": "2025-08-01", "to": "2025-08-02", "apply": "true"},
+            json=roster,
+        )
+        assert response.json()["applied"] is True
+        stored = {event["id"]: event for event in client.get("/events").json()}
+        assert len(stored["b"]["assign_employees"]) == 2
+        assert stored["b"]["staffing_status"] == "Fully staffed"
+        assert stored["d"]["assign_employees"] == []
+
+        # Applied assignments take part in double-booking checks.
+        response = client.post(
+            "/events",
+            json={
+                "name": "Clash",
+                **evening,
+                "assign_employees": stored["b"]["assign_employees"][:1],
+            },
+        )
+        assert response.status_code == 409
+
+        # A whole-day event does not fit into a one-hour allowance.
+        response = client.post(
+            "/schedule/solve",
+            params={"from": "2025-09-01", "to": "2025-09-01"},
+            json={"employees": [{"id": "emp-9", "max_hours": 1}]},
+        )
+        assert response.json()["unfilled_slots"] == 1
+        assert response.json()["events"][0]["staffing_status"] == "Unstaffed"
+
+        # Malformed ranges are rejected rather than solved and applied.
+        for bad in ({"from": "2025-9-1", "to": "2025-09-01"}, {"from": "2025-09-01", "to": ""}):
+            response = client.post("/schedule/solve", params={**bad, "apply": "true"})
+            assert response.status_code == 422
+
+
+def test_list_events_etag_and_response_cache(server_module):
+    """Unchanged lists answer 304 and cached pages are dropped on write."""
+
+    cache = server_module.RESPONSE_CACHE
+    with TestClient(server_module.app) as client:
+        client.post("/events", json={"name": "Gala"})
+
+        first = client.get("/events")
+        etag = first.headers["etag"]
+        again = client.get("/events")
+        assert again.content == first.content
+        assert again.headers["etag"] == etag
+        assert cache.hits == 1
+
+        response = client.get("/events", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+
+        client.post("/events", json={"name": "Brunch"})
+        assert len(cache) == 0
+        response = client.get("/events", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+        assert len(response.json()) == 2
+
+        # A failed write does not change the version.
+        etag = response.headers["etag"]
+        assert client.delete("/events/missing").status_code == 404
+        response = client.get("/events", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+
+        # Another projection or format is a different representation.
+        for params in ({"fields": "id,name"}, {"format": "columnar"}, {"limit": 1}):
+            response = client.get("/events", params=params, headers={"If-None-Match": etag})
+            assert response.status_code == 200
+            assert response.headers["etag"] != etag
+
+    schema = server_module.app.openapi()["paths"]["/events"]["get"]["responses"]["200"]
+    assert set(schema["content"]) == {"application/json", "application/x-msgpack"}
+
+    lru = server_module.ResponseCache(max_entries=2, max_bytes=10)
+    lru.put(("v", "a"), b"aaaa", {})
+    lru.put(("v", "b"), b"bbbb", {})
+    assert lru.get(("v", "a")) is not None
+    lru.put(("v", "c"), b"cccc", {})
+    assert lru.get(("v", "b")) is None
+    assert lru.get(("v", "a")) is not None
+    lru.put(("v", "d"), b"dddddddd", {})
+    assert len(lru) == 1
+    lru.put(("v", "e"), b"x" * 11, {})
+    assert lru.get(("v", "e")) is None
+
+
+def test_change_feed_long_poll_and_sse(server_module):
+    """The change feed reports deltas, wakes long-polls and streams SSE."""
+
+    import asyncio
+    import json
+    import time
+
+    with TestClient(server_module.app) as client:
+        created = client.post("/events", json={"name": "Gala"}).json()
+        client.put(f"/events/{created['id']}", json={"name": "Gala (moved)"})
+        client.delete(f"/events/{created['id']}")
+
+        feed = client.get("/events/changes", params={"since": 0}).json()
+        assert [change["op"] for change in feed["changes"]] == [
+            "created",
+            "updated",
+            "deleted",
+        ]
+        assert {change["event_id"] for change in feed["changes"]} == {created["id"]}
+        assert feed["changes"][-1]["event"] is None
+        # Nobody was waiting, so the writer only noted the end of the log.
+        assert len(server_module.CHANGES._buffer) == 0
+        assert server_module.CHANGES.last_seq == feed["last_seq"]
+
+        last_seq = feed["last_seq"]
+        started = time.perf_counter()
+        feed = client.get("/events/changes", params={"since": last_seq, "wait": 0.2})
+        assert feed.json() == {"changes": [], "last_seq": last_seq}
+        assert time.perf_counter() - started >= 0.2
+
+    async def scenario():
+        waiting = asyncio.create_task(
+            server_module.list_changes(since=last_seq, limit=10, wait=5)
+        )
+        await asyncio.sleep(0.05)
+        assert not waiting.done()
+        await server_module.create_event(
+            server_module.EventIn(name="Brunch"), allow_conflicts=False
+        )
+        feed = await asyncio.wait_for(waiting, 1)
+        assert [change.op for change in feed.changes] == ["created"]
+        assert feed.changes[0].event.name == "Brunch"
+        assert [change.seq for change in server_module.CHANGES._buffer] == [feed.last_seq]
+
+        stream = server_module._change_stream(last_seq)
+        message = (await stream.__anext__()).decode()
+        await stream.aclose()
+        lines = message.strip().split("\n")
+        assert lines[0] == f"id: {feed.last_seq}"
+        assert lines[1] == "event: created"
+        assert json.loads(lines[2].removeprefix("data: "))["event"]["name"] == "Brunch"
+
+    server_module.init_db()
+    server_module.CHANGES.sync(server_module.get_connection())
+    try:
+        asyncio.run(scenario())
+    finally:
+        server_module.REPOSITORY.close()
+
+
+def test_change_feed_reports_pruned_history(tmp_path, monkeypatch):
+    """Asking for changes older than the retained log answers 410."""
+
+    monkeypatch.setenv("EVENTS_DB_PATH", str(tmp_path / "events.db"))
+    monkeypatch.setenv("EVENTS_CHANGE_LOG_RETENTION", "3")
+    monkeypatch.setenv("EVENTS_CHANGE_BUFFER_SIZE", "2")
+    import server as server_module
+
+    server_module = importlib.reload(server_module)
+    with TestClient(server_module.app) as client:
+        for index in range(5):
+            client.post("/events", json={"name": f"Event {index}"})
+
+        assert client.get("/events/changes", params={"since": 0}).status_code == 410
+        feed = client.get("/events/changes", params={"since": 2}).json()
+        assert [change["seq"] for change in feed["changes"]] == [3, 4, 5]
+        feed = client.get("/events/changes", params={"since": 4}).json()
+        assert [change["seq"] for change in feed["changes"]] == [5]
+
+
+def test_load_harness_drives_concurrent_requests(server_module):
+    """The in-process load harness runs a concurrent mix and reports it."""
+
+    from benchmarks.loadtest import run_load
+
+    result = run_load(server_module.app, requests=60, concurrency=8, seed_events=10)
+    summary = result.summary()
+    assert summary["requests"] == 60
+    assert summary["lock_errors"] == 0 and summary["errors"] == 0
+    assert set(summary["operations"]) == {"list", "create", "update", "delete"}
+    assert summary["p50_ms"] <= summary["p95_ms"] <= summary["p99_ms"]
+    assert summary["rps"] > 0
+
+
+def test_client_streams_export_and_sse(server_module, monkeypatch):
+    """Streaming responses are consumed chunk by chunk, including endless SSE."""
+
+    import json
+
+    monkeypatch.setattr(server_module, "EXPORT_BATCH_SIZE", 2)
+    with TestClient(server_module.app) as client:
+        client.post(
+            "/events:bulk",
+            json=[{"id": f"evt-{i}", "name": f"Event {i}"} for i in range(5)],
+        )
+
+        with client.stream("GET", "/events/export") as response:
+            assert response.status_code == 200
+            chunks = list(response.iter_bytes())
+        assert len(chunks) > 1
+        rows = [json.loads(line) for line in b"".join(chunks).decode().splitlines()]
+        assert sorted(row["id"] for row in rows) == [f"evt-{i}" for i in range(5)]
+
+        with client.stream("GET", "/events/export", params={"format": "csv"}) as response:
+            lines = list(response.iter_lines())
+        assert lines[0].startswith("id,")
+        assert len(lines) == 6
+
+        with client.stream("GET", "/events/changes/stream?since=3") as response:
+            assert response.headers["content-type"].startswith("text/event-stream")
+            lines = response.iter_lines()
+            assert next(lines) == "id: 4"
+            assert next(lines) == "event: created"
+            assert json.loads(next(lines).removeprefix("data: "))["event_id"] == "evt-3"
+
+        assert client.get("/health").status_code == 200
+
+
+def test_fast_serialization_matches_model_output(server_module, monkeypatch):
+    """The opt-in row encoder produces the same bytes as the Event models."""
+
+    events = [
+        {"name": "Gala", "payout": 1500, "guest_count": 120, "assign_employees": ["a"]},
+        {"name": "Café ☕ \"quoted\"\n", "payout": 99.95, "notes": "日本語"},
+        {"name": "Bare", "status": None},
+    ]
+    with TestClient(server_module.app) as client:
+        for event in events:
+            client.post("/events", json=event)
+        with server_module.get_connection() as conn:
+            conn.execute(
+                "UPDATE events SET assign_employees = 'not json' WHERE name = 'Bare'"
+            )
+
+        monkeypatch.setattr(server_module, "FAST_JSON", False)
+        slow = [client.get(url).content for url in ("/events", "/employees/a/events")]
+        monkeypatch.setattr(server_module, "FAST_JSON", True)
+        server_module.RESPONSE_CACHE.clear()
+        fast = [client.get(url).content for url in ("/events", "/employees/a/events")]
+        assert fast == slow
+        assert b"Caf\xc3\xa9" in fast[0]
+
+        rows = server_module.get_connection().execute("SELECT * FROM events").fetchall()
+        expected = server_module.EVENT_LIST_ADAPTER.dump_json(
+            [server_module.row_to_event(row) for row in rows]
+        )
+        assert server_module.EVENT_ENCODER.encode(rows) == expected
+        monkeypatch.setattr(server_module, "orjson", None)
+        assert server_module.EVENT_ENCODER.encode(rows) == expected
+
+
+def test_stats_rollups_follow_writes(server_module):
+    """Dashboard aggregates are served from rollups kept current by triggers."""
+
+    events = [
+        {
+            "id": "evt-1",
+            "name": "Wedding",
+            "date": "2025-06-02",
+            "start_time": "18:00",
+            "end_time": "23:00",
+            "package": "Premium",
+            "guest_count": 150,
+            "payout": 3000,
+            "target_staff_count": 3,
+            "assign_employees": ["emp-1", "emp-2"],
+            "status": "Scheduled",
+        },
+        {
+            "id": "evt-2",
+            "name": "Birthday",
+            "date": "2025-06-05",
+            "start_time": "22:00",
+            "end_time": "01:00",
+            "package": "Basic",
+            "guest_count": 40,
+            "payout": 800,
+            "target_staff_count": 1,
+            "assign_employees": ["emp-1", "emp-1"],
+            "status": "Scheduled",
+        },
+        {
+            "id": "evt-3",
+            "name": "Gala",
+            "date": "2025-07-10",
+            "package": "Premium",
+            "guest_count": 250,
+            "payout": 5000,
+            "target_staff_count": 4,
+            "status": "Canceled",
+        },
+        {"id": "evt-4", "name": "Undated"},
+    ]
+    with TestClient(server_module.app) as client:
+        client.post("/events:bulk", json=events)
+
+        stats = client.get("/events/stats").json()
+        assert stats["payout_by_month"] == [
+            {"month": None, "events": 1, "payout": 0.0, "guests": 0},
+            {"month": "2025-06", "events": 2, "payout": 3800.0, "guests": 190},
+            {"month": "2025-07", "events": 1, "payout": 5000.0, "guests": 250},
+        ]
+        assert [(p["package"], p["guests"]) for p in stats["guests_by_package"]] == [
+            ("Premium", 400),
+            ("Basic", 40),
+            (None, 0),
+        ]
+        june = [w for w in stats["understaffed_by_week"] if w["week"] == "2025-06-02"]
+        assert june == [
+            {
+                "week": "2025-06-02",
+                "events": 2,
+                "understaffed": 1,
+                "staff_needed": 4,
+                "staff_assigned": 3,
+            }
+        ]
+        assert "2025-07-07" not in {w["week"] for w in stats["understaffed_by_week"]}
+        assert {u["employee_id"]: u["hours"] for u in stats["utilization"]} == {
+            "emp-1": 8.0,
+            "emp-2": 5.0,
+        }
+
+        client.put(
+            "/events/evt-1",
+            json={**events[0], "assign_employees": ["emp-1", "emp-2", "emp-3"]},
+        )
+        client.delete("/events/evt-2")
+        staffing = client.get(
+            "/events/stats/staffing",
+            params={"date_from": "2025-06-01", "date_to": "2025-06-30"},
+        ).json()
+        assert [(w["week"], w["understaffed"]) for w in staffing] == [("2025-06-02", 0)]
+        payout = client.get("/events/stats/payout", params={"status": "Canceled"}).json()
+        assert payout == [
+            {"month": "2025-07", "events": 1, "payout": 5000.0, "guests": 250}
+        ]
+        utilization = client.get(
+            "/events/stats/utilization",
+            params={"date_from": "2025-06-01", "date_to": "2025-06-30", "capacity_hours": 10},
+        ).json()
+        assert utilization[0] == {
+            "employee_id": "emp-1",
+            "events": 1,
+            "hours": 5.0,
+            "utilization": 0.5,
+        }
+        packages = client.get("/events/stats/packages", params={"date_from": "2025-07-01"})
+        assert [p["package"] for p in packages.json()] == ["Premium"]
+        for bad in (
+            {"date_from": "June", "date_to": "July", "capacity_hours": 10},
+            {"date_from": "2025-13-01", "date_to": "2025-14-01", "capacity_hours": 10},
+            {"date_from": "garbage"},
+        ):
+            response = client.get("/events/stats", params=bad)
+            assert response.status_code == 422
+            assert "YYYY-MM-DD" in response.json()["detail"]
+
+    # Incrementally maintained rollups match a fresh aggregation of the table.
+    tables = ("stats_monthly", "stats_packages", "stats_weekly_staffing", "stats_employees")
+    conn = server_module.get_connection()
+
+    def snapshot():
+        return {
+            table: sorted(map(tuple, conn.execute(f"SELECT * FROM {table}")))
+            for table in tables
+        }
+
+    maintained = snapshot()
+    with conn:
+        for table in tables:
+            conn.execute(f"DROP TABLE {table}")
+        server_module._init_rollups(conn)
+    assert snapshot() == maintained
+    server_module.REPOSITORY.close()
+
+
+def test_full_text_search_ranks_and_paginates(server_module):
+    """Search covers the mirrored text columns and follows every write."""
+
+    with TestClient(server_module.app) as client:
+        client.post(
+            "/events:bulk",
+            json=[
+                {
+                    "id": "evt-1",
+                    "name": "Smith wedding",
+                    "client_name": "Jane Smith",
+                    "location": "Galveston",
+                    "status": "Scheduled",
+                },
+                {
+                    "id": "evt-2",
+                    "name": "Corporate mixer",
+                    "notes": "Contact Mr. Smith about the signature cocktail",
+                    "client_phone": "(713) 555-0142",
+                },
+                {"id": "evt-3", "name": "Quinceañera", "location": "Houston"},
+            ],
+        )
+
+        def ids(q, **params):
+            response = client.get("/events/search", params={"q": q, **params})
+            assert response.status_code == 200, response.text
+            return [event["id"] for event in response.json()]
+
+        assert ids("smith") == ["evt-1", "evt-2"]
+        assert ids("smi wedd") == ["evt-1"]
+        assert ids("555-0142") == ["evt-2"]
+        assert ids("quinceanera") == ["evt-3"]
+        assert ids("smith", status="Scheduled") == ["evt-1"]
+        assert ids('smith" OR "houston') == []
+
+        first = client.get("/events/search", params={"q": "smith", "limit": 1})
+        assert [event["id"] for event in first.json()] == ["evt-1"]
+        cursor = first.headers["x-next-cursor"]
+        assert ids("smith", limit=1, cursor=cursor) == ["evt-2"]
+        bad = client.get("/events/search", params={"q": "smith", "cursor": "%%%"})
+        assert bad.status_code == 400
+        assert client.get("/events/search", params={"q": ""}).status_code == 422
+
+        client.put("/events/evt-3", json={"name": "Quinceañera", "notes": "Smithsonian theme"})
+        client.delete("/events/evt-1")
+        assert sorted(ids("smith")) == ["evt-2", "evt-3"]
+        assert ids("galveston") == []
+
+
+def test_calendar_window_queries_and_validation(server_module):
+    """Dates and times are validated on write and back calendar range queries."""
+
+    def event(event_id, date=None, start_time=None, end_time=None):
+        return {
+            "id": event_id,
+            "name": event_id,
+            "date": date,
+            "start_time": start_time,
+            "end_time": end_time,
+        }
+
+    events = [
+        event("evt-1", "2025-06-01", "10:00", "13:30"),
+        event("evt-2", "2025-05-31", "22:00", "02:00"),
+        event("evt-3", "2025-06-30"),
+        event("evt-4", "2025-07-01", "09:00"),
+        event("evt-5"),
+    ]
+    with TestClient(server_module.app) as client:
+        response = client.post("/events:bulk", json=events)
+        assert response.status_code == 200, response.text
+
+        def ids(**params):
+            response = client.get("/calendar", params=params)
+            assert response.status_code == 200, response.text
+            return [event["id"] for event in response.json()]
+
+        assert ids(**{"from": "2025-06-01", "to": "2025-07-01"}) == [
+            "evt-2",
+            "evt-1",
+            "evt-3",
+        ]
+        assert ids(**{"from": "2025-06-01T02:00", "to": "2025-06-01T10:00"}) == []
+        assert ids(**{"from": "2025-06-01T13:00", "to": "2025-06-02"}) == ["evt-1"]
+
+        page = client.get(
+            "/calendar", params={"from": "2025-05-01", "to": "2025-08-01", "limit": 2}
+        )
+        assert [event["id"] for event in page.json()] == ["evt-2", "evt-1"]
+        rest = ids(
+            **{"from": "2025-05-01", "to": "2025-08-01"},
+            cursor=page.headers["x-next-cursor"],
+        )
+        assert rest == ["evt-3", "evt-4"]
+
+        for bounds in (("June", "2025-07-01"), ("2025-07-01", "2025-06-01")):
+            params = dict(zip(("from", "to"), bounds))
+            assert client.get("/calendar", params=params).status_code == 422
+
+        created = client.post(
+            "/events",
+            json={"name": "Padded", "date": " 2025-06-15 ", "start_time": "18:00:00"},
+        ).json()
+        assert (created["date"], created["start_time"], created["end_time"]) == (
+            "2025-06-15",
+            "18:00",
+            None,
+        )
+        for bad in ({"date": "2025-02-30"}, {"date": "15/06/2025"}, {"start_time": "25:00"}):
+            assert client.post("/events", json={"name": "Bad", **bad}).status_code == 422
+
+    # Databases from before the window columns are backfilled on startup
+    # without flooding the change feed; unparseable legacy rows still load.
+    conn = server_module.get_connection()
+    with conn:
+        conn.execute("DROP INDEX idx_events_start_at")
+        conn.execute("ALTER TABLE events DROP COLUMN start_at")
+        conn.execute("ALTER TABLE events DROP COLUMN end_at")
+        conn.execute(
+            "INSERT INTO events (id, name, date, updated_at)"
+            " VALUES ('legacy', 'Legacy', 'sometime in June', '2025-01-01T00:00:00')"
+        )
+    changes = conn.execute("SELECT max(seq) FROM event_changes").fetchone()[0]
+    with TestClient(server_module.app) as client:
+        assert ids(**{"from": "2025-06-01", "to": "2025-07-01"}) == [
+            "evt-2",
+            "evt-1",
+            created["id"],
+            "evt-3",
+        ]
+        legacy = client.get("/events/search", params={"q": "legacy"}).json()
+        assert legacy[0]["date"] == "sometime in June"
+    conn = server_module.get_connection()
+    assert conn.execute("SELECT max(seq) FROM event_changes").fetchone()[0] == changes
+
+
+def test_metrics_and_slow_request_profiler(server_module, tmp_path, monkeypatch):
+    """Requests and database work show up in /metrics; slow requests get traces."""
+
+    import pstats
+
+    from metrics import SlowRequestProfiler
+
+    profiler = SlowRequestProfiler(str(tmp_path / "profiles"), 0.0, 1.0, keep=2)
+    monkeypatch.setattr(server_module, "PROFILER", profiler)
+    with TestClient(server_module.app) as client:
+        created = client.post("/events", json={"name": "Gala"}).json()
+        client.put(f"/events/{created['id']}", json={"name": "Gala II"})
+        client.put("/events/missing", json={"name": "Nope"})
+        client.get("/events")
+        client.get("/events")
+
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        samples = {}
+        for line in response.text.splitlines():
+            if line and not line.startswith("#"):
+                name, value = line.rsplit(" ", 1)
+                samples[name] = float(value)
+
+    def sample(name, **labels):
+        pairs = ",".join(f'{key}="{value}"' for key, value in labels.items())
+        return samples[f"{name}{{{pairs}}}" if labels else name]
+
+    requests = "events_http_requests_total"
+    latency = "events_http_request_duration_seconds"
+    route = "/events/{event_id}"
+    assert sample(requests, method="PUT", route=route, status="200") == 1
+    assert sample(requests, method="PUT", route=route, status="404") == 1
+    assert sample(f"{latency}_count", method="GET", route="/events") == 2
+    assert sample(f"{latency}_bucket", method="GET", route="/events", le="+Inf") == 2
+    assert sample("events_http_requests_in_flight", method="GET") == 1
+    operations = "events_db_operation_duration_seconds_count"
+    assert sample(operations, kind="write", operation="_insert_event") == 1
+    assert sample("events_db_queue_wait_seconds_count", kind="read") >= 2
+    assert sample("events_db_statements_total") > 0
+    assert sample("events_response_cache_hits_total") == 1
+    assert sample("events_db_pool_connections") >= 1
+
+    traces = sorted((tmp_path / "profiles").glob("*.prof"))
+    assert len(traces) == 2 and profiler.captured == 6
+    assert "GET-events" in traces[-1].name or "GET-metrics" in traces[-1].name
+    assert pstats.Stats(str(traces[-1])).total_calls > 0
+
+
+def test_if_match_prevents_lost_updates(server_module):
+    """Writes carry a version; stale If-Match writes fail with 412, not silently."""
+
+    with TestClient(server_module.app) as client:
+        created = client.post("/events", json={"name": "Gala"}).json()
+        event_id = created["id"]
+        assert created["version"] == 1
+
+        # Two dispatchers read version 1; the first write wins.
+        first = client.put(
+            f"/events/{event_id}", json={"name": "Gala (A)"}, headers={"If-Match": '"1"'}
+        )
+        assert first.status_code == 200
+        assert first.json()["version"] == 2
+        assert first.headers["etag"] == '"2"'
+        second = client.put(
+            f"/events/{event_id}", json={"name": "Gala (B)"}, headers={"If-Match": '"1"'}
+        )
+        assert second.status_code == 412
+        assert second.json()["detail"]["version"] == 2
+        assert second.headers["etag"] == '"2"'
+        assert client.get("/events").json()[0]["name"] == "Gala (A)"
+
+        # Unconditional writes still apply and bump the version.
+        response = client.put(f"/events/{event_id}", json={"name": "Gala"})
+        assert response.json()["version"] == 3
+        client.post("/events:bulk", json=[{"id": event_id, "name": "Gala (bulk)"}])
+        assert client.get("/events").json()[0]["version"] == 4
+
+        def delete(target, if_match):
+            return client.delete(target, headers={"If-Match": if_match}).status_code
+
+        assert delete(f"/events/{event_id}", '"3"') == 412
+        assert delete(f"/events/{event_id}", "junk") == 412
+        assert delete("/events/missing", '"1"') == 404
+        assert client.put("/events/missing", json={"name": "Nope"}).status_code == 404
+        assert delete(f"/events/{event_id}", 'W/"9", "4"') == 200
+        assert client.get("/events").json() == []
+
+
+def test_patch_writes_only_supplied_fields(server_module):
+    """PATCH updates the given columns, keeps the rest and still guards conflicts."""
+
+    with TestClient(server_module.app) as client:
+        client.post(
+            "/events:bulk",
+            json=[
+                {
+                    "id": "evt-1",
+                    "name": "Wedding",
+                    "date": "2025-06-01",
+                    "start_time": "18:00",
+                    "end_time": "22:00",
+                    "notes": "Signature cocktail",
+                    "assign_employees": ["emp-1"],
+                    "status": "Scheduled",
+                },
+                {
+                    "id": "evt-2",
+                    "name": "Brunch",
+                    "date": "2025-06-02",
+                    "start_time": "10:00",
+                    "end_time": "13:00",
+                    "status": "Scheduled",
+                },
+            ],
+        )
+
+        response = client.patch("/events/evt-1", json={"status": "Confirmed"})
+        assert response.status_code == 200
+        patched = response.json()
+        assert patched["status"] == "Confirmed"
+        assert patched["notes"] == "Signature cocktail"
+        assert patched["assign_employees"] == ["emp-1"]
+        assert patched["version"] == 2
+        assert response.headers["etag"] == '"2"'
+
+        conn = server_module.get_connection()
+        before = conn.execute("SELECT max(seq) FROM event_changes").fetchone()[0]
+        moved = client.patch(
+            "/events/evt-2", json={"date": "2025-06-03", "assign_employees": ["emp-1"]}
+        ).json()
+        assert (moved["date"], moved["start_time"]) == ("2025-06-03", "10:00")
+        # One statement per PATCH: a single change-feed entry and a fresh window.
+        feed = client.get("/events/changes", params={"since": before}).json()
+        assert [change["event_id"] for change in feed["changes"]] == ["evt-2"]
+        stored = conn.execute(
+            "SELECT start_at, end_at FROM events WHERE id = 'evt-2'"
+        ).fetchone()
+        assert tuple(stored) == server_module.event_window("2025-06-03", "10:00", "13:00")
+        calendar = client.get("/calendar", params={"from": "2025-06-03", "to": "2025-06-04"})
+        assert [event["id"] for event in calendar.json()] == ["evt-2"]
+        schedule = client.get("/employees/emp-1/events").json()
+        assert [event["id"] for event in schedule] == ["evt-1", "evt-2"]
+
+        clash = {"date": "2025-06-01", "start_time": "20:00"}
+        assert client.patch("/events/evt-2", json=clash).status_code == 409
+        unchanged = client.get("/events", params={"date_from": "2025-06-03"}).json()
+        assert [event["id"] for event in unchanged] == ["evt-2"]
+
+        assert client.patch("/events/evt-1", json={}).status_code == 422
+        assert client.patch("/events/evt-1", json={"stauts": "Done"}).status_code == 422
+        assert client.patch("/events/evt-1", json={"name": None}).status_code == 422
+        assert client.patch("/events/evt-1", json={"date": "June"}).status_code == 422
+        assert client.patch("/events/missing", json={"notes": "x"}).status_code == 404
+        stale = client.patch(
+            "/events/evt-1", json={"notes": "x"}, headers={"If-Match": '"1"'}
+        )
+        assert stale.status_code == 412
+        cleared = client.patch("/events/evt-1", json={"notes": None, "assign_employees": []})
+        assert cleared.json()["notes"] is None
+        assert client.get("/employees/emp-1/events").json()[0]["id"] == "evt-2"
+
+    # Only the supplied column is written, so triggers on other columns stay idle.
+    conn = server_module.get_connection()
+    statements = []
+    conn.set_trace_callback(statements.append)
+    with conn:
+        server_module._patch_event(conn, "evt-1", {"status": "Completed"}, "2025-06-02")
+    conn.set_trace_callback(None)
+    assert any("SET status = 'Completed', updated_at" in sql for sql in statements)
+    assert not any("trg_events_fts_update" in sql for sql in statements)
+    assert not any("trg_events_assignments_update" in sql for sql in statements)
+
+
+def test_worker_processes_share_one_database(tmp_path, monkeypatch):
+    """Processes racing through startup and writes neither fail nor lose data."""
+
+    import multiprocessing
+    import sqlite3
+
+    from benchmarks.bench_workers import write_worker
+
+    db_path = tmp_path / "events.db"
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    barrier = context.Barrier(3)
+    processes = [
+        context.Process(target=write_worker, args=(str(db_path), barrier, 25, results))
+        for _ in range(3)
+    ]
+    for process in processes:
+        process.start()
+    outcomes = [results.get(timeout=60) for _ in processes]
+    for process in processes:
+        process.join(timeout=60)
+    assert [statuses for _, statuses in outcomes] == [{200: 25}] * 3
+
+    conn = sqlite3.connect(db_path)
+    assert conn.execute("SELECT count(*) FROM events").fetchone()[0] == 75
+    assert conn.execute("SELECT count(*) FROM event_changes").fetchone()[0] == 75
+    version = conn.execute("SELECT value FROM meta WHERE key = 'data_version'")
+    assert version.fetchone()[0] == 75
+    triggers = conn.execute(
+        "SELECT count(*) FROM sqlite_master WHERE name = 'trg_event_changes_retention'"
+    )
+    assert triggers.fetchone()[0] == 1
+    conn.close()
+
+    # Writes from another process invalidate this process's schedule index.
+    monkeypatch.setenv("EVENTS_DB_PATH", str(db_path))
+    import server as server_module
+
+    server_module = importlib.reload(server_module)
+    slot = {"date": "2025-09-01", "start_time": "18:00", "end_time": "22:00"}
+    with TestClient(server_module.app) as client:
+        first = client.post("/events", json={"name": "Gala", **slot}).json()
+        assert client.post(
+            "/events/conflicts", json={"events": [{"name": "Probe", **slot}]}
+        ).json()["conflicts"] == []
+
+        other = sqlite3.connect(db_path)
+        with other:
+            other.execute(
+                "UPDATE events SET assign_employees = '[\"emp-9\"]' WHERE id = ?",
+                (first["id"],),
+            )
+            other.execute("UPDATE meta SET value = value + 1 WHERE key = 'data_version'")
+        other.close()
+
+        clash = {"name": "Clash", **slot, "assign_employees": ["emp-9"]}
+        assert client.post("/events", json=clash).status_code == 409
+
+        with server_module.WRITE_LOCK.hold():
+            monkeypatch.setattr(server_module.REPOSITORY, "lock_timeout", 0.05)
+            blocked = client.post("/events", json={"name": "Blocked"})
+        assert blocked.status_code == 503
+        assert blocked.headers["retry-after"] == "1"
+
+
+def test_archive_moves_past_terminal_events(server_module):
+    """Archived events leave the live table but stay readable on request."""
+
+    import json
+
+    events = [
+        ("old-done", "2024-03-01", "Completed"),
+        ("old-canceled", "2024-04-01", "Canceled "),
+        ("old-open", "2024-05-01", "Scheduled"),
+        ("new-done", "2025-03-01", "completed"),
+    ]
+    with TestClient(server_module.app) as client:
+        for event_id, day, status in events:
+            payload = {
+                "name": event_id,
+                "date": day,
+                "start_time": "18:00",
+                "end_time": "22:00",
+                "status": status,
+                "payout": 100.0,
+                "assign_employees": ["emp-1"],
+            }
+            assert client.put(f"/events/{event_id}", json=payload).status_code == 404
+            with server_module.get_connection() as conn:
+                server_module._insert_event(
+                    conn,
+                    event_id,
+                    server_module.EventIn(**payload),
+                    f"{day}T12:00:00",
+                    check_conflicts=False,
+                )
+        stats = client.get("/events/stats").json()
+
+        result = client.post("/events/archive", params={"before": "2025-01-01"})
+        assert result.json() == {"before": "2025-01-01", "archived": 2}
+        assert client.post("/events/archive", params={"before": "2025-01-01"}).json()[
+            "archived"
+        ] == 0
+        assert client.post("/events/archive", params={"before": "soon"}).status_code == 422
+
+        live = client.get("/events").json()
+        assert [event["id"] for event in live] == ["new-done", "old-open"]
+        every = client.get("/events", params={"include_archived": "true"}).json()
+        assert [event["id"] for event in every] == [
+            "new-done",
+            "old-open",
+            "old-canceled",
+            "old-done",
+        ]
+        page = client.get("/events", params={"include_archived": "true", "limit": 3})
+        rest = client.get(
+            "/events",
+            params={"include_archived": "true", "cursor": page.headers["x-next-cursor"]},
+        ).json()
+        assert [event["id"] for event in rest] == ["old-done"]
+        assert rest[0]["status"] == "Completed"
+        filtered = client.get(
+            "/events",
+            params={"include_archived": "true", "employee": "emp-1", "status": "Completed"},
+        ).json()
+        assert [event["id"] for event in filtered] == ["old-done"]
+
+        window = {"from": "2024-03-01", "to": "2024-03-02"}
+        assert client.get("/calendar", params=window).json() == []
+        archived = client.get("/calendar", params={**window, "include_archived": "1"})
+        assert [event["id"] for event in archived.json()] == ["old-done"]
+        exported = client.get("/events/export").text.splitlines()
+        assert [json.loads(line)["id"] for line in exported] == ["new-done", "old-open"]
+        exported = client.get(
+            "/events/export", params={"format": "csv", "include_archived": "true"}
+        ).text.splitlines()
+        assert [line.split(",")[0] for line in exported[1:]] == [
+            "new-done",
+            "old-open",
+            "old-canceled",
+            "old-done",
+        ]
+        assert [event["id"] for event in client.get("/employees/emp-1/events").json()] == [
+            "old-open",
+            "new-done",
+        ]
+
+        # Statistics still cover archived seasons; the feed reports the move.
+        assert client.get("/events/stats").json() == stats
+        changes = client.get("/events/changes", params={"since": 0}).json()["changes"]
+        assert sorted((c["event_id"], c["op"]) for c in changes[4:]) == [
+            ("old-canceled", "archived"),
+            ("old-done", "archived"),
+        ]
+
+        # Booking the freed slot works: completed events left the schedule index.
+        slot = {"date": "2024-03-01", "start_time": "19:00", "assign_employees": ["emp-1"]}
+        assert client.post("/events", json={"name": "Rebook", **slot}).status_code == 200
+
+    conn = server_module.get_connection()
+    assert conn.execute("SELECT count(*) FROM main.events").fetchone()[0] == 3
+    assert server_module.ARCHIVE_PATH.exists()
+    assert conn.execute("SELECT count(*) FROM archive.archived_events").fetchone()[0] == 2
+
+
+def test_coalesced_writes_share_a_transaction(tmp_path, monkeypatch):
+    """Burst writes commit together, collapse repeated PUTs and fail alone."""
+
+    import asyncio
+
+    monkeypatch.setenv("EVENTS_DB_PATH", str(tmp_path / "events.db"))
+    monkeypatch.setenv("EVENTS_WRITE_COALESCE", "1")
+    monkeypatch.setenv("EVENTS_WRITE_COALESCE_MS", "50")
+    import server as server_module
+
+    server_module = importlib.reload(server_module)
+    slot = {"date": "2025-07-01", "start_time": "18:00", "end_time": "22:00"}
+    with TestClient(server_module.app) as client:
+        for name, staff in (("a", []), ("b", ["emp-1"]), ("c", [])):
+            payload = {"name": name, **slot, "assign_employees": staff}
+            assert client.post("/events", json=payload).status_code == 200
+        ids = {event["name"]: event["id"] for event in client.get("/events").json()}
+        a, b, c = ids["a"], ids["b"], ids["c"]
+        batches = server_module.DB_WRITE_BATCH.count()
+
+        def put(event_id, name, **extra):
+            headers = extra.pop("headers", None)
+            body = {"name": name, **slot, **extra}
+            return client.arequest("PUT", f"/events/{event_id}", json=body, headers=headers)
+
+        async def burst():
+            return await asyncio.gather(
+                put(a, "a1"),
+                put(c, "c1"),
+                put(a, "a2"),
+                put(c, "c2"),
+                put(a, "a3", assign_employees=["emp-1"]),
+                put(c, "c3"),
+                put("missing", "x"),
+                put(b, "b1", headers={"If-Match": '"7"'}),
+            )
+
+        responses = client.run(burst())
+        assert server_module.DB_WRITE_BATCH.count() == batches + 1
+        assert [response.status_code for response in responses] == [
+            200, 200, 200, 200, 409, 200, 404, 412
+        ]
+        assert [(r.json()["name"], r.json()["version"]) for r in responses[:4]] == [
+            ("a1", 2), ("c1", 2), ("a2", 3), ("c2", 3)
+        ]
+        assert responses[5].json()["version"] == 4
+
+        # Each caller reads its write or a newer one; the failed PUT of "a"
+        # leaves the content of the last successful one.
+        stored = {event["id"]: event for event in client.get("/events").json()}
+        assert (stored[a]["name"], stored[a]["version"]) == ("a2", 3)
+        assert (stored[c]["name"], stored[c]["version"]) == ("c3", 4)
+        assert stored[b]["version"] == 1
+        found = client.get("/events/search", params={"q": "c3"}).json()
+        assert [event["id"] for event in found] == [c]
+        assert client.get("/events/search", params={"q": "c1"}).json() == []
+        feed = client.get("/events/changes", params={"since": 3}).json()["changes"]
+        assert [change["event_id"] for change in feed] == [a, c, a, c, a, c]
+
+
+def test_compact_list_formats_and_compression(server_module):
+    """Projections, columnar output and compression shrink a 5k-event list."""
+
+    import gzip
+    import json
+
+    from benchmarks.bench_payload import measure
+    from benchmarks.bench_serialize import seed_rows
+
+    rows = seed_rows(server_module, 5000)
+    result = measure(server_module, rows, repeat=1)
+    size = {name: figures["bytes"] for name, figures in result.items()}
+    assert size["json+gzip"] * 5 < size["json"]
+    assert size["fields"] * 2 < size["json"]
+    assert size["columnar"] < size["json"] * 0.6
+    assert size["fields+gzip"] < size["json+gzip"]
+
+    with TestClient(server_module.app) as client:
+        params = {"limit": 1000}
+        plain = client.get("/events", params=params)
+        assert "content-encoding" not in plain.headers
+        packed = client.get("/events", params=params, headers={"Accept-Encoding": "gzip"})
+        assert packed.headers["content-encoding"] == "gzip"
+        assert packed.headers["vary"] == "Accept-Encoding"
+        assert packed.headers["x-next-cursor"] == plain.headers["x-next-cursor"]
+        assert int(packed.headers["content-length"]) == len(packed.content)
+        assert gzip.decompress(packed.content) == plain.content
+        # Encoded bytes must not share the strong validator of the plain ones.
+        assert packed.headers["etag"] == "W/" + plain.headers["etag"]
+        revalidated = client.get(
+            "/events",
+            params=params,
+            headers={"Accept-Encoding": "gzip", "If-None-Match": packed.headers["etag"]},
+        )
+        assert revalidated.status_code == 304
+        refused = client.get("/events", params=params, headers={"Accept-Encoding": "gzip;q=0"})
+        assert "content-encoding" not in refused.headers
+
+        # Small bodies are not worth compressing.
+        small = client.get("/events", params={"limit": 1}, headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in small.headers
+        assert small.headers["vary"] == "Accept-Encoding"
+
+        events = plain.json()
+        projected = client.get("/events", params={"limit": 3, "fields": "name, id"})
+        assert projected.json() == [
+            {"id": event["id"], "name": event["name"]} for event in events[:3]
+        ]
+        page = client.get(
+            "/events",
+            params={
+                "limit": 3,
+                "fields": "assign_employees",
+                "cursor": projected.headers["x-next-cursor"],
+                "include_archived": "true",
+            },
+        )
+        assert page.json() == [
+            {"assign_employees": event["assign_employees"]} for event in events[3:6]
+        ]
+        for fields in ("id,bogus", ","):
+            assert client.get("/events", params={"fields": fields}).status_code == 422
+
+        columnar = client.get("/events", params={"limit": 4, "format": "columnar"})
+        assert columnar.headers["content-type"] == "application/json"
+        columns = columnar.json()
+        assert list(columns) == list(events[0])
+        assert columns["id"] == [event["id"] for event in events[:4]]
+        assert columns["assign_employees"] == [e["assign_employees"] for e in events[:4]]
+        binary = client.get("/events", params={"limit": 4, "format": "msgpack"})
+        if server_module.msgpack is None:
+            assert binary.status_code == 406
+        else:
+            assert server_module.msgpack.unpackb(binary.content) == events[:4]
+        assert client.get("/events", params={"format": "xml"}).status_code == 422
+
+        # Streaming exports are compressed chunk by chunk.
+        export = client.get("/events/export", headers={"Accept-Encoding": "gzip"})
+        assert export.headers["content-encoding"] == "gzip"
+        lines = gzip.decompress(export.content).decode("utf-8").splitlines()
+        assert len(lines) == 5000
+        assert json.loads(lines[0])["id"] == events[0]["id"]
@@ -0,0 +1,113 @@
+"""Unit tests for the scheduling helpers in staffing.py."""
+
+from staffing import IntervalIndex, event_window
+
+
+def test_event_window_handles_overnight_and_missing_times():
+    """Windows span the stated times, past midnight and whole days."""
+
+    start, end = event_window("2025-08-01", "18:00", "22:00")
+    assert end - start == 4 * 3600
+
+    start, end = event_window("2025-08-01", "21:00", "02:00")
+    assert end - start == 5 * 3600
+
+    start, end = event_window("2025-08-01", None, None)
+    assert end - start == 24 * 3600
+
+    assert event_window(None, "18:00", "22:00") is None
+    assert event_window("08/01/2025", "18:00", "22:00") is None
+
+
+def test_interval_index_finds_only_overlapping_events():
+    """Overlap queries honour neighbours, long intervals and removals."""
+
+    index = IntervalIndex()
+    index.add("long", event_window("2025-08-01", "08:00", "23:00"), ["emp-1"])
+    index.add("early", event_window("2025-08-02", "10:00", "12:00"), ["emp-1"])
+    index.add("late", event_window("2025-08-02", "18:00", "22:00"), ["emp-1", "emp-2"])
+
+    probe = event_window("2025-08-02", "12:00", "18:00")
+    assert index.overlapping("emp-1", probe) == []
+
+    probe = event_window("2025-08-01", "22:00", "11:00")
+    assert sorted(index.overlapping("emp-1", probe)) == ["early", "long"]
+    assert index.overlapping("emp-2", probe) == []
+
+    probe = event_window("2025-08-02", "21:00", "23:00")
+    assert index.overlapping("emp-2", probe) == ["late"]
+    assert index.overlapping("emp-2", probe, exclude=["late"]) == []
+
+    index.discard("late")
+    assert index.overlapping("emp-2", probe) == []
+    assert "late" not in index
+    assert len(index) == 2
+
+
+def _weekend_needs(events, slots_per_day=6, target=3):
+    """Build ``events`` overlapping needs spread over consecutive days."""
+
+    from staffing import StaffingNeed
+
+    needs = []
+    for number in range(events):
+        day, slot = divmod(number, slots_per_day)
+        start = 12 + (slot % 3) * 3
+        window = event_window(
+            f"2025-{6 + day // 28:02d}-{1 + day % 28:02d}",
+            f"{start:02d}:00",
+            f"{start + 4:02d}:00",
+        )
+        needs.append(StaffingNeed(f"evt-{number}", window, target))
+    return needs
+
+
+def test_solver_fills_slots_without_overlaps_and_balances_hours():
+    """Every proposal is conflict-free, within capacity and evenly spread."""
+
+    from staffing import StaffingNeed, solve_staffing
+
+    needs = _weekend_needs(12, slots_per_day=3, target=2)
+    needs[0].assigned = ["emp-0"]
+    capacity = {f"emp-{i}": None for i in range(6)}
+    capacity["emp-5"] = 4 * 3600
+
+    plan = solve_staffing(needs, capacity)
+
+    assert plan.unfilled == {}
+    assert plan.staff["evt-0"][0] == "emp-0"
+    check = IntervalIndex()
+    for need in needs:
+        staff = plan.staff[need.event_id]
+        assert len(staff) == need.target
+        for employee in staff:
+            assert check.overlapping(employee, need.window) == []
+        check.add(need.event_id, need.window, staff)
+    assert plan.seconds["emp-5"] <= 4 * 3600
+    balanced = [
+        seconds for employee, seconds in plan.seconds.items() if employee != "emp-5"
+    ]
+    assert max(balanced) - min(balanced) <= 4 * 3600
+
+    blocked = solve_staffing(
+        [StaffingNeed("solo", event_window("2025-06-01", "18:00", "22:00"), 1)],
+        {"emp-0": None},
+        busy=lambda employee, window: True,
+    )
+    assert blocked.unfilled == {"solo": 1}
+
+
+def test_solver_handles_hundreds_of_events_quickly():
+    """300 events and 100 employees solve well under a second."""
+
+    import time
+
+    from staffing import solve_staffing
+
+    needs = _weekend_needs(300)
+    capacity = {f"emp-{i}": 40 * 3600 for i in range(100)}
+    started = time.perf_counter()
+    plan = solve_staffing(needs, capacity)
+    elapsed = time.perf_counter() - started
+    assert plan.unfilled == {}
+    assert elapsed < 1.0